@@ -0,0 +1,33 @@
+"""
+Super PySnake game package.
+
+Headless mode renders without a visible window (soak runs, render checks,
+CI boxes) and is selected with ``SUPER_PYSNAKE_HEADLESS=1``. pyglet picks
+its window backend when pyglet.window is first imported, so the option is
+applied here, before any module of the package can import it, whatever the
+entry point.
+"""
+import os
+
+HEADLESS = False
+
+
+def configure_headless() -> bool:
+    """Apply the SUPER_PYSNAKE_HEADLESS environment variable.
+
+    Runs on package import. Entry points that change the variable later
+    call it again, before anything imports pyglet.window.
+
+    Returns:
+        Whether headless mode is on
+    """
+    global HEADLESS
+    HEADLESS = os.environ.get("SUPER_PYSNAKE_HEADLESS", "") not in ("", "0")
+    if HEADLESS:
+        import pyglet
+
+        pyglet.options["headless"] = True
+    return HEADLESS
+
+
+configure_headless()
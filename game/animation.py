@@ -0,0 +1,255 @@
+"""
+Shared scheduler for HUD animations.
+
+Every running animation is advanced from one clock callback, and that
+callback is only scheduled while something is animating. When all pending
+animations are waiting out a start delay, the animator sleeps until the
+first of them is due instead of waking up every frame.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import pyglet
+
+Easing = Callable[[float], float]
+
+
+def linear(progress: float) -> float:
+    """Constant-speed easing."""
+    return progress
+
+
+def ease_out_cubic(progress: float) -> float:
+    """Easing that starts fast and slows down towards the end."""
+    return 1 - (1 - progress) ** 3
+
+
+class Animation(ABC):
+    """Base class for anything the Animator can advance.
+
+    Attributes:
+        delay: Seconds left before the animation starts
+        cancelled: Whether the animation was stopped early
+    """
+
+    def __init__(self, delay: float = 0.0) -> None:
+        """Initialize the animation.
+
+        Args:
+            delay: Seconds to wait before the first update
+        """
+        self.delay = delay
+        self.cancelled = False
+
+    def step(self, dt: float) -> bool:
+        """Advance the animation by a time delta.
+
+        Returns:
+            True while the animation still needs updates
+        """
+        if self.cancelled:
+            return False
+        if self.delay > 0:
+            self.delay -= dt
+            if self.delay > 0:
+                return True
+            dt = -self.delay
+            self.delay = 0.0
+        return self.advance(dt)
+
+    @abstractmethod
+    def advance(self, dt: float) -> bool:
+        """Update the animation once its delay has passed.
+
+        Returns:
+            True while the animation still needs updates
+        """
+
+    def cancel(self) -> None:
+        """Stop the animation; it is dropped on the next step."""
+        self.cancelled = True
+
+
+class Tween(Animation):
+    """Animation running for a fixed duration.
+
+    The update callback receives the eased progress, from 0 to 1; the
+    last update always receives exactly 1.
+    """
+
+    def __init__(
+        self,
+        duration: float,
+        on_update: Callable[[float], Any],
+        *,
+        easing: Easing = linear,
+        delay: float = 0.0,
+        on_complete: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        """Initialize the tween.
+
+        Args:
+            duration: Length of the tween in seconds
+            on_update: Called with the eased progress on every step
+            easing: Maps linear progress to eased progress
+            delay: Seconds to wait before the tween starts
+            on_complete: Called once after the final update
+        """
+        super().__init__(delay)
+        self.duration = duration
+        self.on_update = on_update
+        self.easing = easing
+        self.on_complete = on_complete
+        self.elapsed = 0.0
+
+    def advance(self, dt: float) -> bool:
+        """Move the tween forward and report its progress."""
+        self.elapsed += dt
+        progress = min(self.elapsed / self.duration, 1.0) if self.duration > 0 else 1.0
+        self.on_update(self.easing(progress))
+        if progress < 1.0:
+            return True
+        if self.on_complete is not None:
+            self.on_complete()
+        return False
+
+
+class Driver(Animation):
+    """Open-ended animation driven by a step function.
+
+    Used for effects without a fixed duration, such as easing towards a
+    moving target or simulating particles. The function receives the time
+    delta and returns whether it needs further updates.
+    """
+
+    def __init__(self, function: Callable[[float], bool], delay: float = 0.0) -> None:
+        """Initialize the driver.
+
+        Args:
+            function: Step function returning True while still animating
+            delay: Seconds to wait before the first step
+        """
+        super().__init__(delay)
+        self.function = function
+
+    def advance(self, dt: float) -> bool:
+        """Call the step function."""
+        return bool(self.function(dt))
+
+
+class Animator:
+    """Advances every active animation from a single clock callback.
+
+    Animations are registered under a key; adding one under a key that is
+    already animating cancels and replaces the old one, which is how a
+    restarted effect (e.g. a fade) supersedes the previous run.
+
+    Attributes:
+        observers: Called after every update, e.g. to schedule a redraw
+    """
+
+    def __init__(self, interval: float = 1 / 60.0, clock: Optional[Any] = None) -> None:
+        """Initialize the animator.
+
+        Args:
+            interval: Seconds between updates while animating
+            clock: Clock to schedule on; defaults to pyglet's default clock
+        """
+        self.interval = interval
+        self._clock = clock
+        self._animations: Dict[Hashable, Animation] = {}
+        self._running = False
+        self._sleeping = False
+        self._last_step = 0.0
+        self.observers: List[Callable[[], Any]] = []
+
+    @property
+    def clock(self) -> Any:
+        """The clock updates are scheduled on."""
+        return self._clock or pyglet.clock.get_default()
+
+    def add(self, animation: Animation, key: Optional[Hashable] = None) -> Animation:
+        """Start an animation.
+
+        Args:
+            animation: The animation to run
+            key: Key to register it under; defaults to the animation itself
+
+        Returns:
+            The animation, for chaining
+        """
+        if key is None:
+            key = animation
+        self._catch_up()
+        previous = self._animations.pop(key, None)
+        if previous is not None and previous is not animation:
+            previous.cancel()
+        self._animations[key] = animation
+        self._wake()
+        return animation
+
+    def cancel(self, key: Hashable) -> None:
+        """Stop the animation registered under a key, if any."""
+        animation = self._animations.pop(key, None)
+        if animation is not None:
+            animation.cancel()
+
+    def is_active(self, key: Hashable) -> bool:
+        """Check whether an animation is registered under a key."""
+        return key in self._animations
+
+    def __len__(self) -> int:
+        """Get the number of active animations."""
+        return len(self._animations)
+
+    def _catch_up(self) -> None:
+        """Stop sleeping, counting the time slept against pending delays."""
+        if not self._sleeping:
+            return
+        self.clock.unschedule(self._resume)
+        self._sleeping = False
+        slept = self.clock.time() - self._last_step
+        for animation in self._animations.values():
+            animation.delay -= slept
+
+    def _wake(self) -> None:
+        """Make sure updates run every interval."""
+        if not self._running and not self._sleeping and self._animations:
+            self._last_step = self.clock.time()
+            self.clock.schedule_interval(self._step, self.interval)
+            self._running = True
+
+    def _resume(self, dt: float) -> None:
+        """Wake up once the first delayed animation is due."""
+        self._sleeping = False
+        self._step(dt)
+        self._wake()
+
+    def _step(self, dt: float) -> None:
+        """Advance every animation, then go idle if nothing needs updates."""
+        self._last_step = self.clock.time()
+        for key, animation in list(self._animations.items()):
+            if not animation.step(dt) and self._animations.get(key) is animation:
+                del self._animations[key]
+        for observer in self.observers:
+            observer()
+
+        if not self._animations:
+            self._stop()
+            return
+
+        wait = min(animation.delay for animation in self._animations.values())
+        if wait > self.interval:
+            self._stop()
+            self.clock.schedule_once(self._resume, wait)
+            self._sleeping = True
+
+    def _stop(self) -> None:
+        """Unschedule the per-frame update."""
+        if self._running:
+            self.clock.unschedule(self._step)
+            self._running = False
+
+
+# Animator shared by all HUD elements
+hud_animator = Animator()
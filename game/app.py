@@ -3,14 +3,20 @@ Main application window and game configuration handling.
 """
 import os.path
 from pathlib import Path
-from typing import Any, Dict, Optional, TypedDict, cast
+from typing import Any, ContextManager, Dict, Optional, TypedDict, cast
 
 import pyglet
 from pyglet.window import Window, event
 
-from game.types import GameConfig, DEFAULT_CONFIG
+from game import HEADLESS
+from game.telemetry import telemetry
+from game.viewport import ScaledViewport
+from game.types import ConfigValueError, GameConfig, DEFAULT_CONFIG
 from utils.serializable import Serializable, FileOperationError
 
+# Numeric settings that must be above zero; MAX_FPS may be 0 for no cap
+_POSITIVE_SETTINGS = ("SCREEN_WIDTH", "SCREEN_HEIGHT", "RENDER_SCALE", "SQUARE_SIZE", "GAME_SPEED")
+
 
 class ModernConfig(TypedDict):
     """Modern configuration format structure."""
@@ -34,21 +40,39 @@ class GameWindow(Serializable):
         
         # Initialize config
         self._config: Optional[GameConfig] = None
-        self._load_configuration(config_path or Path("config.json"))
+        self.config_path = config_path or Path("config.json")
+        config_error = self._load_configuration(self.config_path)
+        telemetry.configure(self._config["TELEMETRY"])
+        if config_error:
+            telemetry.error(config_error)
         
         if verify_assets:
             self._verify_assets()
             
-        # Create the window
+        # Create the window; fullscreen keeps the desktop resolution, as
+        # frames are scaled to whatever size the window has
+        fullscreen = self._config["FULLSCREEN"] and not HEADLESS
         self._window = Window(
-            width=self._config["SCREEN_WIDTH"],
-            height=self._config["SCREEN_HEIGHT"],
-            fullscreen=self._config["FULLSCREEN"],
-            caption="Super PySnake"
+            width=None if fullscreen else self._config["SCREEN_WIDTH"],
+            height=None if fullscreen else self._config["SCREEN_HEIGHT"],
+            fullscreen=fullscreen,
+            resizable=True,
+            caption="Super PySnake",
+            visible=not HEADLESS
+        )
+
+        # Everything is drawn at a logical resolution, the configured screen
+        # size until a game fits its board into it
+        self.cell_size = self._config["SQUARE_SIZE"]
+        self.viewport = ScaledViewport(
+            self._window,
+            self._config["SCREEN_WIDTH"],
+            self._config["SCREEN_HEIGHT"],
+            self._config["RENDER_SCALE"],
         )
         
         # Configure window
-        if self._config["LOCKED_MOUSE"]:
+        if self._config["LOCKED_MOUSE"] and not HEADLESS:
             self._window.set_exclusive_mouse(True)
             
         # Set window icon
@@ -66,14 +90,26 @@ class GameWindow(Serializable):
         # Setup event handlers
         self._window.push_handlers(self)
 
-    def _load_configuration(self, config_path: Path) -> None:
-        """Load and validate configuration."""
+    def _load_configuration(self, config_path: Path) -> Optional[str]:
+        """Load and validate configuration.
+
+        A file in an unknown format is replaced by the defaults; a file
+        with invalid values is left alone for the user to fix, and the
+        defaults are only used for this run.
+
+        Returns:
+            A description of the problem if the defaults had to be used
+        """
+        error = None
         if config_path.is_file():
             try:
                 loaded_config = self.load(config_path)
                 self._config = self._transform_config(loaded_config)
+            except ConfigValueError as e:
+                error = f"Invalid config, using defaults for this run: {e}"
+                self._config = DEFAULT_CONFIG.copy()
             except (FileOperationError, KeyError) as e:
-                print(f"Error loading config, using defaults: {e}")
+                error = f"Error loading config, using defaults: {e}"
                 self._config = DEFAULT_CONFIG.copy()
                 # Write the modern format config
                 self.data = self._create_modern_config(self._config)
@@ -83,6 +119,26 @@ class GameWindow(Serializable):
             # Write the modern format config
             self.data = self._create_modern_config(self._config)
             self.write(config_path)
+        return error
+
+    def reload_configuration(self) -> GameConfig:
+        """Re-read the config file while the game is running.
+
+        Unlike the initial load, an invalid file is not replaced by the
+        defaults: the current configuration stays in effect.
+
+        Returns:
+            The configuration that was in effect before the reload
+
+        Raises:
+            SerializationError: If the file cannot be read or parsed
+            KeyError: If the file is missing required settings
+            ConfigValueError: If a setting has the wrong type or value
+        """
+        previous = self.config
+        self._config = self._transform_config(self.load(self.config_path))
+        telemetry.configure(self._config["TELEMETRY"])
+        return previous
 
     def _create_modern_config(self, config: GameConfig) -> ModernConfig:
         """Transform internal config format to modern JSON format."""
@@ -90,11 +146,13 @@ class GameWindow(Serializable):
             "screen": {
                 "width": config["SCREEN_WIDTH"],
                 "height": config["SCREEN_HEIGHT"],
-                "fullscreen": config["FULLSCREEN"]
+                "fullscreen": config["FULLSCREEN"],
+                "render_scale": config["RENDER_SCALE"]
             },
             "game": {
                 "square_size": config["SQUARE_SIZE"],
                 "speed": config["GAME_SPEED"],
+                "max_fps": config["MAX_FPS"],
                 "locked_mouse": config["LOCKED_MOUSE"]
             },
             "assets": {
@@ -105,21 +163,38 @@ class GameWindow(Serializable):
                     "food": config["TEXTURES"]["FOOD"],
                     "brick": config["TEXTURES"]["BRICK"]
                 }
+            },
+            "telemetry": {
+                "level": config["TELEMETRY"]["LEVEL"],
+                "file": config["TELEMETRY"]["FILE"],
+                "max_bytes": config["TELEMETRY"]["MAX_BYTES"],
+                "backups": config["TELEMETRY"]["BACKUPS"],
+                "sample_every": config["TELEMETRY"]["SAMPLE_EVERY"]
             }
         }
 
     def _transform_config(self, modern_config: Dict[str, Any]) -> GameConfig:
-        """Transform modern JSON format to internal config format."""
+        """Transform modern JSON format to internal config format.
+
+        Raises:
+            KeyError: If a setting is missing
+            ConfigValueError: If a section or setting has the wrong type or value
+        """
         try:
             screen = modern_config["screen"]
             game = modern_config["game"]
             assets = modern_config["assets"]
+            # Optional section; configs written before it existed still load
+            telemetry_config = modern_config.get("telemetry", {})
+            default_telemetry = DEFAULT_CONFIG["TELEMETRY"]
             
-            return {
+            config: GameConfig = {
                 "SCREEN_WIDTH": screen["width"],
                 "SCREEN_HEIGHT": screen["height"],
+                "RENDER_SCALE": screen.get("render_scale", DEFAULT_CONFIG["RENDER_SCALE"]),
                 "SQUARE_SIZE": game["square_size"],
                 "GAME_SPEED": game["speed"],
+                "MAX_FPS": game.get("max_fps", DEFAULT_CONFIG["MAX_FPS"]),
                 "FULLSCREEN": screen["fullscreen"],
                 "LOCKED_MOUSE": game["locked_mouse"],
                 "DEFAULT_MAP_FILE": assets["map_file"],
@@ -128,10 +203,31 @@ class GameWindow(Serializable):
                     "SNAKE": assets["textures"]["snake"],
                     "FOOD": assets["textures"]["food"],
                     "BRICK": assets["textures"]["brick"]
+                },
+                "TELEMETRY": {
+                    "LEVEL": telemetry_config.get("level", default_telemetry["LEVEL"]),
+                    "FILE": telemetry_config.get("file", default_telemetry["FILE"]),
+                    "MAX_BYTES": telemetry_config.get(
+                        "max_bytes", default_telemetry["MAX_BYTES"]
+                    ),
+                    "BACKUPS": telemetry_config.get("backups", default_telemetry["BACKUPS"]),
+                    "SAMPLE_EVERY": telemetry_config.get(
+                        "sample_every", default_telemetry["SAMPLE_EVERY"]
+                    )
                 }
             }
+            for name in _POSITIVE_SETTINGS + ("MAX_FPS",):
+                value = config[name]
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    raise ConfigValueError(f"{name} must be a number, not {value!r}")
+                if value <= 0 and name in _POSITIVE_SETTINGS:
+                    raise ConfigValueError(f"{name} must be positive, not {value!r}")
+            return config
         except KeyError as e:
             raise KeyError(f"Invalid configuration format: missing {e}") from e
+        except (TypeError, AttributeError) as e:
+            # A section of the wrong type, e.g. "game": 5
+            raise ConfigValueError(f"Invalid configuration format: {e}") from e
         
     @property
     def config(self) -> GameConfig:
@@ -167,6 +263,42 @@ class GameWindow(Serializable):
             raise RuntimeError("Configuration not initialized")
         return self._config["SCREEN_HEIGHT"]
 
+    @property
+    def logical_width(self) -> int:
+        """Get the width the game is laid out in, whatever the window size."""
+        return self.viewport.logical_width
+
+    @property
+    def logical_height(self) -> int:
+        """Get the height the game is laid out in, whatever the window size."""
+        return self.viewport.logical_height
+
+    def fit_board(self, rows: int, cols: int) -> int:
+        """Size the cells of a board so that it fits the configured screen.
+
+        Cells get the largest whole number of logical pixels that fits the
+        board into the screen size, at least one, and the logical resolution
+        becomes the board's size in those cells. A map larger than the
+        screen has pixels therefore draws at one pixel per cell.
+
+        Args:
+            rows: Rows of the board
+            cols: Columns of the board
+
+        Returns:
+            The new cell size, in logical pixels
+        """
+        self.cell_size = max(1, min(
+            self._config["SCREEN_WIDTH"] // cols,
+            self._config["SCREEN_HEIGHT"] // rows,
+        ))
+        self.viewport.resize(cols * self.cell_size, rows * self.cell_size)
+        return self.cell_size
+
+    def frame(self) -> ContextManager[None]:
+        """Context manager drawing one frame at the logical resolution."""
+        return self.viewport.render()
+
     # Delegate pyglet window methods
     def clear(self) -> None:
         """Clear the window."""
@@ -176,6 +308,10 @@ class GameWindow(Serializable):
         """Close the window."""
         self._window.close()
 
+    def draw(self, dt: float) -> None:
+        """Redraw the window contents and flip the buffers."""
+        self._window.draw(dt)
+
     def event(self, *args) -> Any:
         """Event decorator."""
         return self._window.event(*args)
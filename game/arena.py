@@ -0,0 +1,402 @@
+"""
+Headless multi-snake arena simulation.
+
+The arena runs the same rules as the single-player game on map cells
+instead of screen pixels, so it needs no window and can host dozens to
+hundreds of local or bot-controlled snakes on one map.
+"""
+import random
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple, Union
+
+from pyscored.adapters.game_frameworks import GameFrameworkAdapter
+
+from game.mapcompiler import CompiledMap, MapCompileError
+from game.scoring import ScorePipeline
+from game.types import (
+    DIRECTION_DELTAS,
+    FOOD_POINTS,
+    Direction,
+    GameError,
+    MapGrid,
+    MapPosition,
+)
+
+# Bot policies pick a direction for a player given the arena state.
+Policy = Callable[["Arena", str], Direction]
+
+
+class ArenaError(GameError):
+    """Raised when the arena cannot satisfy a request."""
+    pass
+
+
+class SpatialHash:
+    """Shared occupancy grid for every snake segment in an arena.
+
+    Each cell stores the id of the player whose segment covers it, so head
+    moves and tail pops are O(1) updates and collision checks are O(1)
+    lookups regardless of how many snakes share the map.
+    """
+
+    def __init__(self, rows: int, cols: int) -> None:
+        """Initialize an empty grid of the given size."""
+        self.rows = rows
+        self.cols = cols
+        self._cells: List[Optional[str]] = [None] * (rows * cols)
+
+    def occupant(self, cell: MapPosition) -> Optional[str]:
+        """Get the player occupying a cell, if any."""
+        return self._cells[cell.row * self.cols + cell.column]
+
+    def add(self, cell: MapPosition, player_id: str) -> None:
+        """Mark a cell as occupied by a player."""
+        self._cells[cell.row * self.cols + cell.column] = player_id
+
+    def remove(self, cell: MapPosition) -> None:
+        """Mark a cell as free."""
+        self._cells[cell.row * self.cols + cell.column] = None
+
+
+class TickDelta:
+    """Changes to the arena since the last delta was taken.
+
+    Attributes:
+        heads: New head cell per player that moved
+        tails: Players whose tail segment was removed
+        spawns: Full body per player that joined or respawned
+        left: Players removed from the arena
+        food_added: Cells where food appeared
+        food_removed: Cells where food was eaten
+        scores: New score per player whose score changed
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty delta."""
+        self.heads: Dict[str, MapPosition] = {}
+        self.tails: List[str] = []
+        self.spawns: Dict[str, List[MapPosition]] = {}
+        self.left: List[str] = []
+        self.food_added: List[MapPosition] = []
+        self.food_removed: List[MapPosition] = []
+        self.scores: Dict[str, float] = {}
+
+
+class ArenaSnake:
+    """A snake living in an arena.
+
+    Attributes:
+        player_id: Id used for scoring and input
+        body: Occupied cells, with the head at index 0
+        direction: Current movement direction
+        policy: Optional bot policy deciding the direction each tick
+    """
+
+    def __init__(
+        self,
+        player_id: str,
+        head: MapPosition,
+        direction: Direction,
+        policy: Optional[Policy] = None,
+    ) -> None:
+        """Initialize a single-segment snake."""
+        self.player_id = player_id
+        self.body: Deque[MapPosition] = deque([head])
+        self.direction = direction
+        self.policy = policy
+
+    @property
+    def head(self) -> MapPosition:
+        """Get the cell of the snake's head."""
+        return self.body[0]
+
+
+class Arena:
+    """Runs many snakes and food items on a single map.
+
+    Every tick is resolved in three linear passes over the snakes: compute
+    next heads, detect collisions against the shared spatial hash, then
+    apply the surviving moves. Snakes that die respawn with a fresh body
+    and lose their score, just like the single-player snake.
+
+    A full board never stops the simulation: a dead snake with no free cell
+    to respawn on waits with an empty body, and food that finds no cell is
+    left out, until moves free a cell again.
+
+    Attributes:
+        compiled: Lookup tables for the arena map
+        rows: Number of map rows
+        cols: Number of map columns
+        snakes: Snakes by player id
+        waiting: Ids of dead snakes waiting for a free cell to respawn on
+        food: Cells currently holding food
+        food_count: Number of food items kept on the map when there is room
+        tick_count: Number of ticks simulated so far
+        delta: Changes since the last take_delta call, if recording is enabled
+    """
+
+    def __init__(
+        self,
+        map_data: MapGrid,
+        game_adapter: Union[GameFrameworkAdapter, ScorePipeline],
+        *,
+        food_count: int = 1,
+        seed: Optional[int] = None,
+        record_deltas: bool = False,
+        compiled: Optional[CompiledMap] = None,
+    ) -> None:
+        """Initialize the arena.
+
+        Args:
+            map_data: 2D grid where TILE_EMPTY marks passable cells
+            game_adapter: Adapter, or pipeline in front of one, receiving
+                per-player score updates
+            food_count: Number of food items kept on the map
+            seed: Seed for spawn and food placement
+            record_deltas: Whether to record per-tick changes for take_delta
+            compiled: Compiled form of the map; compiled on the spot if omitted
+
+        Raises:
+            ArenaError: If the map has no free cells
+        """
+        if compiled is None:
+            try:
+                compiled = CompiledMap.from_map(map_data)
+            except MapCompileError as e:
+                raise ArenaError(f"Unusable arena map: {e}") from e
+        self.compiled = compiled
+        self.rows = compiled.rows
+        self.cols = compiled.cols
+        self.game_adapter = game_adapter
+        self.rng = random.Random(seed)
+
+        self._walls = compiled.walls
+        self._free_cells = compiled.free_positions()
+
+        self.occupancy = SpatialHash(self.rows, self.cols)
+        self.snakes: Dict[str, ArenaSnake] = {}
+        self.waiting: Set[str] = set()
+        self.food: Set[MapPosition] = set()
+        self.food_count = food_count
+        self.tick_count = 0
+        self.delta: Optional[TickDelta] = TickDelta() if record_deltas else None
+
+        self._refill_food()
+
+    def is_wall(self, cell: MapPosition) -> bool:
+        """Check whether a cell is a wall or outside the map."""
+        if not (0 <= cell.row < self.rows and 0 <= cell.column < self.cols):
+            return True
+        return bool(self._walls[cell.row * self.cols + cell.column])
+
+    def is_blocked(self, cell: MapPosition) -> bool:
+        """Check whether moving into a cell would kill a snake."""
+        return self.is_wall(cell) or self.occupancy.occupant(cell) is not None
+
+    def add_snake(self, player_id: str, policy: Optional[Policy] = None) -> ArenaSnake:
+        """Spawn a new snake and register its player for scoring.
+
+        Args:
+            player_id: Unique id of the player
+            policy: Optional bot policy controlling the snake
+
+        Raises:
+            ArenaError: If the id is taken or there is no room to spawn
+        """
+        if player_id in self.snakes:
+            raise ArenaError(f"Player '{player_id}' is already in the arena.")
+        spawn = self._spawn_point()
+        if spawn is None:
+            raise ArenaError("No available cells left in the arena.")
+        head, direction = spawn
+        snake = ArenaSnake(player_id, head, direction, policy)
+        self.snakes[player_id] = snake
+        self.occupancy.add(head, player_id)
+        self.game_adapter.setup_player(player_id=player_id, initial_score=0)
+        if self.delta is not None:
+            self.delta.spawns[player_id] = [head]
+            self.delta.scores[player_id] = 0
+        return snake
+
+    def remove_snake(self, player_id: str) -> None:
+        """Remove a snake and free its cells."""
+        snake = self.snakes.pop(player_id)
+        self.waiting.discard(player_id)
+        for cell in snake.body:
+            self.occupancy.remove(cell)
+        if self.delta is not None:
+            self.delta.heads.pop(player_id, None)
+            self.delta.spawns.pop(player_id, None)
+            self.delta.scores.pop(player_id, None)
+            self.delta.left.append(player_id)
+
+    def take_delta(self) -> TickDelta:
+        """Get the changes recorded since the previous call and start afresh.
+
+        Raises:
+            ArenaError: If the arena was created without delta recording
+        """
+        if self.delta is None:
+            raise ArenaError("Delta recording is disabled for this arena.")
+        delta, self.delta = self.delta, TickDelta()
+        return delta
+
+    def set_direction(self, player_id: str, direction: Direction) -> None:
+        """Set the direction a player's snake moves on the next tick."""
+        self.snakes[player_id].direction = direction
+
+    def next_cell(self, cell: MapPosition, direction: Direction) -> MapPosition:
+        """Get the neighbouring cell in a direction."""
+        delta = DIRECTION_DELTAS[direction]
+        return MapPosition(cell.row + delta.row, cell.column + delta.column)
+
+    def tick(self) -> List[str]:
+        """Advance every snake by one cell and resolve collisions.
+
+        Snakes waiting for room to respawn sit the tick out.
+
+        Returns:
+            Ids of the players whose snakes died this tick
+        """
+        snakes = [snake for snake in self.snakes.values() if snake.player_id not in self.waiting]
+
+        # Pass 1: decide directions and compute the next head cells.
+        next_heads: Dict[str, MapPosition] = {}
+        heads_per_cell: Dict[MapPosition, int] = {}
+        for snake in snakes:
+            if snake.policy is not None:
+                snake.direction = snake.policy(self, snake.player_id)
+            cell = self.next_cell(snake.head, snake.direction)
+            next_heads[snake.player_id] = cell
+            heads_per_cell[cell] = heads_per_cell.get(cell, 0) + 1
+
+        # Pass 2: head-to-head, head-to-body and wall collisions. Bodies are
+        # checked before any tail moves, matching the single-player rules.
+        dead: List[str] = []
+        for snake in snakes:
+            cell = next_heads[snake.player_id]
+            if heads_per_cell[cell] > 1 or self.is_blocked(cell):
+                dead.append(snake.player_id)
+
+        # Pass 3: apply surviving moves, growing the snakes that ate.
+        delta = self.delta
+        dead_ids = set(dead)
+        eaten = 0
+        for snake in snakes:
+            player_id = snake.player_id
+            if player_id in dead_ids:
+                continue
+            cell = next_heads[player_id]
+            snake.body.appendleft(cell)
+            self.occupancy.add(cell, player_id)
+            if delta is not None:
+                delta.heads[player_id] = cell
+            if cell in self.food:
+                self.food.discard(cell)
+                eaten += 1
+                self.game_adapter.update_player_score(player_id, points=FOOD_POINTS)
+                if delta is not None:
+                    delta.food_removed.append(cell)
+                    delta.scores[player_id] = self.game_adapter.get_player_score(player_id)
+            else:
+                self.occupancy.remove(snake.body.pop())
+                if delta is not None:
+                    delta.tails.append(player_id)
+
+        for player_id in dead:
+            self._kill(self.snakes[player_id])
+        for snake in self.snakes.values():
+            if snake.player_id in self.waiting and not self._respawn(snake):
+                break
+
+        self._refill_food()
+
+        self.tick_count += 1
+        return dead
+
+    def _kill(self, snake: ArenaSnake) -> None:
+        """Clear a dead snake's body and score, leaving it waiting to respawn."""
+        for cell in snake.body:
+            self.occupancy.remove(cell)
+        snake.body = deque()
+        self.waiting.add(snake.player_id)
+
+        score = self.game_adapter.get_player_score(snake.player_id)
+        self.game_adapter.update_player_score(snake.player_id, points=-score)
+        if self.delta is not None:
+            self.delta.spawns[snake.player_id] = []
+            self.delta.scores[snake.player_id] = self.game_adapter.get_player_score(
+                snake.player_id
+            )
+
+    def _respawn(self, snake: ArenaSnake) -> bool:
+        """Give a waiting snake a fresh single segment, if there is room.
+
+        Returns:
+            Whether the snake respawned
+        """
+        spawn = self._spawn_point()
+        if spawn is None:
+            return False
+        head, snake.direction = spawn
+        snake.body = deque([head])
+        self.occupancy.add(head, snake.player_id)
+        self.waiting.discard(snake.player_id)
+        if self.delta is not None:
+            self.delta.spawns[snake.player_id] = [head]
+        return True
+
+    def _refill_food(self) -> None:
+        """Place food on random available cells until food_count is reached or none is left."""
+        while len(self.food) < self.food_count:
+            cell = self._random_free_cell()
+            if cell is None:
+                return
+            self.food.add(cell)
+            if self.delta is not None:
+                self.delta.food_added.append(cell)
+
+    def _spawn_point(self) -> Optional[Tuple[MapPosition, Direction]]:
+        """Pick a spawn cell and a direction that does not lead straight into a wall.
+
+        The compiled map's validated spawn points are preferred; a random
+        free cell is used once all of them are taken.
+
+        Returns:
+            The cell and direction, or None if every free cell is taken
+        """
+        spawns = [
+            cell for cell in self.compiled.spawn_points
+            if self.occupancy.occupant(cell) is None and cell not in self.food
+        ]
+        head = self.rng.choice(spawns) if spawns else self._random_free_cell()
+        if head is None:
+            return None
+        directions = [
+            direction
+            for direction in Direction
+            if not self.is_blocked(self.next_cell(head, direction))
+        ]
+        return head, self.rng.choice(directions) if directions else Direction.NORTH
+
+    def _random_free_cell(self) -> Optional[MapPosition]:
+        """Pick a random free cell not holding a snake segment or food.
+
+        Sampling with retries is O(1) on average while the arena is not
+        crowded; a full scan is used as a fallback.
+
+        Returns:
+            The cell, or None if every free cell is taken
+        """
+        for _ in range(32):
+            cell = self.rng.choice(self._free_cells)
+            if self.occupancy.occupant(cell) is None and cell not in self.food:
+                return cell
+
+        available = [
+            cell for cell in self._free_cells
+            if self.occupancy.occupant(cell) is None and cell not in self.food
+        ]
+        if not available:
+            return None
+        return self.rng.choice(available)
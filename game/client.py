@@ -0,0 +1,210 @@
+"""
+Network client for the authoritative game server.
+"""
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set
+
+from game.server import DEFAULT_HOST, DEFAULT_PORT, decode_message, encode_message
+from game.types import Direction, MapGrid, MapPosition
+
+
+class ClientState:
+    """Local mirror of the server's game state, rebuilt from deltas.
+
+    Attributes:
+        player_id: Id the server assigned to this client
+        tick: Last tick applied
+        map_data: The server's map
+        snakes: Body cells per player, head first
+        food: Cells holding food
+        scores: Score per player
+    """
+
+    def __init__(self, welcome: Dict[str, Any]) -> None:
+        """Initialize the mirror from a welcome message."""
+        self.player_id: str = welcome["player"]
+        self.tick: int = welcome["tick"]
+        self.map_data: MapGrid = welcome["map"]
+        self.snakes: Dict[str, Deque[MapPosition]] = {
+            pid: deque(MapPosition(*cell) for cell in body)
+            for pid, body in welcome["snakes"].items()
+        }
+        self.food: Set[MapPosition] = {MapPosition(*cell) for cell in welcome["food"]}
+        self.scores: Dict[str, float] = dict(welcome["scores"])
+
+    def apply(self, delta: Dict[str, Any]) -> None:
+        """Apply one delta message.
+
+        Spawns come first: a snake that joins between ticks is recorded
+        with its spawn cell, and its first move is in the same delta.
+        Spawns and departures are idempotent, so changes already contained
+        in the welcome state can safely be replayed.
+        """
+        for pid, cells in delta.get("spawns", {}).items():
+            self.snakes[pid] = deque(MapPosition(*cell) for cell in cells)
+        for pid, cell in delta.get("heads", {}).items():
+            body = self.snakes.get(pid)
+            if body is not None:
+                body.appendleft(MapPosition(*cell))
+        for pid in delta.get("tails", ()):
+            body = self.snakes.get(pid)
+            if body:
+                body.pop()
+        for pid in delta.get("left", ()):
+            self.snakes.pop(pid, None)
+            self.scores.pop(pid, None)
+        for cell in delta.get("food_removed", ()):
+            self.food.discard(MapPosition(*cell))
+        for cell in delta.get("food_added", ()):
+            self.food.add(MapPosition(*cell))
+        self.scores.update(delta.get("scores", {}))
+        self.tick = delta["tick"]
+
+    def get_player_score(self, player_id: str) -> float:
+        """Get a player's score, matching the GameFrameworkAdapter interface."""
+        return self.scores.get(player_id, 0)
+
+
+class GameClient:
+    """Asyncio client keeping a ClientState in sync with a server."""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        """Initialize a client for the given server address."""
+        self.host = host
+        self.port = port
+        self.state: Optional[ClientState] = None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self, name: str = "player") -> ClientState:
+        """Connect, join the game and wait for the welcome state.
+
+        Raises:
+            ConnectionError: If the server turns the client away
+        """
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._writer.write(encode_message({"type": "join", "name": name}))
+        await self._writer.drain()
+
+        while self.state is None:
+            message = await self.read_message()
+            if message.get("type") == "welcome":
+                self.state = ClientState(message)
+            elif message.get("type") == "error":
+                await self.close()
+                raise ConnectionError(f"Server refused to join: {message.get('message')}")
+        return self.state
+
+    async def receive(self) -> Dict[str, Any]:
+        """Wait for the next delta and apply it to the state."""
+        while True:
+            message = await self.read_message()
+            if message.get("type") == "delta" and self.state is not None:
+                self.state.apply(message)
+                return message
+
+    def send_direction(self, direction: Direction) -> None:
+        """Queue a direction change for the next server tick."""
+        if self._writer is not None:
+            self._writer.write(
+                encode_message({"type": "input", "direction": int(direction)})
+            )
+
+    async def close(self) -> None:
+        """Close the connection."""
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def read_message(self) -> Dict[str, Any]:
+        """Read one protocol message.
+
+        Raises:
+            ConnectionError: If the server closed the connection
+        """
+        if self._reader is None:
+            raise ConnectionError("Client is not connected")
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection")
+        return decode_message(line)
+
+
+class ThreadedGameClient:
+    """Runs a GameClient on a background thread for the pyglet front end.
+
+    The state is only mutated on the network thread while holding ``lock``;
+    readers on the render thread should take the same lock.
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        """Initialize the client without connecting."""
+        self.client = GameClient(host, port)
+        self.lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def state(self) -> Optional[ClientState]:
+        """Get the mirrored state, or None before the welcome arrived."""
+        return self.client.state
+
+    def start(self, name: str = "player", timeout: float = 5.0) -> ClientState:
+        """Connect on the background thread and wait for the welcome.
+
+        Raises:
+            ConnectionError: If the server could not be reached in time
+        """
+        self._thread.start()
+        self._loop.call_soon_threadsafe(
+            lambda: asyncio.ensure_future(self._session(name))
+        )
+        if not self._ready.wait(timeout) or self.client.state is None:
+            raise ConnectionError(
+                f"Could not join {self.client.host}:{self.client.port}: {self._error}"
+            )
+        return self.client.state
+
+    def send_direction(self, direction: Direction) -> None:
+        """Send a direction change from any thread."""
+        self._loop.call_soon_threadsafe(self.client.send_direction, direction)
+
+    def stop(self) -> None:
+        """Close the connection and stop the background loop."""
+        async def _shutdown() -> None:
+            await self.client.close()
+            self._loop.stop()
+
+        self._loop.call_soon_threadsafe(lambda: asyncio.ensure_future(_shutdown()))
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        """Run the event loop on the background thread."""
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    async def _session(self, name: str) -> None:
+        """Join the game and keep applying deltas until disconnected."""
+        try:
+            await self.client.connect(name)
+        except (OSError, ConnectionError) as e:
+            self._error = e
+            return
+        finally:
+            self._ready.set()
+
+        try:
+            while True:
+                message = await self.client.read_message()
+                if message.get("type") == "delta":
+                    with self.lock:
+                        self.client.state.apply(message)
+        except ConnectionError:
+            pass
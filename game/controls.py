@@ -0,0 +1,92 @@
+"""
+Buffered direction input with key-to-move latency measurement.
+"""
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from game.telemetry import EventKind, LatencyHistogram, telemetry
+from game.types import Direction, OPPOSITE_DIRECTIONS
+
+DEFAULT_QUEUE_SIZE = 3
+
+
+class InputQueue:
+    """Bounded queue of direction changes, applied one per game tick.
+
+    Presses that arrive within one tick are kept in order instead of
+    overwriting each other. A press is rejected if it repeats the direction
+    the snake will already be heading in, or reverses it; the check is made
+    against the last queued direction, so quickly pressing up then left
+    while heading right turns twice instead of dying.
+
+    Attributes:
+        latency: Time from key press to the head move that applied it
+        rejected: Presses dropped as repeats, reversals or overflow
+    """
+
+    def __init__(self, size: int = DEFAULT_QUEUE_SIZE) -> None:
+        """Initialize an empty queue holding at most size presses."""
+        self.size = size
+        self._pending: Deque[Tuple[Direction, float]] = deque()
+        self._applied: Optional[float] = None
+        self.latency = LatencyHistogram()
+        self.rejected = 0
+
+    def __len__(self) -> int:
+        """Get the number of queued presses."""
+        return len(self._pending)
+
+    def push(self, direction: Direction, current: Direction) -> bool:
+        """Queue a direction change, timestamped now.
+
+        Args:
+            direction: The requested direction
+            current: The direction the snake is moving in
+
+        Returns:
+            True if the press was queued
+        """
+        heading = self._pending[-1][0] if self._pending else current
+        if (
+            len(self._pending) >= self.size
+            or direction == heading
+            or direction == OPPOSITE_DIRECTIONS[heading]
+        ):
+            self.rejected += 1
+            return False
+        self._pending.append((direction, time.perf_counter()))
+        return True
+
+    def pop(self, current: Direction) -> Direction:
+        """Take the direction to move in this tick.
+
+        Call applied() once the move has been made to record its latency.
+
+        Args:
+            current: The direction the snake is moving in
+
+        Returns:
+            The next queued direction, or the current one if none is queued
+        """
+        while self._pending:
+            direction, pressed = self._pending.popleft()
+            if direction != OPPOSITE_DIRECTIONS[current]:
+                self._applied = pressed
+                return direction
+            self.rejected += 1
+        return current
+
+    def applied(self, tick: int = 0) -> None:
+        """Record the latency of the press taken by the last pop, if any."""
+        if self._applied is None:
+            return
+        latency = time.perf_counter() - self._applied
+        self._applied = None
+        self.latency.add(latency)
+        telemetry.record(EventKind.INPUT, tick, latency)
+
+    def clear(self) -> None:
+        """Drop every queued press, e.g. when the snake respawns."""
+        self._pending.clear()
+        self._applied = None
@@ -1,22 +1,32 @@
 """
 Manages the game's dungeon grid and wall rendering.
 """
-from typing import List, Optional
+import heapq
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pyglet
+from pyglet.shapes import Circle
 
+from game.listeners import DungeonListener
+from game.mapcompiler import CompiledMap
 from game.square import TexturedSquare
 from game.types import (
     MapGrid,
+    MapPosition,
     Position,
     PositionGrid,
     Size,
+    MapSizeError,
     TILE_EMPTY,
+    TILE_PORTAL,
     TILE_WALL,
-    MapSizeError
 )
 from game.app import window
 
+# Colours cycled through for each new pair of portals
+PORTAL_COLORS = [(80, 160, 255), (255, 140, 40), (190, 90, 255), (60, 220, 140)]
+
 
 class Dungeon:
     """Manages the game's grid system and wall rendering.
@@ -25,93 +35,365 @@ class Dungeon:
     1. Creating and maintaining the game's position grid
     2. Loading and validating the game map
     3. Rendering the walls
+    4. Changing tiles at runtime: walls, timed obstacles and portals
+    
+    Tiles can be changed while the game runs. Every change updates the
+    tile index, the wall sprites in the shared batch and the listeners'
+    free cells in constant time, so game modes can move obstacles every
+    tick without rebuilding anything.
     
     Attributes:
         positions: A 2D grid of all possible positions in the game
-        map_data: The current map's wall configuration
-        walls: List of wall objects to be rendered
+        map_data: The map the dungeon was loaded from
+        compiled: Lookup tables for the map, or None without a map
+        tiles: Current TILE_* value per flat cell index, including
+            runtime changes
+        walls: Wall objects to be rendered, by flat map cell index
+        portals: Exit cell index of each portal, by entrance cell index
+        listeners: Objects notified when tiles change
+        tick: Number of times advance() has stepped timed obstacles
     """
     
-    def __init__(self, map_data: Optional[MapGrid] = None) -> None:
+    def __init__(
+        self,
+        map_data: Optional[MapGrid] = None,
+        compiled: Optional[CompiledMap] = None,
+    ) -> None:
         """Initialize the dungeon with an optional map.
         
         Args:
             map_data: 2D grid of integers where 1 represents walls and 0 empty space.
                      If None, creates an empty grid.
+            compiled: Compiled form of the map; compiled on the spot if omitted
                      
-        Raises:
-            MapSizeError: If the provided map doesn't match the grid dimensions
+        The grid takes the size of the map, or of the logical screen
+        without one.
         """
-        self.positions = self._create_position_grid()
+        self.positions = self._create_position_grid(map_data)
+        self.rows = len(self.positions)
+        self.cols = len(self.positions[0]) if self.positions else 0
         self.map_data = map_data if map_data is not None else []
+        self.batch = pyglet.graphics.Batch()
+        self.walls: Dict[int, TexturedSquare] = {}
+        # Hidden wall sprites, kept for reuse
+        self._spare_walls: List[TexturedSquare] = []
+        self.portals: Dict[int, int] = {}
+        self._portal_shapes: Dict[int, Circle] = {}
+        self._portal_pairs = 0
+        self.listeners: List[DungeonListener] = []
+        self.tick = 0
+        # Expiry tick of each timed wall, and a heap of (tick, cell) to find
+        # the next one; heap entries whose wall is gone are skipped
+        self._expiry: Dict[int, int] = {}
+        self._timers: List[Tuple[int, int]] = []
+        self.compiled = compiled
+        if map_data and compiled is None:
+            self.compiled = CompiledMap.from_map(map_data)
+        self.tiles = bytearray(self.rows * self.cols)
         
         # Load wall texture
         self.wall_texture = pyglet.image.load(window.config["TEXTURES"]["BRICK"])
         
         # Create wall objects if map is provided
         if map_data:
-            self._validate_map_size()
+            self.tiles = bytearray(self.compiled.walls)
             self._create_walls()
     
-    def _create_position_grid(self) -> PositionGrid:
+    def _create_position_grid(self, map_data: Optional[MapGrid]) -> PositionGrid:
         """Create a grid of all possible positions in the game."""
-        rows = window.config["SCREEN_HEIGHT"] // window.config["SQUARE_SIZE"]
-        cols = window.config["SCREEN_WIDTH"] // window.config["SQUARE_SIZE"]
+        if map_data:
+            rows, cols = len(map_data), len(map_data[0])
+        else:
+            rows = window.logical_height // window.cell_size
+            cols = window.logical_width // window.cell_size
 
         return [
             [
                 Position(
-                    x=col * window.config["SQUARE_SIZE"],
-                    y=(rows - row - 1) * window.config["SQUARE_SIZE"]  # Flip vertically
+                    x=col * window.cell_size,
+                    y=(rows - row - 1) * window.cell_size  # Flip vertically
                 )
                 for col in range(cols)
             ]
             for row in range(rows)
         ]
     
-    def _validate_map_size(self) -> None:
-        """Validate that the map dimensions match the position grid.
-        
+    def _create_walls(self) -> None:
+        """Create wall objects from the compiled wall bitmap."""
+        for index, wall in enumerate(self.compiled.walls):
+            if wall:
+                self._show_wall(index)
+
+    def _show_wall(self, index: int) -> None:
+        """Put a wall sprite on a cell, reusing a hidden one if possible."""
+        cell = self.cell(index)
+        position = self.positions[cell.row][cell.column]
+        if self._spare_walls:
+            wall = self._spare_walls.pop()
+            wall.move_to(position)
+            wall.sprite.visible = True
+        else:
+            wall = TexturedSquare(
+                position=position,
+                size=Size(
+                    width=window.cell_size,
+                    height=window.cell_size
+                ),
+                texture_path=window.config["TEXTURES"]["BRICK"],
+                window=window,
+                batch=self.batch
+            )
+        self.walls[index] = wall
+
+    def _hide_wall(self, index: int) -> None:
+        """Take the wall sprite off a cell and keep it for reuse."""
+        wall = self.walls.pop(index)
+        wall.sprite.visible = False
+        self._spare_walls.append(wall)
+
+    def _notify(
+        self,
+        blocked: List[MapPosition],
+        freed: List[MapPosition],
+        walled: List[MapPosition],
+        unwalled: List[MapPosition],
+    ) -> None:
+        """Tell the listeners which cells changed, if any did."""
+        if blocked or freed:
+            for listener in self.listeners:
+                listener.on_tiles_changed(self, blocked, freed)
+        if walled or unwalled:
+            for listener in self.listeners:
+                listener.on_walls_changed(self, walled, unwalled)
+
+    def apply_map(self, map_data: MapGrid, compiled: CompiledMap) -> None:
+        """Switch to a new map, touching only the cells that changed.
+
+        The current tiles are diffed against the new wall bitmap, and wall
+        sprites are only added or removed where they differ, so reloading a
+        large map after a small edit is cheap. Portals and timed walls are
+        dropped. Listeners are notified of the changed cells.
+
+        Args:
+            map_data: The new map
+            compiled: Compiled form of the new map
+
         Raises:
-            MapSizeError: If dimensions don't match
+            MapSizeError: If the new map doesn't match the grid dimensions;
+                the current map is left untouched
         """
-        if not self.map_data:
-            return
-            
-        expected_rows = len(self.positions)
-        expected_cols = len(self.positions[0]) if self.positions else 0
-        
-        actual_rows = len(self.map_data)
-        actual_cols = len(self.map_data[0]) if self.map_data else 0
-        
-        if actual_rows != expected_rows or actual_cols != expected_cols:
+        if compiled.rows != self.rows or compiled.cols != self.cols:
             raise MapSizeError(
-                f"Map size ({actual_rows}x{actual_cols}) doesn't match "
-                f"grid size ({expected_rows}x{expected_cols})"
+                f"Map size ({compiled.rows}x{compiled.cols}) doesn't match "
+                f"grid size ({self.rows}x{self.cols})"
             )
-    
-    def _create_walls(self) -> None:
-        """Create wall objects based on the map data."""
-        self.walls: List[TexturedSquare] = []
-        
-        for i, row in enumerate(self.map_data):
-            for j, tile in enumerate(row):
-                if tile == TILE_WALL:
-                    position = self.positions[i][j]
-                    self.walls.append(
-                        TexturedSquare(
-                            position=position,
-                            size=Size(
-                                width=window.config["SQUARE_SIZE"],
-                                height=window.config["SQUARE_SIZE"]
-                            ),
-                            texture_path=window.config["TEXTURES"]["BRICK"],
-                            window=window
-                        )
-                    )
-    
+
+        self._expiry.clear()
+        self._timers.clear()
+        old = np.frombuffer(self.tiles, dtype=np.uint8)
+        new = np.frombuffer(compiled.walls, dtype=np.uint8)
+
+        blocked: List[MapPosition] = []
+        freed: List[MapPosition] = []
+        walled: List[MapPosition] = []
+        unwalled: List[MapPosition] = []
+        for index in np.flatnonzero(old != new).tolist():
+            was, tile = old[index], new[index]
+            if was == TILE_WALL:
+                self._hide_wall(index)
+                unwalled.append(self.cell(index))
+            elif was == TILE_PORTAL:
+                self.portals.pop(index)
+                self._portal_shapes.pop(index).delete()
+            if tile == TILE_WALL:
+                self._show_wall(index)
+                walled.append(self.cell(index))
+            if was == TILE_EMPTY:
+                blocked.append(self.cell(index))
+            elif tile == TILE_EMPTY:
+                freed.append(self.cell(index))
+
+        self.map_data = map_data
+        self.compiled = compiled
+        self.tiles = bytearray(compiled.walls)
+        self._notify(blocked, freed, walled, unwalled)
+
+    def cell(self, index: int) -> MapPosition:
+        """Convert a flat cell index to a map position."""
+        return MapPosition(row=index // self.cols, column=index % self.cols)
+
+    def index(self, cell: MapPosition) -> int:
+        """Convert a map position to a flat cell index.
+
+        Raises:
+            IndexError: If the cell is off the map
+        """
+        if not (0 <= cell.row < self.rows and 0 <= cell.column < self.cols):
+            raise IndexError(f"Cell {tuple(cell)} is off the map")
+        return cell.row * self.cols + cell.column
+
+    def tile(self, cell: MapPosition) -> int:
+        """Get the current TILE_* value of a cell; cells off the map are walls."""
+        if not (0 <= cell.row < self.rows and 0 <= cell.column < self.cols):
+            return TILE_WALL
+        return self.tiles[cell.row * self.cols + cell.column]
+
+    def place_wall(self, cell: MapPosition, lifetime: Optional[int] = None) -> bool:
+        """Put a wall on an empty cell.
+
+        Args:
+            cell: The cell to wall off
+            lifetime: Number of advance() steps until the wall is removed
+                again; a permanent wall if None
+
+        Returns:
+            True if the wall was placed, False if the cell was not empty
+
+        Raises:
+            IndexError: If the cell is off the map
+        """
+        index = self.index(cell)
+        if self.tiles[index] != TILE_EMPTY:
+            return False
+        self.tiles[index] = TILE_WALL
+        self._show_wall(index)
+        if lifetime is not None:
+            expiry = self.tick + max(1, lifetime)
+            self._expiry[index] = expiry
+            heapq.heappush(self._timers, (expiry, index))
+        self._notify([cell], [], [cell], [])
+        return True
+
+    def remove_wall(self, cell: MapPosition) -> bool:
+        """Clear a wall, whether it came from the map or was placed later.
+
+        Returns:
+            True if the wall was removed, False if the cell held no wall
+
+        Raises:
+            IndexError: If the cell is off the map
+        """
+        index = self.index(cell)
+        if self.tiles[index] != TILE_WALL:
+            return False
+        self._clear_wall(index)
+        self._notify([], [cell], [], [cell])
+        return True
+
+    def _clear_wall(self, index: int) -> None:
+        """Remove a wall from the tile index and the batch."""
+        self.tiles[index] = TILE_EMPTY
+        self._expiry.pop(index, None)
+        self._hide_wall(index)
+
+    def advance(self, steps: int = 1) -> List[MapPosition]:
+        """Step the clock of timed walls, removing the ones that expired.
+
+        Args:
+            steps: Number of ticks to advance
+
+        Returns:
+            Cells whose walls were removed
+        """
+        self.tick += steps
+        freed: List[MapPosition] = []
+        while self._timers and self._timers[0][0] <= self.tick:
+            expiry, index = heapq.heappop(self._timers)
+            if self._expiry.get(index) == expiry:
+                self._clear_wall(index)
+                freed.append(self.cell(index))
+        self._notify([], freed, [], freed)
+        return freed
+
+    def add_portal(self, entrance: MapPosition, destination: MapPosition) -> bool:
+        """Link two empty cells with a two-way portal.
+
+        A snake moving onto either cell comes out on the other one.
+
+        Returns:
+            True if the portal was added, False if either cell was not empty
+
+        Raises:
+            IndexError: If either cell is off the map
+        """
+        first, second = self.index(entrance), self.index(destination)
+        if first == second or self.tiles[first] != TILE_EMPTY or self.tiles[second] != TILE_EMPTY:
+            return False
+
+        color = PORTAL_COLORS[self._portal_pairs % len(PORTAL_COLORS)]
+        self._portal_pairs += 1
+        square_size = window.cell_size
+        for index, other, cell in ((first, second, entrance), (second, first, destination)):
+            self.tiles[index] = TILE_PORTAL
+            self.portals[index] = other
+            position = self.positions[cell.row][cell.column]
+            self._portal_shapes[index] = Circle(
+                position.x + square_size / 2,
+                position.y + square_size / 2,
+                square_size * 0.4,
+                color=color,
+                batch=self.batch,
+            )
+        self._notify([entrance, destination], [], [], [])
+        return True
+
+    def remove_portal(self, cell: MapPosition) -> bool:
+        """Remove the portal on a cell together with its other end.
+
+        Returns:
+            True if a portal was removed
+
+        Raises:
+            IndexError: If the cell is off the map
+        """
+        index = self.index(cell)
+        if self.tiles[index] != TILE_PORTAL:
+            return False
+        freed = []
+        for end in (index, self.portals[index]):
+            self.tiles[end] = TILE_EMPTY
+            del self.portals[end]
+            self._portal_shapes.pop(end).delete()
+            freed.append(self.cell(end))
+        self._notify([], freed, [], [])
+        return True
+
+    def through_portal(self, position: Position) -> Position:
+        """Get where a move onto a position ends up.
+
+        Returns:
+            The other end of the portal on the position, or the position
+            itself if there is none
+        """
+        if not self.portals:
+            return position
+        cell = self.cell_at(position)
+        if self.tile(cell) != TILE_PORTAL:
+            return position
+        other = self.cell(self.portals[self.index(cell)])
+        return self.positions[other.row][other.column]
+
+    def cell_at(self, position: Position) -> MapPosition:
+        """Get the map cell containing a screen position.
+
+        Args:
+            position: The screen position to convert
+
+        Returns:
+            The map row and column of the position
+        """
+        square_size = window.cell_size
+        return MapPosition(
+            row=len(self.positions) - 1 - int(position.y // square_size),
+            column=int(position.x // square_size)
+        )
+
     def is_wall(self, position: Position) -> bool:
         """Check if a position contains a wall.
+
+        A constant-time lookup in the tile index, so walls placed at
+        runtime count too. Positions off the map count as walls, so nothing
+        can leave the grid.
         
         Args:
             position: The position to check
@@ -119,25 +401,52 @@ class Dungeon:
         Returns:
             True if the position contains a wall, False otherwise
         """
-        for wall in self.walls:
-            if wall.position == position:
-                return True
-        return False
+        if self.compiled is None:
+            return False
+        return self.tile(self.cell_at(position)) == TILE_WALL
     
     def get_valid_positions(self) -> List[Position]:
-        """Get all positions that don't contain walls.
+        """Get all positions whose tiles are currently empty.
         
         Returns:
             List of positions that are safe for other game objects
         """
-        valid_positions = []
-        for i, row in enumerate(self.map_data):
-            for j, tile in enumerate(row):
-                if tile == TILE_EMPTY:
-                    valid_positions.append(self.positions[i][j])
-        return valid_positions
+        if self.compiled is None:
+            return []
+        free = np.flatnonzero(np.frombuffer(self.tiles, dtype=np.uint8) == TILE_EMPTY)
+        cols = self.cols
+        return [self.positions[index // cols][index % cols] for index in free.tolist()]
+
+    def spawn_position(self) -> Position:
+        """Get the screen position a snake starts on.
+
+        Walls and portals placed at runtime are respected: the first
+        compiled spawn point whose tile is still empty is used, or else the
+        empty cell nearest to the primary spawn point.
+
+        Returns:
+            The chosen spawn point, or the screen centre when there is no map
+        """
+        if self.compiled is None:
+            return Position(
+                x=window.logical_width // 2,
+                y=window.logical_height // 2
+            )
+        spawn_points = self.compiled.spawn_points
+        cell = next((cell for cell in spawn_points if self.tile(cell) == TILE_EMPTY), None)
+        if cell is None:
+            free = np.flatnonzero(np.frombuffer(self.tiles, dtype=np.uint8) == TILE_EMPTY)
+            primary = spawn_points[0]
+            if free.size:
+                distance = (
+                    np.abs(free // self.cols - primary.row)
+                    + np.abs(free % self.cols - primary.column)
+                )
+                cell = self.cell(int(free[np.argmin(distance)]))
+            else:
+                cell = primary
+        return self.positions[cell.row][cell.column]
     
     def draw(self) -> None:
-        """Draw all walls in the dungeon."""
-        for wall in self.walls:
-            wall.draw()
\ No newline at end of file
+        """Draw all walls and portals in the dungeon."""
+        self.batch.draw()
\ No newline at end of file
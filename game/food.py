@@ -1,32 +1,33 @@
 import random
-from typing import List
+from typing import Callable, Dict, List
 
 import pyglet
 
 from game.app import window
-from game.dungeon import Dungeon
+from game.dungeon import Dungeon, DungeonListener
 from game.square import TexturedSquare
-from game.types import Position, Size, TILE_EMPTY
+from game.types import MapPosition, Position, Size
 
-class Food(TexturedSquare):
+class Food(TexturedSquare, DungeonListener):
     """Represents the food that the snake can eat.
     
     Attributes:
         dungeon: The game's dungeon instance for position validation.
-        valid_positions: List of positions where the food can appear (no walls).
+        valid_positions: List of positions where the food can appear (no walls),
+            kept up to date as the dungeon's tiles change.
+        observers: Called with the new position whenever the food moves.
     """
 
     def __init__(self, dungeon: Dungeon) -> None:
         """Initialize the food object with a valid starting position."""
         self.dungeon = dungeon
+        self.observers: List[Callable[[Position], None]] = []
         
-        # Determine valid positions: Only tiles marked as TILE_EMPTY
-        self.valid_positions = [
-            dungeon.positions[i][j]
-            for i, row in enumerate(dungeon.map_data)
-            for j, tile in enumerate(row)
-            if tile == TILE_EMPTY
-        ]
+        # Valid positions come straight from the dungeon's compiled map
+        self.valid_positions = dungeon.get_valid_positions()
+        self._slots: Dict[Position, int] = {
+            position: slot for slot, position in enumerate(self.valid_positions)
+        }
         
         if not self.valid_positions:
             raise RuntimeError("No valid positions available for food placement.")
@@ -37,17 +38,24 @@ class Food(TexturedSquare):
         super().__init__(
             position=initial_pos,
             size=Size(
-                width=window.config["SQUARE_SIZE"],
-                height=window.config["SQUARE_SIZE"]
+                width=window.cell_size,
+                height=window.cell_size
             ),
             texture_path=window.config["TEXTURES"]["FOOD"],
             window=window
         )
+        dungeon.listeners.append(self)
 
     def _get_random_position(self) -> Position:
         """Get a random valid position for the food."""
         return random.choice(self.valid_positions)
 
+    def move_to(self, position: Position) -> None:
+        """Move the food and notify the observers."""
+        super().move_to(position)
+        for observer in self.observers:
+            observer(position)
+
     def reset_position(self, occupied_positions: List[Position]) -> None:
         """Move the food to a new random position, excluding occupied tiles.
         
@@ -61,13 +69,44 @@ class Food(TexturedSquare):
         if not available_positions:
             raise RuntimeError("No available positions for food placement.")
         
-        new_position = random.choice(available_positions)
-        self.position = new_position
-        
-        # Update the sprite's position by directly setting x and y.
-        if hasattr(self, "sprite"):
-            self.sprite.x = new_position.x
-            self.sprite.y = new_position.y
+        self.move_to(random.choice(available_positions))
+
+    def update_cells(self, added: List[Position], removed: List[Position]) -> None:
+        """Update the valid positions in place after the map changed.
+
+        Each change is O(1): removed positions are swapped with the last
+        entry and popped, new ones are appended.
+
+        Args:
+            added: Positions that became free
+            removed: Positions that became walls
+        """
+        for position in removed:
+            slot = self._slots.pop(position, None)
+            if slot is None:
+                continue
+            last = self.valid_positions.pop()
+            if slot < len(self.valid_positions):
+                self.valid_positions[slot] = last
+                self._slots[last] = slot
+        for position in added:
+            if position not in self._slots:
+                self._slots[position] = len(self.valid_positions)
+                self.valid_positions.append(position)
+
+    def on_tiles_changed(
+        self,
+        dungeon: Dungeon,
+        blocked: List[MapPosition],
+        freed: List[MapPosition],
+    ) -> None:
+        """Track the dungeon's empty cells, moving off a cell that was blocked."""
+        self.update_cells(
+            added=[dungeon.positions[cell.row][cell.column] for cell in freed],
+            removed=[dungeon.positions[cell.row][cell.column] for cell in blocked],
+        )
+        if self.position not in self._slots and self.valid_positions:
+            self.move_to(self._get_random_position())
 
     def is_eaten(self, head_position: Position) -> bool:
         """Check if the snake's head is at the food's position."""
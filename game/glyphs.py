@@ -0,0 +1,161 @@
+"""
+Text drawn from cached glyph sprites, for HUD text that changes every frame.
+
+A pyglet Label lays its whole text out again and rebuilds its vertex lists
+whenever the text changes. GlyphText instead keeps one sprite per character
+slot, textured straight from the font's glyph atlas, and on a change only
+re-textures the slots whose character changed. Digits have equal advances in
+common fonts, so a counting score moves no sprites at all until it gains a
+digit.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import pyglet
+from pyglet.font.base import Glyph
+from pyglet.graphics import Batch, Group
+from pyglet.sprite import Sprite
+
+Color = Tuple[int, int, int, int]
+
+
+class GlyphCache:
+    """Glyphs of one font, rendered into the font's atlas once each."""
+
+    def __init__(self, font_name: str, font_size: float, weight: str = "normal") -> None:
+        """Load the font the glyphs are taken from."""
+        self.font = pyglet.font.load(font_name, font_size, weight=weight)
+        self._glyphs: Dict[str, Glyph] = {}
+
+    def glyph(self, char: str) -> Glyph:
+        """Get the glyph of a character, rendering it on first use."""
+        glyph = self._glyphs.get(char)
+        if glyph is None:
+            glyph = self._glyphs[char] = self.font.get_glyphs(char)[0][0]
+        return glyph
+
+    def width(self, text: str) -> int:
+        """Get the advance width of a line of text."""
+        return sum(self.glyph(char).advance for char in text)
+
+
+class GlyphText:
+    """A single line of text drawn from per-character glyph sprites.
+
+    Attributes:
+        content_width: Advance width of the current text, in pixels
+    """
+
+    def __init__(
+        self,
+        cache: GlyphCache,
+        text: str = "",
+        x: float = 0,
+        y: float = 0,
+        anchor_x: str = "left",
+        color: Color = (255, 255, 255, 255),
+        batch: Optional[Batch] = None,
+        group: Optional[Group] = None,
+    ) -> None:
+        """Create the text.
+
+        Args:
+            cache: Glyphs to draw with
+            text: Initial text
+            x: Horizontal anchor position
+            y: Vertical centre of the line
+            anchor_x: "left", "center" or "right"
+            color: RGBA color of every glyph
+            batch: Batch to draw in
+            group: Group to draw in; use an earlier group for shadows
+        """
+        self.cache = cache
+        self.batch = batch
+        self.group = group
+        self._x = x
+        self._y = y
+        self.anchor_x = anchor_x
+        self._color = color
+        self._sprites: List[Sprite] = []
+        # Character and pen position each sprite currently shows
+        self._slots: List[Tuple[str, Optional[float]]] = []
+        self._text = ""
+        self.content_width = 0
+        self.text = text
+
+    @property
+    def text(self) -> str:
+        """The text shown."""
+        return self._text
+
+    @text.setter
+    def text(self, text: str) -> None:
+        if text == self._text:
+            return
+        self._text = text
+        self.content_width = self.cache.width(text)
+        self._layout()
+
+    @property
+    def color(self) -> Color:
+        """RGBA color of the text."""
+        return self._color
+
+    @color.setter
+    def color(self, color: Color) -> None:
+        if color == self._color:
+            return
+        self._color = color
+        for sprite in self._sprites:
+            sprite.color = color
+
+    @property
+    def position(self) -> Tuple[float, float]:
+        """Anchor position of the text."""
+        return self._x, self._y
+
+    @position.setter
+    def position(self, position: Tuple[float, float]) -> None:
+        if position == (self._x, self._y):
+            return
+        self._x, self._y = position
+        self._slots = [(char, None) for char, _ in self._slots]
+        self._layout()
+
+    def _layout(self) -> None:
+        """Update only the sprites whose character or pen position changed."""
+        font = self.cache.font
+        pen = self._x
+        if self.anchor_x == "center":
+            pen -= self.content_width / 2
+        elif self.anchor_x == "right":
+            pen -= self.content_width
+        baseline = self._y - (font.ascent + font.descent) / 2
+
+        for index, char in enumerate(self._text):
+            glyph = self.cache.glyph(char)
+            if index == len(self._sprites):
+                sprite = Sprite(glyph, batch=self.batch, group=self.group)
+                sprite.color = self._color
+                self._sprites.append(sprite)
+                self._slots.append(("", None))
+            sprite = self._sprites[index]
+            shown, shown_pen = self._slots[index]
+            if shown != char:
+                sprite.image = glyph
+            if shown != char or shown_pen != pen:
+                sprite.position = (pen + glyph.vertices[0], baseline + glyph.vertices[1], 0)
+                sprite.visible = True
+                self._slots[index] = (char, pen)
+            pen += glyph.advance
+
+        for index in range(len(self._text), len(self._sprites)):
+            if self._slots[index][0]:
+                self._sprites[index].visible = False
+                self._slots[index] = ("", None)
+
+    def delete(self) -> None:
+        """Free the sprites."""
+        for sprite in self._sprites:
+            sprite.delete()
+        self._sprites = []
+        self._slots = []
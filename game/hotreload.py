@@ -0,0 +1,102 @@
+"""
+Polling file watcher used to hot-reload the config and map files.
+
+Files are checked on the pyglet clock, so change callbacks run on the game
+loop between ticks and never race with game state updates. Polling a
+stat() per file is cheap enough at the default interval and behaves the
+same on every platform and file system.
+"""
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pyglet
+
+from game.telemetry import telemetry
+from game.types import FilePath
+
+DEFAULT_POLL_INTERVAL = 0.5
+
+# Modification time and size; None while the file does not exist
+FileSignature = Optional[Tuple[int, int]]
+
+
+def file_signature(path: Path) -> FileSignature:
+    """Get the signature used to detect changes to a file."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileWatcher:
+    """Calls back when watched files change on disk.
+
+    A file counts as changed when its modification time or size differs
+    from the last poll. Deleting a file is not reported; recreating it is.
+    """
+
+    def __init__(self, interval: float = DEFAULT_POLL_INTERVAL, clock: Optional[Any] = None) -> None:
+        """Initialize a watcher with no files.
+
+        Args:
+            interval: Seconds between polls
+            clock: Clock to poll on; defaults to pyglet's default clock
+        """
+        self.interval = interval
+        self._clock = clock
+        self._watched: Dict[Path, Tuple[FileSignature, Callable[[Path], None]]] = {}
+        self.running = False
+
+    @property
+    def clock(self) -> Any:
+        """The clock polls are scheduled on."""
+        return self._clock or pyglet.clock.get_default()
+
+    def watch(self, path: FilePath, callback: Callable[[Path], None]) -> None:
+        """Start watching a file, replacing any callback it already had.
+
+        Args:
+            path: File to watch; it does not have to exist yet
+            callback: Called with the path after each change
+        """
+        path = Path(path)
+        self._watched[path] = (file_signature(path), callback)
+
+    def unwatch(self, path: FilePath) -> None:
+        """Stop watching a file, if it was watched."""
+        self._watched.pop(Path(path), None)
+
+    def start(self) -> None:
+        """Start polling."""
+        if not self.running:
+            self.running = True
+            self.clock.schedule_interval(self.poll, self.interval)
+
+    def stop(self) -> None:
+        """Stop polling."""
+        if self.running:
+            self.running = False
+            self.clock.unschedule(self.poll)
+
+    def poll(self, dt: float = 0.0) -> None:
+        """Check every watched file once and run the callbacks of changed ones.
+
+        A callback that raises is reported through telemetry; the watcher
+        and the other callbacks carry on.
+        """
+        changed = []
+        for path, (signature, callback) in self._watched.items():
+            current = file_signature(path)
+            if current != signature:
+                self._watched[path] = (current, callback)
+                if current is not None:
+                    changed.append((path, callback))
+        # Callbacks may change the watch list, so run them after the scan
+        for path, callback in changed:
+            try:
+                callback(path)
+            except Exception as e:
+                # A half-saved or broken file must not take the game down
+                telemetry.error(f"Reloading {path} failed: {e!r}")
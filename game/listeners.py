@@ -0,0 +1,69 @@
+"""
+Listener base classes for snake and dungeon events.
+
+They live apart from game.snake and game.dungeon, which open the game
+window on import, so that modules used without a window (shared state, run
+logs) can still subclass them.
+"""
+from typing import List
+
+from game.types import MapPosition, Position
+
+
+class SnakeListener:
+    """Base class for objects notified of snake events.
+
+    Override only the callbacks you need; the defaults do nothing.
+    """
+
+    def on_death(self, snake: "Snake") -> None:
+        """Called when the snake dies, before it is reset."""
+
+    def on_head(self, snake: "Snake", position: Position) -> None:
+        """Called after a new head segment was added at a position."""
+
+    def on_tail(self, snake: "Snake", position: Position) -> None:
+        """Called after the tail segment left a position; before on_head."""
+
+    def on_reset(self, snake: "Snake") -> None:
+        """Called after the whole body was replaced by a respawn or restore."""
+
+    def on_tick(self, snake: "Snake") -> None:
+        """Called at the end of every move, once deaths and eating are handled."""
+
+
+class DungeonListener:
+    """Base class for objects notified when dungeon tiles change."""
+
+    def on_tiles_changed(
+        self,
+        dungeon: "Dungeon",
+        blocked: List[MapPosition],
+        freed: List[MapPosition],
+    ) -> None:
+        """Called after tiles stop or start being empty.
+
+        Args:
+            dungeon: The dungeon that changed
+            blocked: Cells that were empty and now hold a wall or portal
+            freed: Cells that are empty again
+        """
+        pass
+
+    def on_walls_changed(
+        self,
+        dungeon: "Dungeon",
+        walled: List[MapPosition],
+        unwalled: List[MapPosition],
+    ) -> None:
+        """Called after walls appear or disappear.
+
+        Also covers cells that swap one non-empty tile for another, such as
+        a portal replaced by a wall, which on_tiles_changed does not report.
+
+        Args:
+            dungeon: The dungeon that changed
+            walled: Cells that hold a wall now and did not before
+            unwalled: Cells whose wall is gone
+        """
+        pass
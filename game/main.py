@@ -1,27 +1,95 @@
 """
 Main entry point for the Super PySnake game.
 """
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
 import pyglet
+from pyglet.sprite import Sprite
+from pyglet.text import Label
 from pyglet.window import key
 
 from pyscored.core.scoring_engine import ScoringEngine
 from pyscored.adapters import GameFrameworkAdapter
 
 
+from game.animation import hud_animator
 from game.app import window
+from game.client import ThreadedGameClient
+from game.controls import InputQueue
 from game.dungeon import Dungeon
 from game.food import Food
-from game.snake import Snake
+from game.hotreload import FileWatcher
+from game.mapcompiler import CompiledMap, CompiledMapCache, MapCompileError
+from game.mapgen import MapCache
+from game.navigation import NavigationCache, NavigationData
+from game.render import FrameScheduler
+from game.runlog import DEFAULT_RUNS_DIR, RunRecorder, RunWriter
+from game.scoring import ScorePipeline, ScoreSnapshot
+from game.snake import Snake, SnakeListener
 from game.square import TexturedSquare
-from game.types import Position, Size
-from game.score_display import ScoreDisplay 
-from utils.serializable import Serializable
+from game.telemetry import EventKind, telemetry
+from game.timestep import FixedTimestep
+from game.types import (
+    MAP_STYLES,
+    ConfigValueError,
+    Direction,
+    MapGrid,
+    MapParams,
+    MapPosition,
+    MapSizeError,
+    Position,
+    Size,
+)
+from game.records import ScoreStore
+from game.score_display import LeaderboardDisplay, ScoreDisplay
+from game.sharedstate import SharedBoard, StatePublisher
+from game.snapshot import (
+    GameSnapshot,
+    SnapshotError,
+    decode_snapshot,
+    encode_snapshot,
+)
+from utils.serializable import COMPACT_JSON, Serializable, SerializationError
+
+# Settings that only take effect on restart; hot reloads leave them alone
+RESTART_SETTINGS = ("SCREEN_WIDTH", "SCREEN_HEIGHT", "SQUARE_SIZE", "FULLSCREEN", "TEXTURES")
+
+# Keyboard bindings for the four movement directions
+KEY_DIRECTIONS: Dict[int, Direction] = {
+    key.UP: Direction.NORTH,
+    key.W: Direction.NORTH,
+    key.DOWN: Direction.SOUTH,
+    key.S: Direction.SOUTH,
+    key.LEFT: Direction.WEST,
+    key.A: Direction.WEST,
+    key.RIGHT: Direction.EAST,
+    key.D: Direction.EAST,
+}
+
+# Frame interval assumed when the frame rate is uncapped
+UNCAPPED_FRAME_TIME = 1.0 / 60.0
+
+
+def _frame_time(max_fps: float) -> float:
+    """Get the shortest time between frames under a frame-rate cap."""
+    return 1.0 / max_fps if max_fps > 0 else UNCAPPED_FRAME_TIME
+
 
 class MapHandler(Serializable):
     """Handles loading and saving of game maps."""
 
-    def __init__(self) -> None:
-        """Initialize the map handler and load map data."""
+    codec = COMPACT_JSON
+
+    def __init__(self, map_data: Optional[MapGrid] = None) -> None:
+        """Initialize the map handler and load map data.
+
+        Args:
+            map_data: Map to use instead of the configured map file
+        """
         super().__init__()
         
         self.default_map = [
@@ -50,99 +118,656 @@ class MapHandler(Serializable):
             [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
         ]
         
-        if window.config["DEFAULT_MAP_FILE"]:
+        # File the map was loaded from; compiled maps are cached next to it
+        self.source: Optional[str] = None
+
+        if map_data is not None:
+            self.data = map_data
+        elif window.config["DEFAULT_MAP_FILE"]:
+            self.source = window.config["DEFAULT_MAP_FILE"]
             try:
-                self.data = self.load(window.config["DEFAULT_MAP_FILE"])
+                self.data = self.load(self.source)
             except Exception:
                 self.data = self.default_map
-                self.write(window.config["DEFAULT_MAP_FILE"])
+                self.write(self.source)
         else:
             self.data = self.default_map
 
+        self._compiled: Optional[CompiledMap] = None
+        self._navigation: Optional[NavigationData] = None
+
+    @property
+    def compiled(self) -> CompiledMap:
+        """Get the compiled form of the loaded map.
+
+        Loaded from the cache next to the map file, or compiled and cached,
+        the first time it is requested.
+        """
+        if self._compiled is None:
+            self._compiled = CompiledMapCache().get(self.data, self.source)
+        return self._compiled
+
+    def replace(self, map_data: MapGrid, compiled: CompiledMap) -> None:
+        """Switch to a new map, dropping data derived from the old one."""
+        self.data = map_data
+        self._compiled = compiled
+        self._navigation = None
+
+    @property
+    def navigation(self) -> NavigationData:
+        """Get the precomputed navigation data for the loaded map.
+
+        The data is loaded from the on-disk cache, or computed and cached,
+        the first time it is requested.
+        """
+        if self._navigation is None:
+            self._navigation = NavigationCache().get(self.data)
+        return self._navigation
+
+
+class SessionRecorder(SnakeListener):
+    """Records every finished game of a play session in a ScoreStore."""
+
+    def __init__(self, store: ScoreStore, map_id: str, player_id: str) -> None:
+        """Start a session for a player on a map."""
+        self.store = store
+        self.map_id = map_id
+        self.player_id = player_id
+        self.session_id = store.start_session(
+            map_id,
+            player_id,
+            {"map_file": window.config["DEFAULT_MAP_FILE"]},
+        )
+        self._start_tick = 0
+
+    def on_death(self, snake: Snake) -> None:
+        """Record the game that just ended."""
+        self.record(snake)
+        self._start_tick = snake.tick_count
+
+    def record(self, snake: Snake) -> None:
+        """Queue the current game's result."""
+        self.store.record_game(
+            self.session_id,
+            self.map_id,
+            self.player_id,
+            score=snake.current_score,
+            length=len(snake.body),
+            ticks=max(0, snake.tick_count - self._start_tick),
+        )
+
+    def finish(self, snake: Snake) -> None:
+        """Record the game in progress, if any, and close the session."""
+        if snake.tick_count > self._start_tick:
+            self.record(snake)
+        self.store.end_session(self.session_id)
+
+
+class InputReset(SnakeListener):
+    """Drops queued turns when the snake dies, so they don't carry over."""
+
+    def __init__(self, input_queue: InputQueue) -> None:
+        """Watch for deaths on behalf of an input queue."""
+        self.input_queue = input_queue
+
+    def on_death(self, snake: Snake) -> None:
+        """Clear the queue."""
+        self.input_queue.clear()
+
 
 class Game:
     """Main game orchestrator."""
     
-    def __init__(self) -> None:
-        """Initialize all game components."""
+    def __init__(
+        self,
+        score_store: Optional[ScoreStore] = None,
+        map_data: Optional[MapGrid] = None,
+    ) -> None:
+        """Initialize all game components.
+
+        Args:
+            score_store: Where finished games are recorded; defaults to the
+                local high-score database
+            map_data: Map to play on instead of the configured map file
+        """
+        # Create map handler and load map; its board is fitted into the
+        # configured screen size and the frames are scaled to the window
+        self.map_handler = MapHandler(map_data)
+        compiled = self.map_handler.compiled
+        window.fit_board(compiled.rows, compiled.cols)
+        self.dungeon = Dungeon(self.map_handler.data, compiled)
+        self.map_hash = compiled.map_hash
+
         # Create background
         self.background = TexturedSquare(
             position=Position(0, 0),
             size=Size(
-                width=window.config["SCREEN_WIDTH"],
-                height=window.config["SCREEN_HEIGHT"] + window.config["SCREEN_HEIGHT"] // 3
+                width=window.logical_width,
+                height=window.logical_height + window.logical_height // 3
             ),
             texture_path=window.config["TEXTURES"]["BACKGROUND"],
             window=window
         )
         
-        # Create map handler and load map
-        self.map_handler = MapHandler()
-        self.dungeon = Dungeon(self.map_handler.data)
-        
         # Initialize scoring engine and adapter
         self.scoring_engine = ScoringEngine()
         self.game_adapter = GameFrameworkAdapter(self.scoring_engine)
-        self.game_adapter.setup_player(player_id="player1", initial_score=0)
-        self.score_display = ScoreDisplay(self.game_adapter, "player1")
+        # Ticks only queue score events; they reach the engine in batches
+        # between ticks, and the HUD shows the published snapshots
+        self.scores = ScorePipeline(self.game_adapter)
+        self.scores.setup_player(player_id="player1", initial_score=0)
+        self.score_display = ScoreDisplay(self.scores.reader, "player1")
+        self.scores.observers.append(self._show_scores)
         
         # Create game objects
-        self.snake = Snake(self.dungeon, self.game_adapter)
+        self.snake = Snake(self.dungeon, self.scores, player_id="player1")
         self.food = Food(self.dungeon)
+        self._quicksave: Optional[bytes] = None
+
+        # Persist results and keep the leaderboard ready to show
+        self.score_store = score_store or ScoreStore()
+        self.recorder = SessionRecorder(self.score_store, self.map_hash, self.snake.player_id)
+        self.snake.listeners.append(self.recorder)
+
+        # Direction presses wait here until the tick that applies them
+        self.input_queue = InputQueue()
+        self.snake.listeners.append(InputReset(self.input_queue))
+        self.leaderboard = LeaderboardDisplay()
+
+        # Redraw only when something on screen changed
+        self.paused = False
+        self.pause_label = Label(
+            text="Paused",
+            font_name="Arial Bold",
+            font_size=36,
+            x=window.logical_width // 2,
+            y=window.logical_height // 2,
+            anchor_x="center",
+            anchor_y="center",
+        )
+        self.renderer = FrameScheduler(window, max_fps=window.config["MAX_FPS"])
+        hud_animator.observers.append(self.renderer.invalidate)
+
+        # Ticks run in fixed steps from an accumulator, so at turbo speeds
+        # a frame shows only the state the latest batch of ticks ended on
+        self.timestep = FixedTimestep(
+            self.tick,
+            self.snake.speed,
+            frame_time=_frame_time(window.config["MAX_FPS"]),
+        )
+        self.speed_label = Label(
+            text="",
+            font_name="Arial Bold",
+            font_size=14,
+            x=window.logical_width - 10,
+            y=10,
+            anchor_x="right",
+            anchor_y="bottom",
+        )
+
+        # Set by watch_files when hot reloading is on
+        self.watcher: Optional[FileWatcher] = None
+        # Set by share_state when external bots are served
+        self.publisher: Optional[StatePublisher] = None
+        # Set by record_runs when moves are logged for analysis
+        self.run_recorder: Optional[RunRecorder] = None
         
         # Set up input handling
         self.setup_input_handlers()
         
         # Do initial movement to set up game state
         self.snake.move(None, self.food)
+
+    def snapshot(self) -> bytes:
+        """Capture the full game state as a compact binary snapshot."""
+        return encode_snapshot(GameSnapshot(
+            map_hash=self.map_hash,
+            tick=self.snake.tick_count,
+            direction=self.snake.direction,
+            body=[segment.position for segment in self.snake.body],
+            food=self.food.position,
+            score=self.scores.get_player_score(self.snake.player_id),
+            rng_state=random.getstate(),
+        ))
+
+    def restore(self, data: bytes) -> None:
+        """Restore a snapshot taken on the same map.
+
+        Sprites are moved in place, so neither textures nor walls are rebuilt.
+
+        Raises:
+            SnapshotError: If the snapshot is invalid or from another map
+        """
+        snapshot = decode_snapshot(data)
+        if snapshot.map_hash != self.map_hash:
+            raise SnapshotError("Snapshot was taken on a different map")
+
+        self.snake.restore(snapshot.body, snapshot.direction, snapshot.tick)
+        self.food.move_to(snapshot.food)
+        self.scores.tick = snapshot.tick
+        self.scores.setup_player(
+            player_id=self.snake.player_id, initial_score=snapshot.score
+        )
+        self.snake.current_score = snapshot.score
+        random.setstate(snapshot.rng_state)
+        self.input_queue.clear()
+        self.scores.flush()
+        self.renderer.invalidate()
+
+    def reload_map(self, path: Optional[Path] = None) -> bool:
+        """Reload the map from disk, rebuilding only what changed.
+
+        Only the wall sprites and food cells that differ from the current
+        map are touched, and walls or portals placed at runtime are cleared.
+        If the snake or food is now inside a wall it is moved; otherwise
+        play carries on undisturbed. A map that fails to
+        load, compile or fit the screen is rejected and the current map is
+        kept.
+
+        Args:
+            path: Map file to load; defaults to the current map file
+
+        Returns:
+            True if the new map is in play
+        """
+        source = str(path) if path is not None else self.map_handler.source
+        if source is None:
+            return False
+
+        previous = self.map_handler.data
+        try:
+            map_data = self.map_handler.load(source)
+            compiled = CompiledMapCache().get(map_data, source)
+            self.dungeon.apply_map(map_data, compiled)
+        except (SerializationError, MapCompileError, MapSizeError) as e:
+            self.map_handler.data = previous
+            telemetry.error(f"Map reload of {source} failed, keeping the current map: {e}")
+            return False
+
+        self.map_handler.source = source
+        self.map_handler.replace(map_data, compiled)
+        self.map_hash = compiled.map_hash
+        self.recorder.map_id = compiled.map_hash
+
+        # The food moves itself off new walls; the snake has to respawn
+        if any(self.dungeon.is_wall(segment.position) for segment in self.snake.body):
+            self.input_queue.clear()
+            self.snake.reset(self.food)
+        self.renderer.invalidate()
+        return True
+
+    def reload_config(self, path: Optional[Path] = None) -> bool:
+        """Reload the config file and apply the settings that can change live.
+
+        Game speed, frame cap, render scale, telemetry and the map file are
+        applied at once; screen, square size and texture changes need a
+        restart. An
+        invalid file is rejected and the current settings are kept.
+
+        Returns:
+            True if the new config is in effect
+        """
+        try:
+            previous = window.reload_configuration()
+        except (SerializationError, KeyError, ConfigValueError) as e:
+            telemetry.error(f"Config reload failed, keeping the current config: {e}")
+            return False
+        config = window.config
+
+        self.snake.speed = config["GAME_SPEED"]
+        max_fps = config["MAX_FPS"]
+        self.renderer.min_frame_time = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.timestep.configure(step=self.snake.speed, frame_time=_frame_time(max_fps))
+        window.viewport.set_scale(config["RENDER_SCALE"])
+
+        ignored = [name for name in RESTART_SETTINGS if config[name] != previous[name]]
+        if ignored:
+            telemetry.error(f"Config changes to {', '.join(ignored)} apply after a restart")
+
+        map_file = config["DEFAULT_MAP_FILE"]
+        source = self.map_handler.source
+        if map_file != previous["DEFAULT_MAP_FILE"] and source is not None:
+            if self.reload_map(Path(map_file)) and self.watcher is not None:
+                self.watcher.unwatch(source)
+                self.watcher.watch(map_file, self.reload_map)
+        self.renderer.invalidate()
+        return True
+
+    def watch_files(self, watcher: Optional[FileWatcher] = None) -> FileWatcher:
+        """Hot-reload the config and map files whenever they change on disk.
+
+        Args:
+            watcher: Watcher to register with; a new one is started if omitted
+
+        Returns:
+            The watcher in use
+        """
+        self.watcher = watcher or FileWatcher()
+        self.watcher.watch(window.config_path, self.reload_config)
+        if self.map_handler.source is not None:
+            self.watcher.watch(self.map_handler.source, self.reload_map)
+        self.watcher.start()
+        return self.watcher
+
+    def share_state(self, name: Optional[str] = None) -> SharedBoard:
+        """Publish the board every tick for bots in other processes.
+
+        Moves sent back by a bot are queued like key presses.
+
+        Args:
+            name: Name of the shared memory block; random if omitted
+
+        Returns:
+            The shared board; its name is what readers attach to
+
+        Raises:
+            SharedStateError: If the block cannot be created
+        """
+        board = SharedBoard(self.dungeon.rows, self.dungeon.cols, name=name)
+        self.publisher = StatePublisher(board, self.dungeon)
+        self.publisher.publish(self.snake, self.food)
+        return board
+
+    def record_runs(self, root: Path = DEFAULT_RUNS_DIR) -> RunWriter:
+        """Log every move of this run as columnar chunks under a directory.
+
+        Raises:
+            OSError: If the run directory cannot be created
+            SerializationError: If the run index cannot be written
+        """
+        writer = RunWriter(self.map_hash, root)
+        self.run_recorder = RunRecorder(writer, self.snake, self.food)
+        return writer
+
+    def tick(self, dt: float) -> None:
+        """Apply the next queued turn, advance one move and schedule a redraw."""
+        self.dungeon.advance()
+        if self.publisher is not None:
+            action = self.publisher.board.take_action()
+            if action is not None:
+                self.input_queue.push(action, self.snake.direction)
+        self.snake.direction = self.input_queue.pop(self.snake.direction)
+        self.scores.tick = self.snake.tick_count + 1
+        self.snake.move(dt, self.food)
+        self.input_queue.applied(self.snake.tick_count)
+        if self.publisher is not None:
+            self.publisher.publish(self.snake, self.food)
+        self.renderer.invalidate()
+
+    def _draw_speed(self) -> None:
+        """Draw the playback speed and the ticks simulated for this frame."""
+        text = f"{self.timestep.speed:g}x  {self.timestep.pending_ticks} ticks/frame"
+        if self.speed_label.text != text:
+            self.speed_label.text = text
+        self.speed_label.draw()
+
+    def _show_scores(self, snapshot: ScoreSnapshot) -> None:
+        """Update the HUD from a newly applied batch of score events."""
+        self.score_display.update()
+        self.renderer.invalidate()
+
+    def toggle_pause(self) -> None:
+        """Pause or resume the game; a paused board is not redrawn."""
+        self.paused = not self.paused
+        if self.paused:
+            self.timestep.stop()
+        else:
+            self.timestep.start()
+        self.renderer.invalidate()
+
+    def set_speed(self, speed: float) -> None:
+        """Play at a multiple of normal speed, e.g. 10 for a 10x fast-forward.
+
+        Ticks keep their length, so the game plays out as it would at
+        normal speed; only more of them run per frame.
+        """
+        self.timestep.configure(speed=speed)
+        self.renderer.invalidate()
         
     def setup_input_handlers(self) -> None:
         """Set up keyboard input handlers."""
         @window.event
         def on_draw() -> None:
-            window.clear()
-            self.background.draw()
-            self.dungeon.draw()
-            self.food.draw()
-            self.snake.draw()
-            self.score_display.draw()
-            self.score_display.update()
+            started = time.perf_counter()
+            with window.frame():
+                window.clear()
+                self.background.draw()
+                self.dungeon.draw()
+                self.food.draw()
+                self.snake.draw()
+                self.score_display.draw()
+                self.leaderboard.draw()
+                if self.paused:
+                    self.pause_label.draw()
+                if self.timestep.speed != 1.0:
+                    self._draw_speed()
+            frame_time = time.perf_counter() - started
+            ticks = self.timestep.frame_rendered()
+            telemetry.record(EventKind.FRAME, self.snake.tick_count, frame_time)
+            telemetry.record(EventKind.CATCH_UP, self.snake.tick_count, ticks)
+            if self.run_recorder is not None:
+                self.run_recorder.frame_time = frame_time
             
         @window.event
         def on_key_press(symbol: int, modifiers: int) -> None:
-            from game.types import Direction
-            
-            if symbol in (key.UP, key.W):
-                self.snake.direction = Direction.NORTH
-            elif symbol in (key.DOWN, key.S):
-                self.snake.direction = Direction.SOUTH
-            elif symbol in (key.LEFT, key.A):
-                self.snake.direction = Direction.WEST
-            elif symbol in (key.RIGHT, key.D):
-                self.snake.direction = Direction.EAST
+            if symbol in KEY_DIRECTIONS:
+                self.input_queue.push(KEY_DIRECTIONS[symbol], self.snake.direction)
+            elif symbol == key.TAB:
+                if self.leaderboard.visible:
+                    self.leaderboard.hide()
+                else:
+                    self.leaderboard.show(self.score_store.top_scores(self.map_hash))
+                self.renderer.invalidate()
+            elif symbol == key.P:
+                self.toggle_pause()
+            elif symbol == key.BRACKETRIGHT:
+                self.set_speed(self.timestep.faster())
+            elif symbol == key.BRACKETLEFT:
+                self.set_speed(self.timestep.slower())
+            elif symbol == key.F5:
+                self._quicksave = self.snapshot()
+            elif symbol == key.F9 and self._quicksave is not None:
+                self.restore(self._quicksave)
             elif symbol == key.ESCAPE:
                 window.close()
+
+        @window.event
+        def on_expose() -> None:
+            self.renderer.invalidate()
+
+        @window.event
+        def on_resize(width: int, height: int) -> None:
+            self.renderer.invalidate()
     
     def run(self) -> None:
         """Start the game loop."""
         # Schedule snake movement
-        pyglet.clock.schedule_interval(
-            self.snake.move,
-            self.snake.speed,
-            self.food
-        )
+        self.timestep.start()
+        self.scores.start()
         
-        # Start the game loop
-        pyglet.app.run()
+        # Start the game loop; frames are drawn by the renderer on change
+        telemetry.start()
+        self.renderer.invalidate()
+        try:
+            pyglet.app.run(interval=None)
+        finally:
+            self.timestep.stop()
+            if self.watcher is not None:
+                self.watcher.stop()
+            self.scores.stop()
+            if self.publisher is not None:
+                self.publisher.board.close()
+            if self.run_recorder is not None:
+                self.run_recorder.writer.close()
+            self.recorder.finish(self.snake)
+            self.score_store.close()
+            telemetry.close()
+
+
+class RemoteGame:
+    """Front end for a game simulated by a remote server.
+
+    Walls come from the server's map; snakes and food are drawn from the
+    state mirrored by a ThreadedGameClient.
+    """
 
+    def __init__(self, host: str, port: int) -> None:
+        """Connect to the server and set up rendering."""
+        self.client = ThreadedGameClient(host, port)
+        state = self.client.start()
+        window.fit_board(len(state.map_data), len(state.map_data[0]))
+        self.dungeon = Dungeon(state.map_data)
 
-def main() -> None:
+        self.background = TexturedSquare(
+            position=Position(0, 0),
+            size=Size(
+                width=window.logical_width,
+                height=window.logical_height + window.logical_height // 3
+            ),
+            texture_path=window.config["TEXTURES"]["BACKGROUND"],
+            window=window
+        )
+        self.score_display = ScoreDisplay(state, state.player_id)
+
+        # Sprites are pooled and repositioned each frame instead of recreated.
+        self.batch = pyglet.graphics.Batch()
+        self.snake_image = pyglet.image.load(window.config["TEXTURES"]["SNAKE"])
+        self.food_image = pyglet.image.load(window.config["TEXTURES"]["FOOD"])
+        self.snake_sprites: List[Sprite] = []
+        self.food_sprites: List[Sprite] = []
+
+        self.setup_input_handlers()
+
+    def _cell_position(self, cell: MapPosition) -> Position:
+        """Convert a map cell to its screen position."""
+        return self.dungeon.positions[cell.row][cell.column]
+
+    def _sync_sprites(self, pool: List[Sprite], image, cells: List[MapPosition]) -> None:
+        """Position one pooled sprite per cell, hiding the rest of the pool."""
+        square_size = window.cell_size
+        while len(pool) < len(cells):
+            sprite = Sprite(image, batch=self.batch)
+            sprite.scale_x = square_size / image.width
+            sprite.scale_y = square_size / image.height
+            pool.append(sprite)
+        for sprite, cell in zip(pool, cells):
+            sprite.position = (*self._cell_position(cell), 0)
+            sprite.visible = True
+        for sprite in pool[len(cells):]:
+            sprite.visible = False
+
+    def setup_input_handlers(self) -> None:
+        """Set up drawing and keyboard input handlers."""
+        @window.event
+        def on_draw() -> None:
+            with self.client.lock:
+                state = self.client.state
+                snake_cells = [cell for body in state.snakes.values() for cell in body]
+                food_cells = list(state.food)
+            self._sync_sprites(self.snake_sprites, self.snake_image, snake_cells)
+            self._sync_sprites(self.food_sprites, self.food_image, food_cells)
+
+            with window.frame():
+                window.clear()
+                self.background.draw()
+                self.dungeon.draw()
+                self.batch.draw()
+                self.score_display.draw()
+            self.score_display.update()
+
+        @window.event
+        def on_key_press(symbol: int, modifiers: int) -> None:
+            if symbol in KEY_DIRECTIONS:
+                self.client.send_direction(KEY_DIRECTIONS[symbol])
+            elif symbol == key.ESCAPE:
+                window.close()
+
+    def run(self) -> None:
+        """Start the render loop until the window closes."""
+        try:
+            pyglet.app.run()
+        finally:
+            self.client.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """Main entry point for the game."""
+    parser = argparse.ArgumentParser(description="Super PySnake")
+    parser.add_argument(
+        "--connect",
+        metavar="HOST:PORT",
+        help="Join a game server instead of playing locally",
+    )
+    parser.add_argument(
+        "--generate",
+        choices=MAP_STYLES,
+        help="Play on a procedurally generated map of this style",
+    )
+    parser.add_argument("--map-seed", type=int, default=0)
+    parser.add_argument(
+        "--map-size",
+        type=int,
+        nargs=2,
+        metavar=("ROWS", "COLS"),
+        help="Size of the generated map; the view is scaled to fit the window",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Reload the config and map files when they change on disk",
+    )
+    parser.add_argument(
+        "--share",
+        metavar="NAME",
+        help="Publish the board in a shared memory block with this name for external bots",
+    )
+    parser.add_argument(
+        "--record-runs",
+        metavar="DIR",
+        nargs="?",
+        const=str(DEFAULT_RUNS_DIR),
+        help="Log every tick as columnar .npy chunks for offline analysis",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Play at this multiple of normal speed, e.g. 10 to fast-forward a bot demo",
+    )
+    args = parser.parse_args(argv)
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+
     try:
-        game = Game()
+        if args.connect:
+            host, _, port = args.connect.rpartition(":")
+            game = RemoteGame(host or "127.0.0.1", int(port))
+        elif args.generate:
+            square_size = window.config["SQUARE_SIZE"]
+            rows, cols = args.map_size or (
+                window.config["SCREEN_HEIGHT"] // square_size,
+                window.config["SCREEN_WIDTH"] // square_size,
+            )
+            game = Game(map_data=MapCache().get(MapParams(
+                style=args.generate,
+                rows=rows,
+                cols=cols,
+                seed=args.map_seed,
+            )))
+        else:
+            game = Game()
+        if args.watch and isinstance(game, Game):
+            game.watch_files()
+        if args.share and isinstance(game, Game):
+            game.share_state(args.share)
+        if args.record_runs and isinstance(game, Game):
+            game.record_runs(Path(args.record_runs))
+        if isinstance(game, Game):
+            game.set_speed(args.speed)
         game.run()
     except Exception as e:
-        print(f"Error starting game: {e}")
+        telemetry.error(f"Error starting game: {e}")
+        telemetry.close()
         raise
 
 
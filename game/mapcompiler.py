@@ -0,0 +1,363 @@
+"""
+Compiles raw map grids into the lookup tables the game runs on.
+
+A compiled map holds a wall bitmap, the list of free cells, validated spawn
+points, connected components and the map's content hash. It is built once
+per map and cached on disk next to the source map file, so nothing at
+runtime has to rescan the grid.
+"""
+import hashlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from game.types import FilePath, GameError, MapGrid, MapPosition, TILE_EMPTY
+from utils.serializable import MARSHAL, Serializable, SerializationError
+
+# Bump whenever the layout of compiled maps changes.
+COMPILED_MAP_VERSION = 1
+
+# Used for maps that were not loaded from a file.
+DEFAULT_CACHE_DIR = Path(".cache") / "compiled"
+
+# Most spawn points kept in addition to the primary one.
+MAX_EXTRA_SPAWN_POINTS = 16
+
+
+class MapCompileError(GameError):
+    """Raised when a map cannot be compiled into a playable map."""
+    pass
+
+
+def map_content_hash(map_data: MapGrid) -> str:
+    """Get a stable hash of a map's dimensions and tiles.
+
+    Args:
+        map_data: The map to hash
+
+    Returns:
+        Hex digest identifying the map content
+
+    Raises:
+        MapCompileError: If the map is not a rectangular grid of tile values
+    """
+    # bytes() of a bare int would silently make a row of zeros
+    if not isinstance(map_data, (list, tuple, np.ndarray)) or any(
+        isinstance(row, int) for row in map_data
+    ):
+        raise MapCompileError("Map must be a list of rows of tiles")
+    try:
+        rows = [bytes(row) for row in map_data]
+    except (TypeError, ValueError) as e:
+        raise MapCompileError(f"Map tiles must be integers from 0 to 255: {e}") from e
+    cols = len(rows[0]) if rows else 0
+    if any(len(row) != cols for row in rows):
+        raise MapCompileError("Map must be a rectangular grid")
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{len(rows)}x{cols}:".encode("ascii"))
+    for row in rows:
+        digest.update(row)
+    return digest.hexdigest()
+
+
+def spawn_cell(rows: int, cols: int) -> MapPosition:
+    """Get the preferred spawn cell of a map, matching the centre of the screen."""
+    return MapPosition(row=rows - 1 - rows // 2, column=cols // 2)
+
+
+def label_regions(free: np.ndarray) -> np.ndarray:
+    """Label the 4-connected regions of empty cells.
+
+    Horizontal runs of empty cells are numbered first, which already merges
+    every row-wise neighbour. Runs touching vertically are then joined by
+    repeatedly hooking each run's root onto the smaller neighbouring root
+    and compressing the parent pointers, all as whole-array operations.
+
+    Args:
+        free: Boolean grid, True for empty cells
+
+    Returns:
+        Region id per cell, numbered from 0; -1 for walls
+    """
+    rows, cols = free.shape
+    flat = free.ravel()
+
+    starts = free.copy()
+    starts[:, 1:] &= ~free[:, :-1]
+    run_of = np.cumsum(starts.ravel()) - 1
+    parent = np.arange(int(starts.sum()))
+
+    touching = (free[:-1] & free[1:]).ravel()
+    upper = run_of[:-cols][touching]
+    lower = run_of[cols:][touching]
+
+    while upper.size:
+        root_upper = parent[upper]
+        root_lower = parent[lower]
+        split = root_upper != root_lower
+        if not split.any():
+            break
+        upper, lower = upper[split], lower[split]
+        root_upper, root_lower = root_upper[split], root_lower[split]
+        np.minimum.at(
+            parent,
+            np.maximum(root_upper, root_lower),
+            np.minimum(root_upper, root_lower),
+        )
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    _, region_of_run = np.unique(parent, return_inverse=True)
+    labels = np.full(rows * cols, -1, dtype=np.int32)
+    labels[flat] = region_of_run.ravel()[run_of[flat]]
+    return labels.reshape(rows, cols)
+
+
+class CompiledMap:
+    """Precomputed lookup tables for one map.
+
+    Cells are stored as flat indices (``row * cols + column``) internally;
+    the public query methods take and return MapPosition values.
+
+    Attributes:
+        rows: Number of map rows
+        cols: Number of map columns
+        map_hash: Content hash of the source map
+        walls: One byte per cell, non-zero for walls
+        free_cells: Flat indices of every empty cell, in row-major order
+        components: Connected component id per cell, -1 for walls
+        component_sizes: Number of empty cells in each component
+        spawn_points: Cells a snake can safely start on; the first one is
+            the preferred spawn
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        map_hash: str,
+        walls: bytearray,
+        free_cells: "array[int]",
+        components: "array[int]",
+        component_sizes: List[int],
+        spawn_points: List[int],
+    ) -> None:
+        """Initialize a compiled map from precomputed tables."""
+        self.rows = rows
+        self.cols = cols
+        self.map_hash = map_hash
+        self.walls = walls
+        self.free_cells = free_cells
+        self.components = components
+        self.component_sizes = component_sizes
+        self.spawn_points = [self.cell(index) for index in spawn_points]
+
+    @classmethod
+    def from_map(cls, map_data: MapGrid) -> "CompiledMap":
+        """Compile a map grid.
+
+        Args:
+            map_data: 2D grid where TILE_EMPTY marks passable cells
+
+        Returns:
+            The compiled map
+
+        Raises:
+            MapCompileError: If the map is not rectangular or has no free cells
+        """
+        try:
+            grid = np.asarray(map_data)
+        except ValueError as e:
+            raise MapCompileError(f"Map must be a rectangular grid: {e}") from e
+        if grid.ndim != 2 or grid.size == 0:
+            raise MapCompileError("Map must be a non-empty rectangular grid")
+        rows, cols = grid.shape
+
+        free = grid == TILE_EMPTY
+        if not free.any():
+            raise MapCompileError("Map has no free cells")
+        labels = label_regions(free)
+        sizes = np.bincount(labels[free])
+
+        return cls(
+            rows=rows,
+            cols=cols,
+            map_hash=map_content_hash(map_data),
+            walls=bytearray((~free).astype(np.uint8).tobytes()),
+            free_cells=array("i", np.flatnonzero(free).astype(np.int32).tobytes()),
+            components=array("i", labels.astype(np.int32).tobytes()),
+            component_sizes=sizes.tolist(),
+            spawn_points=_find_spawn_points(free, labels, sizes),
+        )
+
+    def index(self, cell: MapPosition) -> int:
+        """Convert a map position to a flat cell index."""
+        return cell.row * self.cols + cell.column
+
+    def cell(self, index: int) -> MapPosition:
+        """Convert a flat cell index to a map position."""
+        return MapPosition(row=index // self.cols, column=index % self.cols)
+
+    def in_bounds(self, cell: MapPosition) -> bool:
+        """Check whether a cell lies inside the map."""
+        return 0 <= cell.row < self.rows and 0 <= cell.column < self.cols
+
+    def is_wall(self, cell: MapPosition) -> bool:
+        """Check whether a cell is a wall or outside the map."""
+        if not (0 <= cell.row < self.rows and 0 <= cell.column < self.cols):
+            return True
+        return bool(self.walls[cell.row * self.cols + cell.column])
+
+    def component_of(self, cell: MapPosition) -> int:
+        """Get the connected component of a cell, or -1 for walls."""
+        return self.components[self.index(cell)]
+
+    def free_positions(self) -> List[MapPosition]:
+        """Get every empty cell, in row-major order."""
+        cols = self.cols
+        return [MapPosition(row=index // cols, column=index % cols) for index in self.free_cells]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the compiled map into a marshal-compatible dictionary."""
+        return {
+            "version": COMPILED_MAP_VERSION,
+            "map_hash": self.map_hash,
+            "rows": self.rows,
+            "cols": self.cols,
+            "walls": bytes(self.walls),
+            "free_cells": self.free_cells.tobytes(),
+            "components": self.components.tobytes(),
+            "component_sizes": self.component_sizes,
+            "spawn_points": [self.index(cell) for cell in self.spawn_points],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompiledMap":
+        """Rebuild a compiled map from a dictionary made by to_dict.
+
+        Raises:
+            KeyError: If a required field is missing
+            ValueError: If the data was written by another version
+        """
+        if data["version"] != COMPILED_MAP_VERSION:
+            raise ValueError(f"Unsupported compiled map version: {data['version']}")
+        free_cells = array("i")
+        free_cells.frombytes(data["free_cells"])
+        components = array("i")
+        components.frombytes(data["components"])
+        if len(data["walls"]) != len(components) or len(components) != data["rows"] * data["cols"]:
+            raise ValueError("Compiled map tables do not match its size")
+        return cls(
+            rows=data["rows"],
+            cols=data["cols"],
+            map_hash=data["map_hash"],
+            walls=bytearray(data["walls"]),
+            free_cells=free_cells,
+            components=components,
+            component_sizes=data["component_sizes"],
+            spawn_points=data["spawn_points"],
+        )
+
+
+def _find_spawn_points(free: np.ndarray, labels: np.ndarray, sizes: np.ndarray) -> List[int]:
+    """Choose validated spawn cells in the largest connected component.
+
+    The primary spawn is the screen centre when it is free and connected to
+    the rest of the map, else the nearest cell that is. Extra spawns are
+    cells whose four neighbours are all free, spread evenly over the map.
+    """
+    rows, cols = free.shape
+    main = labels == int(np.argmax(sizes))
+    preferred = spawn_cell(rows, cols)
+
+    if main[preferred]:
+        primary = preferred.row * cols + preferred.column
+    else:
+        candidates = np.flatnonzero(main)
+        distance = (
+            np.abs(candidates // cols - preferred.row)
+            + np.abs(candidates % cols - preferred.column)
+        )
+        primary = int(candidates[np.argmin(distance)])
+
+    open_cells = main.copy()
+    open_cells[1:, :] &= free[:-1, :]
+    open_cells[:-1, :] &= free[1:, :]
+    open_cells[:, 1:] &= free[:, :-1]
+    open_cells[:, :-1] &= free[:, 1:]
+    open_cells[[0, -1], :] = False
+    open_cells[:, [0, -1]] = False
+    candidates = np.flatnonzero(open_cells)
+    if candidates.size > MAX_EXTRA_SPAWN_POINTS:
+        picks = np.linspace(0, candidates.size - 1, MAX_EXTRA_SPAWN_POINTS).astype(np.int64)
+        candidates = candidates[picks]
+
+    return [primary] + [int(index) for index in candidates if index != primary]
+
+
+class CompiledMapCache(Serializable):
+    """On-disk cache of compiled maps.
+
+    Maps loaded from a file are cached next to it; others are cached by
+    content hash under a shared directory. A cached entry is only used if
+    its content hash matches the map being compiled.
+    """
+
+    codec = MARSHAL
+
+    def __init__(self, cache_dir: FilePath = DEFAULT_CACHE_DIR) -> None:
+        """Initialize the cache, using the given directory for unsourced maps."""
+        super().__init__()
+        self.cache_dir = Path(cache_dir)
+
+    def path_for(self, map_hash: str, source: Optional[FilePath] = None) -> Path:
+        """Get the cache file path for a map.
+
+        Args:
+            map_hash: Content hash of the map
+            source: File the map was loaded from, if any
+        """
+        if source:
+            source = Path(source)
+            return source.with_name(f"{source.stem}.compiled.v{COMPILED_MAP_VERSION}.bin")
+        return self.cache_dir / f"{map_hash}.v{COMPILED_MAP_VERSION}.bin"
+
+    def get(self, map_data: MapGrid, source: Optional[FilePath] = None) -> CompiledMap:
+        """Load the compiled form of a map, compiling and storing it if needed.
+
+        Args:
+            map_data: The map to compile
+            source: File the map was loaded from, if any
+
+        Returns:
+            The compiled map matching the map content
+
+        Raises:
+            MapCompileError: If the map cannot be compiled
+        """
+        map_hash = map_content_hash(map_data)
+        path = self.path_for(map_hash, source)
+
+        if path.is_file():
+            try:
+                compiled = CompiledMap.from_dict(self.load(path))
+                if compiled.map_hash == map_hash:
+                    return compiled
+            except (SerializationError, KeyError, TypeError, ValueError):
+                pass
+
+        compiled = CompiledMap.from_map(map_data)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.data = compiled.to_dict()
+            self.write(path)
+        except (OSError, SerializationError):
+            # A read-only install still gets the compiled map, just not the cache.
+            pass
+        return compiled
@@ -0,0 +1,257 @@
+"""
+Seeded procedural map generation.
+
+Maps are generated as numpy wall grids, so every step (carving, braiding,
+obstacle scatter and the connectivity check) works on whole arrays instead
+of looping over cells in Python. Every generated map is validated: all
+empty tiles are reachable from the spawn point and the spawn area is clear.
+Pockets the snake could never reach are filled in rather than rejected, so
+a seed always yields a usable map.
+"""
+import hashlib
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from game.mapcompiler import label_regions, spawn_cell
+from game.types import (
+    FilePath,
+    GameError,
+    MapGrid,
+    MapParams,
+    MapPosition,
+    MAP_STYLES,
+    TILE_EMPTY,
+    TILE_WALL,
+)
+from utils.serializable import MARSHAL, GzipCodec, Serializable, SerializationError
+
+# Bump whenever generation changes, so cached maps are regenerated.
+MAPGEN_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path(".cache") / "maps"
+
+# Smallest share of the map that must stay open after pockets are filled.
+MIN_OPEN_FRACTION = 0.25
+MAX_ATTEMPTS = 16
+
+
+class MapValidationError(GameError):
+    """Raised when a map has unreachable tiles or a blocked spawn area."""
+    pass
+
+
+def validate_map(map_data: MapGrid, spawn_radius: int = 2) -> None:
+    """Check that a map is fully connected and its spawn area is clear.
+
+    Args:
+        map_data: The map to check
+        spawn_radius: Cells around the spawn point that must be empty
+
+    Raises:
+        MapValidationError: If the map fails either check
+    """
+    walls = np.asarray(map_data, dtype=np.uint8)
+    if walls.ndim != 2 or walls.size == 0:
+        raise MapValidationError("Map must be a non-empty rectangular grid")
+
+    spawn = spawn_cell(*walls.shape)
+    if walls[_spawn_area(spawn, spawn_radius)].any():
+        raise MapValidationError(f"Spawn area around {tuple(spawn)} is not clear")
+
+    labels = label_regions(walls == TILE_EMPTY)
+    if labels.max() > 0:
+        unreachable = int(np.count_nonzero(labels != labels[spawn]) - np.count_nonzero(walls))
+        raise MapValidationError(f"{unreachable} empty tiles are unreachable from the spawn")
+
+
+def generate_walls(params: MapParams) -> np.ndarray:
+    """Generate a validated wall grid.
+
+    Args:
+        params: Style, size, seed and tuning of the map
+
+    Returns:
+        Array of TILE_WALL/TILE_EMPTY values, shape (rows, cols)
+
+    Raises:
+        MapValidationError: If the parameters cannot produce a usable map
+    """
+    if params.style not in MAP_STYLES:
+        raise MapValidationError(f"Unknown map style {params.style!r}")
+    if params.rows < 2 * params.spawn_radius + 3 or params.cols < 2 * params.spawn_radius + 3:
+        raise MapValidationError(f"Map size {params.rows}x{params.cols} is too small")
+
+    rng = np.random.default_rng(params.seed)
+    spawn = spawn_cell(params.rows, params.cols)
+    for _ in range(MAX_ATTEMPTS):
+        walls = _GENERATORS[params.style](params, rng, spawn)
+        walls[_spawn_area(spawn, params.spawn_radius)] = TILE_EMPTY
+        _close_border(walls)
+
+        # Fill every pocket not connected to the spawn point
+        labels = label_regions(walls == TILE_EMPTY)
+        walls[labels != labels[spawn]] = TILE_WALL
+        if np.count_nonzero(walls == TILE_EMPTY) >= MIN_OPEN_FRACTION * walls.size:
+            return walls
+
+    raise MapValidationError(
+        f"No usable {params.style} map for seed {params.seed} in {MAX_ATTEMPTS} attempts"
+    )
+
+
+def generate_map(params: MapParams) -> MapGrid:
+    """Generate a validated map as plain MapGrid data."""
+    return generate_walls(params).tolist()
+
+
+def _spawn_area(spawn: MapPosition, radius: int) -> Tuple[slice, slice]:
+    """Get the index of the square around the spawn cell."""
+    return (
+        slice(max(spawn.row - radius, 0), spawn.row + radius + 1),
+        slice(max(spawn.column - radius, 0), spawn.column + radius + 1),
+    )
+
+
+def _close_border(walls: np.ndarray) -> None:
+    """Wall off the outermost rows and columns."""
+    walls[[0, -1], :] = TILE_WALL
+    walls[:, [0, -1]] = TILE_WALL
+
+
+def _scatter(params: MapParams, rng: np.random.Generator, spawn: MapPosition) -> np.ndarray:
+    """Open field with randomly scattered single-tile obstacles."""
+    return (rng.random((params.rows, params.cols)) < params.density).astype(np.uint8)
+
+
+def _maze(params: MapParams, rng: np.random.Generator, spawn: MapPosition) -> np.ndarray:
+    """Binary-tree maze on odd cells, braided to remove most dead ends.
+
+    Every maze cell opens the passage either north or east of it, which
+    needs no search and yields a spanning tree. Braiding then knocks out a
+    share of the remaining walls between cells, adding loops so a growing
+    snake is not trapped in dead ends.
+    """
+    walls = np.full((params.rows, params.cols), TILE_WALL, dtype=np.uint8)
+    cell_rows = np.arange(1, params.rows - 1, 2)
+    cell_cols = np.arange(1, params.cols - 1, 2)
+    walls[np.ix_(cell_rows, cell_cols)] = TILE_EMPTY
+
+    go_north = rng.random((cell_rows.size, cell_cols.size)) < 0.5
+    go_north[0, :] = False   # Top row can only open east
+    go_north[:, -1] = True   # Right column can only open north
+    go_north[0, -1] = False  # Top-right cell is the root
+    go_east = ~go_north
+    go_east[:, -1] = False
+
+    north_rows, north_cols = np.nonzero(go_north)
+    walls[cell_rows[north_rows] - 1, cell_cols[north_cols]] = TILE_EMPTY
+    east_rows, east_cols = np.nonzero(go_east)
+    walls[cell_rows[east_rows], cell_cols[east_cols] + 1] = TILE_EMPTY
+
+    # Walls between two horizontally or vertically adjacent cells
+    between = np.zeros_like(walls, dtype=bool)
+    between[np.ix_(cell_rows, cell_cols[:-1] + 1)] = True
+    between[np.ix_(cell_rows[:-1] + 1, cell_cols)] = True
+    braid = between & (walls == TILE_WALL) & (rng.random(walls.shape) < params.braid)
+    walls[braid] = TILE_EMPTY
+    return walls
+
+
+def _rooms(params: MapParams, rng: np.random.Generator, spawn: MapPosition) -> np.ndarray:
+    """Rectangular rooms joined in a chain by L-shaped corridors.
+
+    The spawn point is the first room of the chain, so it is always
+    connected to the rest of the map. Rooms are added beyond the requested
+    count until enough of the map is open, so large maps are not left
+    mostly solid.
+    """
+    walls = np.full((params.rows, params.cols), TILE_WALL, dtype=np.uint8)
+    max_size = max(3, min(params.rows, params.cols) // 4)
+    min_open = MIN_OPEN_FRACTION * walls.size
+    centers = [spawn]
+    while len(centers) <= params.rooms or np.count_nonzero(walls == TILE_EMPTY) < min_open:
+        height, width = rng.integers(3, max_size + 1, size=2)
+        top = int(rng.integers(1, max(2, params.rows - height - 1)))
+        left = int(rng.integers(1, max(2, params.cols - width - 1)))
+        walls[top:top + height, left:left + width] = TILE_EMPTY
+        centers.append(MapPosition(row=top + int(height) // 2, column=left + int(width) // 2))
+
+    for start, end in zip(centers, centers[1:]):
+        low_row, high_row = sorted((start.row, end.row))
+        low_col, high_col = sorted((start.column, end.column))
+        if rng.random() < 0.5:
+            walls[start.row, low_col:high_col + 1] = TILE_EMPTY
+            walls[low_row:high_row + 1, end.column] = TILE_EMPTY
+        else:
+            walls[low_row:high_row + 1, start.column] = TILE_EMPTY
+            walls[end.row, low_col:high_col + 1] = TILE_EMPTY
+    return walls
+
+
+_GENERATORS = {
+    "scatter": _scatter,
+    "maze": _maze,
+    "rooms": _rooms,
+}
+
+
+def map_params_key(params: MapParams) -> str:
+    """Get a stable file-name-safe key for a set of generation parameters."""
+    digest = hashlib.blake2b(repr(tuple(params)).encode("utf-8"), digest_size=8)
+    return f"{params.style}-{params.rows}x{params.cols}-{digest.hexdigest()}"
+
+
+class MapCache(Serializable):
+    """On-disk cache of generated maps keyed by their parameters."""
+
+    codec = GzipCodec(MARSHAL, level=1)
+
+    def __init__(self, cache_dir: FilePath = DEFAULT_CACHE_DIR) -> None:
+        """Initialize the cache rooted at the given directory."""
+        super().__init__()
+        self.cache_dir = Path(cache_dir)
+
+    def path_for(self, params: MapParams) -> Path:
+        """Get the cache file path for a set of parameters."""
+        return self.cache_dir / f"{map_params_key(params)}.v{MAPGEN_VERSION}.bin"
+
+    def get(self, params: MapParams) -> MapGrid:
+        """Load a generated map, generating and storing it if needed.
+
+        Args:
+            params: Parameters of the map to get
+
+        Returns:
+            The validated map
+
+        Raises:
+            MapValidationError: If the parameters cannot produce a usable map
+        """
+        path = self.path_for(params)
+        walls = self._read(path, params) if path.is_file() else None
+        if walls is None:
+            walls = generate_walls(params)
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                self.data = {
+                    "params": list(params),
+                    "walls": walls.tobytes(),
+                }
+                self.write(path)
+            except (OSError, SerializationError):
+                # A read-only install still gets the map, just not the cache.
+                pass
+        return walls.tolist()
+
+    def _read(self, path: Path, params: MapParams) -> Optional[np.ndarray]:
+        """Read a cached wall grid, or None if the entry is stale or corrupt."""
+        try:
+            data = self.load(path)
+            if tuple(data["params"]) != tuple(params):
+                return None
+            walls = np.frombuffer(data["walls"], dtype=np.uint8)
+            return walls.reshape(params.rows, params.cols).copy()
+        except (SerializationError, KeyError, TypeError, ValueError):
+            return None
@@ -0,0 +1,383 @@
+"""
+Precomputed navigation data for game maps.
+
+Everything here works on the static layout of a map only, so it can be
+derived once per map, stored on disk and shared by bots, hint systems and
+food-placement checks without searching the grid on every tick.
+"""
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from game.mapcompiler import label_regions, map_content_hash
+from game.types import FilePath, MapGrid, MapPosition, TILE_EMPTY
+from utils.serializable import MARSHAL, Serializable, SerializationError
+
+# Bump whenever the layout of the cached data changes.
+NAVIGATION_CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path(".cache") / "navigation"
+DEFAULT_LANDMARK_COUNT = 8
+
+# Marker used in region and distance tables for wall or unreachable cells.
+UNREACHABLE = -1
+
+
+class NavigationData:
+    """Static navigation tables derived from a map.
+
+    Cells are stored as flat indices (``row * cols + column``) internally;
+    the public query methods take and return MapPosition values.
+
+    Attributes:
+        rows: Number of map rows
+        cols: Number of map columns
+        map_hash: Content hash of the source map
+        regions: Region id per cell, UNREACHABLE for walls
+        region_sizes: Number of free cells in each region
+        landmarks: Cells used as landmarks for distance estimates
+        landmark_distances: BFS distances from each landmark to every cell
+        hamiltonian_cycle: Cells of a Hamiltonian cycle, or None if none is known
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        map_hash: str,
+        passable: List[bool],
+        regions: List[int],
+        region_sizes: List[int],
+        landmarks: List[int],
+        landmark_distances: List[List[int]],
+        hamiltonian_cycle: Optional[List[int]],
+    ) -> None:
+        """Initialize navigation data from precomputed tables."""
+        self.rows = rows
+        self.cols = cols
+        self.map_hash = map_hash
+        self.passable = passable
+        self.regions = regions
+        self.region_sizes = region_sizes
+        self.landmarks = landmarks
+        self.landmark_distances = landmark_distances
+        self.hamiltonian_cycle = hamiltonian_cycle
+
+        self._cycle_order: Optional[List[int]] = None
+        if hamiltonian_cycle is not None:
+            self._cycle_order = [UNREACHABLE] * (rows * cols)
+            for order, cell in enumerate(hamiltonian_cycle):
+                self._cycle_order[cell] = order
+
+        # Exact distance fields, built on first query for a target cell.
+        self._distance_fields: Dict[int, List[int]] = {}
+
+    @classmethod
+    def from_map(
+        cls,
+        map_data: MapGrid,
+        *,
+        landmark_count: int = DEFAULT_LANDMARK_COUNT,
+    ) -> "NavigationData":
+        """Derive navigation data from a map grid.
+
+        Args:
+            map_data: 2D grid where TILE_EMPTY marks passable cells
+            landmark_count: Maximum number of landmarks to place
+
+        Returns:
+            The computed navigation data
+        """
+        rows = len(map_data)
+        cols = len(map_data[0]) if map_data else 0
+        passable = [tile == TILE_EMPTY for row in map_data for tile in row]
+
+        labels = label_regions(np.array(passable, dtype=bool).reshape(rows, cols))
+        regions = labels.ravel().tolist()
+        region_sizes = np.bincount(labels[labels >= 0]).tolist()
+        landmarks, landmark_distances = _place_landmarks(
+            passable, rows, cols, landmark_count
+        )
+
+        return cls(
+            rows=rows,
+            cols=cols,
+            map_hash=map_content_hash(map_data),
+            passable=passable,
+            regions=regions,
+            region_sizes=region_sizes,
+            landmarks=landmarks,
+            landmark_distances=landmark_distances,
+            hamiltonian_cycle=_find_hamiltonian_cycle(passable, rows, cols),
+        )
+
+    def _index(self, position: MapPosition) -> int:
+        """Convert a map position to a flat cell index."""
+        return position.row * self.cols + position.column
+
+    def _position(self, index: int) -> MapPosition:
+        """Convert a flat cell index to a map position."""
+        return MapPosition(row=index // self.cols, column=index % self.cols)
+
+    def region_of(self, position: MapPosition) -> int:
+        """Get the connected region a cell belongs to.
+
+        Returns:
+            The region id, or UNREACHABLE for walls
+        """
+        return self.regions[self._index(position)]
+
+    def is_reachable(self, start: MapPosition, goal: MapPosition) -> bool:
+        """Check whether two cells are connected by free cells."""
+        region = self.region_of(start)
+        return region != UNREACHABLE and region == self.region_of(goal)
+
+    def distance(self, start: MapPosition, goal: MapPosition) -> int:
+        """Get the exact shortest-path length between two cells.
+
+        The first query for a goal builds its distance field; every later
+        query for the same goal is a table lookup.
+
+        Returns:
+            Number of steps, or UNREACHABLE if there is no path
+        """
+        if not self.is_reachable(start, goal):
+            return UNREACHABLE
+        target = self._index(goal)
+        field = self._distance_fields.get(target)
+        if field is None:
+            field = _bfs(self.passable, self.rows, self.cols, [target])
+            self._distance_fields[target] = field
+        return field[self._index(start)]
+
+    def distance_lower_bound(self, start: MapPosition, goal: MapPosition) -> int:
+        """Get a landmark-based lower bound on the distance between two cells.
+
+        Suitable as an admissible A* heuristic; never builds new tables.
+
+        Returns:
+            A lower bound on the path length, or UNREACHABLE if there is no path
+        """
+        if not self.is_reachable(start, goal):
+            return UNREACHABLE
+        a = self._index(start)
+        b = self._index(goal)
+        bound = 0
+        for distances in self.landmark_distances:
+            if distances[a] != UNREACHABLE and distances[b] != UNREACHABLE:
+                bound = max(bound, abs(distances[a] - distances[b]))
+        return bound
+
+    def next_on_cycle(self, position: MapPosition) -> Optional[MapPosition]:
+        """Get the cell following a position on the Hamiltonian cycle.
+
+        Returns:
+            The next cell, or None if there is no cycle or the cell is not on it
+        """
+        if self.hamiltonian_cycle is None or self._cycle_order is None:
+            return None
+        order = self._cycle_order[self._index(position)]
+        if order == UNREACHABLE:
+            return None
+        cycle = self.hamiltonian_cycle
+        return self._position(cycle[(order + 1) % len(cycle)])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the navigation data into a JSON-compatible dictionary."""
+        return {
+            "version": NAVIGATION_CACHE_VERSION,
+            "map_hash": self.map_hash,
+            "rows": self.rows,
+            "cols": self.cols,
+            "passable": [int(cell) for cell in self.passable],
+            "regions": self.regions,
+            "region_sizes": self.region_sizes,
+            "landmarks": self.landmarks,
+            "landmark_distances": self.landmark_distances,
+            "hamiltonian_cycle": self.hamiltonian_cycle,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NavigationData":
+        """Rebuild navigation data from a dictionary made by to_dict.
+
+        Raises:
+            KeyError: If a required field is missing
+            ValueError: If the data was written by another cache version
+        """
+        if data["version"] != NAVIGATION_CACHE_VERSION:
+            raise ValueError(f"Unsupported navigation cache version: {data['version']}")
+        return cls(
+            rows=data["rows"],
+            cols=data["cols"],
+            map_hash=data["map_hash"],
+            passable=[bool(cell) for cell in data["passable"]],
+            regions=data["regions"],
+            region_sizes=data["region_sizes"],
+            landmarks=data["landmarks"],
+            landmark_distances=data["landmark_distances"],
+            hamiltonian_cycle=data["hamiltonian_cycle"],
+        )
+
+
+class NavigationCache(Serializable):
+    """On-disk cache of navigation data keyed by map content hash."""
+
+    codec = MARSHAL
+
+    def __init__(self, cache_dir: FilePath = DEFAULT_CACHE_DIR) -> None:
+        """Initialize the cache rooted at the given directory."""
+        super().__init__()
+        self.cache_dir = Path(cache_dir)
+
+    def path_for(self, map_hash: str) -> Path:
+        """Get the cache file path for a map hash."""
+        return self.cache_dir / f"{map_hash}.v{NAVIGATION_CACHE_VERSION}.bin"
+
+    def get(self, map_data: MapGrid) -> NavigationData:
+        """Load navigation data for a map, computing and storing it if needed.
+
+        Args:
+            map_data: The map to get navigation data for
+
+        Returns:
+            Navigation data matching the map content
+        """
+        map_hash = map_content_hash(map_data)
+        path = self.path_for(map_hash)
+
+        if path.is_file():
+            try:
+                navigation = NavigationData.from_dict(self.load(path))
+                if navigation.map_hash == map_hash:
+                    return navigation
+            except (SerializationError, KeyError, TypeError, ValueError):
+                pass
+
+        navigation = NavigationData.from_map(map_data)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.data = navigation.to_dict()
+            self.write(path)
+        except (OSError, SerializationError):
+            # A read-only install still gets the data, just not the cache.
+            pass
+        return navigation
+
+
+def _neighbors(index: int, rows: int, cols: int) -> List[int]:
+    """Get the flat indices of the orthogonal neighbours of a cell."""
+    row, col = divmod(index, cols)
+    result = []
+    if row > 0:
+        result.append(index - cols)
+    if row < rows - 1:
+        result.append(index + cols)
+    if col > 0:
+        result.append(index - 1)
+    if col < cols - 1:
+        result.append(index + 1)
+    return result
+
+
+def _bfs(passable: List[bool], rows: int, cols: int, sources: List[int]) -> List[int]:
+    """Compute BFS distances from a set of source cells to every cell."""
+    distances = [UNREACHABLE] * (rows * cols)
+    queue = deque()
+    for source in sources:
+        distances[source] = 0
+        queue.append(source)
+
+    while queue:
+        current = queue.popleft()
+        next_distance = distances[current] + 1
+        for neighbor in _neighbors(current, rows, cols):
+            if passable[neighbor] and distances[neighbor] == UNREACHABLE:
+                distances[neighbor] = next_distance
+                queue.append(neighbor)
+    return distances
+
+
+def _place_landmarks(
+    passable: List[bool], rows: int, cols: int, count: int
+) -> Tuple[List[int], List[List[int]]]:
+    """Choose landmarks by farthest-point sampling and compute their tables.
+
+    Cells not reached by any landmark yet are picked first, so every region
+    gets a landmark before the largest one gets several.
+    """
+    landmarks: List[int] = []
+    tables: List[List[int]] = []
+    nearest = [UNREACHABLE] * (rows * cols)
+
+    for _ in range(count):
+        best, best_score = UNREACHABLE, UNREACHABLE
+        for cell, is_free in enumerate(passable):
+            if not is_free:
+                continue
+            score = rows * cols if nearest[cell] == UNREACHABLE else nearest[cell]
+            if score > best_score:
+                best, best_score = cell, score
+        if best == UNREACHABLE or best_score == 0:
+            break
+
+        table = _bfs(passable, rows, cols, [best])
+        landmarks.append(best)
+        tables.append(table)
+        for cell, distance in enumerate(table):
+            if distance != UNREACHABLE and (
+                nearest[cell] == UNREACHABLE or distance < nearest[cell]
+            ):
+                nearest[cell] = distance
+    return landmarks, tables
+
+
+def _find_hamiltonian_cycle(
+    passable: List[bool], rows: int, cols: int
+) -> Optional[List[int]]:
+    """Build a Hamiltonian cycle through every free cell, when one is known.
+
+    Finding one on an arbitrary grid is NP-hard, so only the common layout is
+    handled: the free cells form one solid rectangle (a bordered arena) with
+    at least one even side.
+
+    Returns:
+        The cycle as flat cell indices, or None
+    """
+    free = [cell for cell, is_free in enumerate(passable) if is_free]
+    if len(free) < 4:
+        return None
+
+    top, left = divmod(free[0], cols)
+    bottom, right = divmod(free[-1], cols)
+    height = bottom - top + 1
+    width = right - left + 1
+    if height * width != len(free) or height < 2 or width < 2:
+        return None
+    for r in range(top, bottom + 1):
+        if not all(passable[r * cols + left:r * cols + right + 1]):
+            return None
+
+    if height % 2 == 0:
+        local = _rectangle_cycle(height, width)
+        return [(top + r) * cols + (left + c) for r, c in local]
+    if width % 2 == 0:
+        local = _rectangle_cycle(width, height)
+        return [(top + c) * cols + (left + r) for r, c in local]
+    return None
+
+
+def _rectangle_cycle(height: int, width: int) -> List[Tuple[int, int]]:
+    """Build a Hamiltonian cycle on a rectangle with an even height.
+
+    Runs along the first row, sweeps the remaining rows back and forth
+    leaving column 0 free, then returns up column 0.
+    """
+    path = [(0, c) for c in range(width)]
+    for r in range(1, height):
+        columns = range(width - 1, 0, -1) if r % 2 == 1 else range(1, width)
+        path.extend((r, c) for c in columns)
+    path.extend((r, 0) for r in range(height - 1, 0, -1))
+    return path
@@ -0,0 +1,198 @@
+"""
+Multi-channel observation tensor for agents, kept up to date incrementally.
+
+The tensor is updated from snake, food and dungeon events as they happen:
+a step touches the new head, the vacated tail and possibly the food, so
+keeping it current costs O(1) per step however large the map is. The board
+is stored with a wall-filled border, so an egocentric crop of the area
+around the head is a plain slice of it and needs no copying either.
+"""
+from collections import deque
+from typing import Deque, List, Optional
+
+import numpy as np
+
+from game.dungeon import Dungeon, DungeonListener
+from game.food import Food
+from game.snake import Snake, SnakeListener
+from game.types import Direction, MapPosition, Position, TILE_WALL
+
+# Channels of the observation tensor
+WALL_CHANNEL = 0
+# Tick a body cell was entered, plus one so free cells stay zero
+BODY_CHANNEL = 1
+HEAD_CHANNEL = 2
+FOOD_CHANNEL = 3
+CHANNELS = 4
+
+# Quarter turns that rotate each heading to face up (row 0)
+_HEADING_TURNS = {
+    Direction.NORTH: 0,
+    Direction.EAST: 1,
+    Direction.SOUTH: 2,
+    Direction.WEST: 3,
+}
+
+
+class ObservationTensor(SnakeListener, DungeonListener):
+    """Board observation of one snake, maintained from game events.
+
+    Attributes:
+        rows: Number of map rows
+        cols: Number of map columns
+        radius: Largest egocentric crop radius supported
+        pool: Cell block size of the pooled view, or 0 without one
+        pooled: Per channel, the number of set cells in each pool x pool
+            block; updated with the tensor. None without a pooled view
+    """
+
+    def __init__(
+        self,
+        dungeon: Dungeon,
+        snake: Snake,
+        food: Food,
+        radius: int = 5,
+        pool: int = 0,
+    ) -> None:
+        """Build the tensor once and subscribe to the events that change it.
+
+        Args:
+            dungeon: Dungeon supplying the walls
+            snake: Snake to observe
+            food: Food to observe
+            radius: Largest egocentric crop radius that will be requested
+            pool: Block size of the pooled view; 0 disables it
+        """
+        self.dungeon = dungeon
+        self.snake = snake
+        self.rows = dungeon.rows
+        self.cols = dungeon.cols
+        self.radius = radius
+        self.pool = pool
+
+        padded = np.zeros((CHANNELS, self.rows + 2 * radius, self.cols + 2 * radius), dtype=np.float32)
+        padded[WALL_CHANNEL] = 1.0
+        self._padded = padded
+        self._board = padded[:, radius:radius + self.rows, radius:radius + self.cols]
+        tiles = np.frombuffer(dungeon.tiles, dtype=np.uint8).reshape(self.rows, self.cols)
+        self._board[WALL_CHANNEL] = tiles == TILE_WALL
+
+        self.pooled: Optional[np.ndarray] = None
+        if pool:
+            pooled_rows = -(-self.rows // pool)
+            pooled_cols = -(-self.cols // pool)
+            self.pooled = np.zeros((CHANNELS, pooled_rows, pooled_cols), dtype=np.int32)
+            walls = np.zeros((pooled_rows * pool, pooled_cols * pool), dtype=np.int32)
+            walls[:self.rows, :self.cols] = self._board[WALL_CHANNEL] != 0
+            self.pooled[WALL_CHANNEL] = walls.reshape(pooled_rows, pool, pooled_cols, pool).sum(axis=(1, 3))
+
+        self._body: Deque[MapPosition] = deque()
+        self._head: Optional[MapPosition] = None
+        self._food: Optional[MapPosition] = None
+        self.on_reset(snake)
+        self._move_food(food.position)
+
+        snake.listeners.append(self)
+        food.observers.append(self._move_food)
+        dungeon.listeners.append(self)
+
+    @property
+    def board(self) -> np.ndarray:
+        """The full observation, shape (CHANNELS, rows, cols).
+
+        A live view: it changes as the game does, so copy it to keep it.
+        """
+        return self._board
+
+    def _set(self, channel: int, cell: MapPosition, value: float) -> None:
+        """Set one cell of one channel, keeping the pooled view in step."""
+        board = self._board[channel]
+        if self.pooled is not None:
+            change = int(value != 0) - int(board[cell.row, cell.column] != 0)
+            if change:
+                self.pooled[channel, cell.row // self.pool, cell.column // self.pool] += change
+        board[cell.row, cell.column] = value
+
+    def _set_head(self, cell: Optional[MapPosition]) -> None:
+        """Move the head marker."""
+        if self._head is not None:
+            self._set(HEAD_CHANNEL, self._head, 0.0)
+        if cell is not None:
+            self._set(HEAD_CHANNEL, cell, 1.0)
+        self._head = cell
+
+    def _move_food(self, position: Position) -> None:
+        """Move the food marker to a new screen position."""
+        if self._food is not None:
+            self._set(FOOD_CHANNEL, self._food, 0.0)
+        self._food = self.dungeon.cell_at(position)
+        self._set(FOOD_CHANNEL, self._food, 1.0)
+
+    def on_head(self, snake: Snake, position: Position) -> None:
+        """Mark the new head cell."""
+        cell = self.dungeon.cell_at(position)
+        self._body.appendleft(cell)
+        self._set(BODY_CHANNEL, cell, snake.tick_count + 1.0)
+        self._set_head(cell)
+
+    def on_tail(self, snake: Snake, position: Position) -> None:
+        """Clear the cell the tail left."""
+        self._set(BODY_CHANNEL, self._body.pop(), 0.0)
+
+    def on_reset(self, snake: Snake) -> None:
+        """Replace the whole body after a respawn or restore; O(body length)."""
+        while self._body:
+            self._set(BODY_CHANNEL, self._body.pop(), 0.0)
+        # Segments further back entered their cells on earlier ticks
+        stamp = snake.tick_count + 1.0
+        for offset, segment in enumerate(snake.body):
+            cell = self.dungeon.cell_at(segment.position)
+            self._body.append(cell)
+            self._set(BODY_CHANNEL, cell, max(stamp - offset, 1.0))
+        self._set_head(self._body[0] if self._body else None)
+
+    def on_walls_changed(
+        self,
+        dungeon: Dungeon,
+        walled: List[MapPosition],
+        unwalled: List[MapPosition],
+    ) -> None:
+        """Update the wall channel for cells that changed."""
+        for cell in walled:
+            self._set(WALL_CHANNEL, cell, 1.0)
+        for cell in unwalled:
+            self._set(WALL_CHANNEL, cell, 0.0)
+
+    def body_age(self, stamps: np.ndarray) -> np.ndarray:
+        """Convert body channel values into ages in ticks, -1 for free cells.
+
+        Works on the full board or any crop of it.
+        """
+        return np.where(stamps > 0, self.snake.tick_count + 1.0 - stamps, -1.0)
+
+    def egocentric(self, radius: Optional[int] = None, rotate: bool = False) -> np.ndarray:
+        """Get the square around the head, shape (CHANNELS, 2r+1, 2r+1).
+
+        Cells beyond the map edge read as walls. The crop is a view of the
+        tensor, so this is O(1); copy it to keep it.
+
+        Args:
+            radius: Cells on each side of the head; at most self.radius
+            rotate: Turn the crop so the snake's heading points up (row 0)
+
+        Raises:
+            ValueError: If radius is larger than the tensor was built for
+        """
+        radius = self.radius if radius is None else radius
+        if radius > self.radius:
+            raise ValueError(f"Crop radius {radius} exceeds the supported {self.radius}")
+        head = self._head
+        if head is None:
+            raise ValueError("The snake has no head to centre the crop on")
+        # Padded coordinates of the head are offset by self.radius
+        top = head.row + self.radius - radius
+        left = head.column + self.radius - radius
+        crop = self._padded[:, top:top + 2 * radius + 1, left:left + 2 * radius + 1]
+        if rotate:
+            crop = np.rot90(crop, k=_HEADING_TURNS[self.snake.direction], axes=(1, 2))
+        return crop
@@ -0,0 +1,214 @@
+"""
+Persistent store for play sessions, final scores and leaderboards.
+"""
+import json
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from game.telemetry import telemetry
+from game.types import FilePath
+
+DEFAULT_DB_PATH = Path(".data") / "scores.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    map_id TEXT NOT NULL,
+    player_id TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    ended_at REAL,
+    metadata TEXT
+);
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    map_id TEXT NOT NULL,
+    player_id TEXT NOT NULL,
+    score REAL NOT NULL,
+    length INTEGER NOT NULL,
+    ticks INTEGER NOT NULL,
+    ended_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_map_score ON games (map_id, score DESC);
+CREATE INDEX IF NOT EXISTS games_by_session ON games (session_id);
+"""
+
+_INSERT_SESSION = (
+    "INSERT INTO sessions (id, map_id, player_id, started_at, metadata) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+_END_SESSION = "UPDATE sessions SET ended_at = ? WHERE id = ?"
+_INSERT_GAME = (
+    "INSERT INTO games (session_id, map_id, player_id, score, length, ticks, ended_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Sentinel telling the writer thread to stop.
+_STOP = ("", ())
+
+
+class HighScore(NamedTuple):
+    """One leaderboard entry."""
+    player_id: str
+    score: float
+    length: int
+    ended_at: float
+
+
+class ScoreStore:
+    """SQLite-backed record of sessions and finished games.
+
+    Writes are queued and applied by a background thread in batched
+    transactions, so recording a game never blocks the game loop on disk.
+    Reads use their own connection; WAL mode lets them run alongside the
+    writer, and the (map_id, score) index keeps top-N queries fast no
+    matter how many games are stored.
+
+    Attributes:
+        dropped_rows: Queued writes lost because their batch failed to commit
+    """
+
+    def __init__(
+        self,
+        path: FilePath = DEFAULT_DB_PATH,
+        *,
+        batch_size: int = 512,
+        flush_interval: float = 1.0,
+    ) -> None:
+        """Open (or create) the store and start the writer thread.
+
+        Args:
+            path: Database file location
+            batch_size: Most statements committed in one transaction
+            flush_interval: Longest time a queued write waits before commit
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped_rows = 0
+
+        connection = self._connect()
+        connection.executescript(_SCHEMA)
+        connection.close()
+
+        self._queue: "queue.Queue[Tuple[str, Tuple[Any, ...]]]" = queue.Queue()
+        self._local = threading.local()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def start_session(
+        self,
+        map_id: str,
+        player_id: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Record the start of a play session.
+
+        Returns:
+            The new session id
+        """
+        session_id = uuid.uuid4().hex
+        self._queue.put((
+            _INSERT_SESSION,
+            (session_id, map_id, player_id, time.time(), json.dumps(metadata or {})),
+        ))
+        return session_id
+
+    def end_session(self, session_id: str) -> None:
+        """Record the end of a play session."""
+        self._queue.put((_END_SESSION, (time.time(), session_id)))
+
+    def record_game(
+        self,
+        session_id: str,
+        map_id: str,
+        player_id: str,
+        score: float,
+        length: int,
+        ticks: int,
+    ) -> None:
+        """Queue a finished game for storage."""
+        self._queue.put((
+            _INSERT_GAME,
+            (session_id, map_id, player_id, score, length, ticks, time.time()),
+        ))
+
+    def top_scores(self, map_id: str, limit: int = 10) -> List[HighScore]:
+        """Get the best games recorded on a map, highest score first."""
+        rows = self._reader().execute(
+            "SELECT player_id, score, length, ended_at FROM games "
+            "WHERE map_id = ? ORDER BY score DESC LIMIT ?",
+            (map_id, limit),
+        ).fetchall()
+        return [HighScore(*row) for row in rows]
+
+    def flush(self) -> None:
+        """Block until every queued write has been committed."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Commit pending writes and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        reader = getattr(self._local, "connection", None)
+        if reader is not None:
+            reader.close()
+            self._local.connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection tuned for a single writer with concurrent readers."""
+        connection = sqlite3.connect(str(self.path))
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        """Get the calling thread's read connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+        return connection
+
+    def _write_loop(self) -> None:
+        """Commit queued statements in batches until told to stop."""
+        connection = self._connect()
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+
+            if batch[-1] is _STOP:
+                running = False
+
+            grouped: Dict[str, List[Tuple[Any, ...]]] = {}
+            for sql, params in batch:
+                if sql:
+                    grouped.setdefault(sql, []).append(params)
+            try:
+                with connection:
+                    # Sessions first so games and session ends always find them.
+                    for sql in sorted(grouped, key=lambda s: s != _INSERT_SESSION):
+                        connection.executemany(sql, grouped[sql])
+            except sqlite3.Error as e:
+                # Losing a batch of records must never take the game down,
+                # but it must not go unnoticed either.
+                rows = sum(len(params) for params in grouped.values())
+                self.dropped_rows += rows
+                telemetry.thread_error(f"Score store dropped a batch of {rows} writes: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        connection.close()
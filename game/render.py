@@ -0,0 +1,67 @@
+"""
+Render-on-change frame scheduling.
+
+Instead of redrawing the window at a fixed rate, anything that changes
+what is on screen marks the frame dirty. A redraw is then scheduled for
+the earliest moment the frame-rate cap allows; further changes before it
+runs are folded into the same frame. With nothing changing (a paused or
+idle board) no frames are drawn and no callbacks are scheduled at all.
+"""
+from typing import Any, Optional
+
+import pyglet
+
+
+class FrameScheduler:
+    """Draws a window only when its contents changed, at a capped rate.
+
+    Use with ``pyglet.app.run(interval=None)`` so pyglet does not schedule
+    redraws of its own.
+
+    Attributes:
+        frames_drawn: Frames actually rendered
+        frames_requested: Calls to invalidate, including coalesced ones
+    """
+
+    def __init__(self, window: Any, max_fps: float = 60.0, clock: Optional[Any] = None) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            window: Window to draw; must provide draw(dt)
+            max_fps: Highest frame rate; 0 or less disables the cap
+            clock: Clock to schedule on; defaults to pyglet's default clock
+        """
+        self.window = window
+        self.min_frame_time = 1.0 / max_fps if max_fps > 0 else 0.0
+        self._clock = clock
+        self._pending = False
+        self._last_frame: Optional[float] = None
+        self.frames_drawn = 0
+        self.frames_requested = 0
+
+    @property
+    def clock(self) -> Any:
+        """The clock frames are scheduled on."""
+        return self._clock or pyglet.clock.get_default()
+
+    def invalidate(self, *args: Any) -> None:
+        """Mark the window dirty so it is redrawn on the next allowed frame.
+
+        Accepts and ignores any arguments, so it can be used directly as an
+        event handler or clock callback.
+        """
+        self.frames_requested += 1
+        if self._pending:
+            return
+        self._pending = True
+        delay = 0.0
+        if self._last_frame is not None:
+            delay = max(0.0, self._last_frame + self.min_frame_time - self.clock.time())
+        self.clock.schedule_once(self._draw_frame, delay)
+
+    def _draw_frame(self, dt: float) -> None:
+        """Render one frame."""
+        self._pending = False
+        self._last_frame = self.clock.time()
+        self.frames_drawn += 1
+        self.window.draw(dt)
@@ -0,0 +1,364 @@
+"""
+Offscreen render checks: golden-image diffs and render throughput.
+
+Builds fixed scenes with the full Game render path (background, dungeon
+walls, snake, food and the score HUD), draws each through the game's
+offscreen framebuffer and reads the frame back, so it runs on a headless
+box: with pyglet's headless (EGL) backend by default, or under Xvfb with a
+software GL when ``SUPER_PYSNAKE_HEADLESS=0``.
+
+Each scene is fully determined by its definition: maps are seeded, the
+random state is seeded, and the clock runs on simulated time until every
+HUD animation has finished before the frame is taken.
+
+    python -m game.rendercheck --update          # record golden images
+    python -m game.rendercheck                   # compare against them
+    python -m game.rendercheck --bench 200       # time frames per scene
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from game import configure_headless
+from game.types import DEFAULT_CONFIG, DIRECTION_DELTAS, TILE_EMPTY, Direction, FilePath, GameError, MapPosition
+
+DEFAULT_GOLDEN_DIR = Path(".data") / "golden"
+# Largest per-channel difference a pixel may show and still match
+DEFAULT_TOLERANCE = 8
+# Largest fraction of pixels that may differ beyond the tolerance
+DEFAULT_MAX_MISMATCH = 0.001
+# Simulated seconds to run before a capture; longer than any HUD animation
+SETTLE_TIME = 5.0
+FRAME_RATE = 60.0
+
+
+class RenderCheckError(GameError):
+    """Raised when a scene cannot be built or an image cannot be read."""
+    pass
+
+
+class Scene(NamedTuple):
+    """A reproducible board to render.
+
+    Maps are the configured default map when style is None, or generated
+    from style, rows, cols and seed otherwise.
+    """
+    name: str
+    style: Optional[str]
+    rows: int
+    cols: int
+    seed: int
+    length: int
+    score: float
+
+
+SCENES: Sequence[Scene] = (
+    Scene("default", None, 24, 32, 1, 12, 120),
+    Scene("rooms-48x64", "rooms", 48, 64, 2, 60, 590),
+    Scene("maze-72x96", "maze", 72, 96, 3, 200, 1990),
+    # More cells than the screen has pixels: drawn at one pixel per cell
+    Scene("rooms-600x600", "rooms", 600, 600, 4, 400, 3990),
+)
+
+
+class FrameDiff(NamedTuple):
+    """Result of comparing a frame with its golden image."""
+    max_error: int
+    mismatched: float
+    size_matches: bool
+
+    def passed(self, max_mismatch: float = DEFAULT_MAX_MISMATCH) -> bool:
+        """Check whether the frame matches within the allowed mismatch."""
+        return self.size_matches and self.mismatched <= max_mismatch
+
+
+class FrameTiming(NamedTuple):
+    """Render throughput of one scene."""
+    scene: str
+    width: int
+    height: int
+    frames: int
+    mean_ms: float
+    p95_ms: float
+
+    @property
+    def fps(self) -> float:
+        """Frames per second at the mean frame time."""
+        return 1000.0 / self.mean_ms if self.mean_ms else float("inf")
+
+
+def compare_frames(frame: np.ndarray, golden: np.ndarray, tolerance: int = DEFAULT_TOLERANCE) -> FrameDiff:
+    """Compare two RGBA frames pixel by pixel."""
+    if frame.shape != golden.shape:
+        return FrameDiff(max_error=255, mismatched=1.0, size_matches=False)
+    error = np.abs(frame.astype(np.int16) - golden.astype(np.int16)).max(axis=2)
+    return FrameDiff(
+        max_error=int(error.max()),
+        mismatched=float(np.count_nonzero(error > tolerance)) / error.size,
+        size_matches=True,
+    )
+
+
+def save_image(path: FilePath, frame: np.ndarray) -> None:
+    """Write an RGBA frame (top row first) as a PNG file."""
+    import pyglet
+
+    height, width = frame.shape[:2]
+    # pyglet stores images bottom row first
+    data = np.ascontiguousarray(frame[::-1]).tobytes()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pyglet.image.ImageData(width, height, "RGBA", data, pitch=width * 4).save(str(path))
+
+
+def load_image(path: FilePath) -> np.ndarray:
+    """Read a PNG file as an RGBA frame, top row first.
+
+    Raises:
+        RenderCheckError: If the file cannot be read
+    """
+    import pyglet
+
+    try:
+        image = pyglet.image.load(str(path)).get_image_data()
+    except (OSError, pyglet.image.codecs.ImageDecodeException) as e:
+        raise RenderCheckError(f"Cannot read image {path}: {e}") from e
+    data = image.get_bytes("RGBA", image.width * 4)
+    return np.frombuffer(data, dtype=np.uint8).reshape(image.height, image.width, 4)[::-1].copy()
+
+
+class SceneRenderer:
+    """Builds scenes into a Game and renders them offscreen on simulated time."""
+
+    def __init__(self, scratch: FilePath) -> None:
+        """Take over the pyglet clock and prepare for building scenes.
+
+        Args:
+            scratch: Directory for the throwaway score databases of scenes
+        """
+        import pyglet
+
+        from game.app import window
+        from game.soak import SimulatedTime
+
+        self.pyglet = pyglet
+        self.window = window
+        self.scratch = Path(scratch)
+        self.time = SimulatedTime()
+        self.clock = pyglet.clock.get_default()
+        self.clock.time = self.time
+        self.clock.last_ts = self.time()
+        self.clock.next_ts = self.time()
+        # Dispatch window events immediately, as pyglet's own loop does
+        pyglet.window.Window._enable_event_queue = False
+        self.game: Any = None
+
+    def build(self, scene: Scene) -> Any:
+        """Set up a Game showing a scene, with every animation finished.
+
+        Raises:
+            RenderCheckError: If the scene's map cannot be made
+        """
+        from game.main import Game
+        from game.mapgen import MapCache, MapValidationError
+        from game.records import ScoreStore
+        from game.types import MapParams
+
+        self.close()
+        random.seed(scene.seed)
+        map_data = None
+        if scene.style is not None:
+            try:
+                map_data = MapCache().get(MapParams(scene.style, scene.rows, scene.cols, scene.seed))
+            except MapValidationError as e:
+                raise RenderCheckError(f"Cannot generate the map of {scene.name}: {e}") from e
+        store = ScoreStore(self.scratch / f"{scene.name}.sqlite3")
+        game = Game(score_store=store, map_data=map_data)
+        self.game = game
+
+        dungeon = game.dungeon
+        cells = _lay_body(dungeon, dungeon.cell_at(dungeon.spawn_position()), scene.length)
+        body = [dungeon.positions[cell.row][cell.column] for cell in cells]
+        game.snake.restore(body, _heading(cells), tick=scene.length)
+
+        occupied = set(cells)
+        free = [
+            dungeon.cell(index) for index, tile in enumerate(dungeon.tiles)
+            if tile == TILE_EMPTY and dungeon.cell(index) not in occupied
+        ]
+        food = random.choice(free)
+        game.food.move_to(dungeon.positions[food.row][food.column])
+
+        game.scores.setup_player(player_id=game.snake.player_id, initial_score=scene.score)
+        game.scores.flush()
+        self.settle()
+        return game
+
+    def settle(self, seconds: float = SETTLE_TIME) -> None:
+        """Run the clock on simulated time until HUD animations are over."""
+        step = 1.0 / FRAME_RATE
+        for _ in range(int(seconds * FRAME_RATE)):
+            self.time.now += step
+            self.clock.tick()
+
+    def render(self) -> np.ndarray:
+        """Draw the current scene and read back the frame."""
+        self.window.draw(0.0)
+        return self.window.viewport.capture()
+
+    def time_frames(self, scene: Scene, frames: int) -> FrameTiming:
+        """Time drawing a built scene, waiting for the GL to finish each frame."""
+        gl = self.pyglet.gl
+        durations = []
+        for _ in range(frames):
+            started = time.perf_counter()
+            self.window.draw(0.0)
+            gl.glFinish()
+            durations.append(time.perf_counter() - started)
+        width, height = self.window.viewport.framebuffer_size
+        milliseconds = np.array(durations) * 1000.0
+        return FrameTiming(
+            scene=scene.name,
+            width=width,
+            height=height,
+            frames=frames,
+            mean_ms=float(milliseconds.mean()),
+            p95_ms=float(np.percentile(milliseconds, 95)),
+        )
+
+    def close(self) -> None:
+        """Release the score database of the current scene."""
+        if self.game is not None:
+            self.game.score_store.close()
+            self.game = None
+
+
+def _lay_body(dungeon: Any, tail: MapPosition, length: int) -> List[MapPosition]:
+    """Walk a self-avoiding path of empty cells from the tail.
+
+    Each step goes to the free neighbour with the fewest free neighbours
+    of its own (Warnsdorff's rule), which keeps long bodies from walling
+    themselves into a pocket. The walk is deterministic, so a scene always
+    gets the same body; it stops early if it runs out of room.
+
+    Returns:
+        Cells of the body, head first
+    """
+    cells = [tail]
+    visited = {tail}
+
+    def free_neighbours(cell: MapPosition) -> List[MapPosition]:
+        neighbours = (MapPosition(cell.row + d.row, cell.column + d.column) for d in DIRECTION_DELTAS.values())
+        return [n for n in neighbours if n not in visited and dungeon.tile(n) == TILE_EMPTY]
+
+    while len(cells) < length:
+        options = free_neighbours(cells[-1])
+        if not options:
+            break
+        following = min(options, key=lambda cell: len(free_neighbours(cell)))
+        cells.append(following)
+        visited.add(following)
+    cells.reverse()
+    return cells
+
+
+def _heading(cells: List[MapPosition]) -> Direction:
+    """Get the direction from the second cell of a body to its head."""
+    if len(cells) < 2:
+        return Direction.NORTH
+    head, neck = cells[0], cells[1]
+    if head.row < neck.row:
+        return Direction.NORTH
+    if head.row > neck.row:
+        return Direction.SOUTH
+    return Direction.EAST if head.column > neck.column else Direction.WEST
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Check or record golden images, or time rendering, from the command line."""
+    parser = argparse.ArgumentParser(description="Super PySnake offscreen render checks")
+    parser.add_argument("--scenes", nargs="+", choices=[scene.name for scene in SCENES])
+    parser.add_argument("--golden-dir", default=str(DEFAULT_GOLDEN_DIR))
+    parser.add_argument("--update", action="store_true", help="Record the golden images")
+    parser.add_argument("--tolerance", type=int, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--max-mismatch", type=float, default=DEFAULT_MAX_MISMATCH)
+    parser.add_argument("--bench", type=int, metavar="FRAMES", help="Time this many frames per scene")
+    parser.add_argument(
+        "--render-scale", type=float, nargs="+", default=[DEFAULT_CONFIG["RENDER_SCALE"]],
+        help="Internal resolution scales to benchmark",
+    )
+    args = parser.parse_args(argv)
+
+    # The game creates its window on import, so headless mode must be
+    # selected before anything from game.app (or pyglet.window) is loaded.
+    os.environ.setdefault("SUPER_PYSNAKE_HEADLESS", "1")
+    configure_headless()
+    scenes = [scene for scene in SCENES if not args.scenes or scene.name in args.scenes]
+    golden_dir = Path(args.golden_dir)
+    failures: List[str] = []
+
+    with tempfile.TemporaryDirectory() as scratch:
+        renderer = SceneRenderer(scratch)
+        viewport = renderer.window.viewport
+        try:
+            for scene in scenes:
+                renderer.build(scene)
+                if args.bench:
+                    for scale in args.render_scale:
+                        viewport.set_scale(scale)
+                        timing = renderer.time_frames(scene, args.bench)
+                        print(
+                            f"{timing.scene:<14} {timing.width}x{timing.height} "
+                            f"scale {scale:g}: {timing.mean_ms:.2f} ms/frame "
+                            f"(p95 {timing.p95_ms:.2f} ms, {timing.fps:.0f} fps)"
+                        )
+                    viewport.set_scale(DEFAULT_CONFIG["RENDER_SCALE"])
+                    continue
+
+                frame = renderer.render()
+                golden_path = golden_dir / f"{scene.name}.png"
+                if args.update:
+                    save_image(golden_path, frame)
+                    print(f"{scene.name}: recorded {golden_path}")
+                    continue
+                if not golden_path.is_file():
+                    failures.append(f"{scene.name}: no golden image at {golden_path}; run with --update")
+                    continue
+                golden = load_image(golden_path)
+                diff = compare_frames(frame, golden, args.tolerance)
+                if diff.passed(args.max_mismatch):
+                    print(f"{scene.name}: ok (max error {diff.max_error}, {diff.mismatched:.4%} differ)")
+                    continue
+                save_image(golden_dir / f"{scene.name}.actual.png", frame)
+                if diff.size_matches:
+                    error = np.abs(frame.astype(np.int16) - golden.astype(np.int16)).max(axis=2)
+                    heat = np.zeros_like(frame)
+                    heat[..., 0] = np.minimum(error * 4, 255)
+                    heat[..., 3] = 255
+                    save_image(golden_dir / f"{scene.name}.diff.png", heat)
+                    failures.append(
+                        f"{scene.name}: {diff.mismatched:.4%} of pixels differ "
+                        f"(max error {diff.max_error})"
+                    )
+                else:
+                    failures.append(f"{scene.name}: frame is {frame.shape[1]}x{frame.shape[0]}, "
+                                    f"golden is {golden.shape[1]}x{golden.shape[0]}")
+        except RenderCheckError as e:
+            failures.append(str(e))
+        finally:
+            renderer.close()
+
+    if failures:
+        print("\n".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+Columnar per-tick recording of game runs for offline analysis.
+
+Every tick of a run adds one row to preallocated NumPy column buffers.
+Full buffers are handed to a background thread, which writes each column
+as its own ``.npy`` file and updates the run's small JSON index. Nothing is
+parsed on the way back: ``read_run`` memory-maps the column files, so
+notebooks can scan months of play by touching only the columns they use.
+RunRecorder feeds a running game's moves into a RunWriter.
+
+Layout of a run directory::
+
+    <root>/<run id>/index.json
+    <root>/<run id>/chunk-000000.tick.npy
+    <root>/<run id>/chunk-000000.head_row.npy
+    ...
+"""
+import argparse
+import os
+import queue
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from game.listeners import SnakeListener
+from game.telemetry import telemetry
+from game.types import FilePath, Position
+from utils.serializable import COMPACT_JSON, Serializable, SerializationError
+
+RUN_LOG_VERSION = 1
+DEFAULT_RUNS_DIR = Path(".data") / "runs"
+DEFAULT_CHUNK_ROWS = 65536
+
+# Name and dtype of every recorded column, in row order
+COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("tick", "<i8"),
+    ("head_row", "<i2"),
+    ("head_col", "<i2"),
+    ("length", "<i4"),
+    ("direction", "<i1"),
+    ("food_row", "<i2"),
+    ("food_col", "<i2"),
+    ("score", "<f8"),
+    # Seconds spent drawing the last frame before the tick; NaN if none
+    ("frame_time", "<f4"),
+)
+
+
+class RunIndex(Serializable):
+    """The index.json of one run: its metadata and the chunks written so far."""
+
+    codec = COMPACT_JSON
+
+
+class RunWriter:
+    """Buffers per-tick rows of one run and writes them as columnar chunks.
+
+    Attributes:
+        directory: Directory of this run
+        rows: Rows appended so far, including buffered ones
+        dropped_rows: Rows lost because their chunk could not be written
+    """
+
+    def __init__(
+        self,
+        map_hash: str,
+        root: FilePath = DEFAULT_RUNS_DIR,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ) -> None:
+        """Start a new run.
+
+        Args:
+            map_hash: Content hash of the map being played
+            root: Directory holding all runs
+            chunk_rows: Rows per chunk file
+
+        Raises:
+            OSError: If the run directory cannot be created
+            SerializationError: If the index cannot be written
+        """
+        self.chunk_rows = chunk_rows
+        # Timestamped so runs sort by start time; the random suffix keeps
+        # runs started in the same second apart
+        run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.directory = Path(root) / run_id
+        self.directory.mkdir(parents=True, exist_ok=False)
+
+        self.index = RunIndex()
+        self.index.data = {
+            "version": RUN_LOG_VERSION,
+            "run_id": run_id,
+            "map_hash": map_hash,
+            "started": time.time(),
+            "columns": dict(COLUMNS),
+            "chunks": [],
+        }
+        self.index.write(self.directory / "index.json")
+        self.rows = 0
+        self.dropped_rows = 0
+        self._buffers = self._allocate()
+        self._used = 0
+        self._chunk_number = 0
+
+        # Full chunks are written by a background thread, so the game loop
+        # never waits on the disk
+        self._pending: "queue.Queue[Optional[Tuple[int, Dict[str, np.ndarray], int]]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def _allocate(self) -> Dict[str, np.ndarray]:
+        """Create an empty set of column buffers."""
+        return {name: np.empty(self.chunk_rows, dtype=dtype) for name, dtype in COLUMNS}
+
+    def append(
+        self,
+        tick: int,
+        head_row: int,
+        head_col: int,
+        length: int,
+        direction: int,
+        food_row: int,
+        food_col: int,
+        score: float,
+        frame_time: float,
+    ) -> None:
+        """Add one row, starting a new chunk when the buffers are full."""
+        row = self._used
+        buffers = self._buffers
+        buffers["tick"][row] = tick
+        buffers["head_row"][row] = head_row
+        buffers["head_col"][row] = head_col
+        buffers["length"][row] = length
+        buffers["direction"][row] = direction
+        buffers["food_row"][row] = food_row
+        buffers["food_col"][row] = food_col
+        buffers["score"][row] = score
+        buffers["frame_time"][row] = frame_time
+        self._used += 1
+        self.rows += 1
+        if self._used == self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hand the buffered rows to the writer and start a new chunk."""
+        if not self._used:
+            return
+        self._pending.put((self._chunk_number, self._buffers, self._used))
+        self._chunk_number += 1
+        self._buffers = self._allocate()
+        self._used = 0
+
+    def close(self) -> None:
+        """Write every buffered row and stop the writer."""
+        self.flush()
+        self._pending.put(None)
+        self._writer.join()
+
+    def _write_loop(self) -> None:
+        """Write chunks as they arrive until close() is called."""
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            number, buffers, used = item
+            name = f"chunk-{number:06d}"
+            try:
+                for column, values in buffers.items():
+                    _save_array(self.directory / f"{name}.{column}.npy", values[:used])
+                self.index.data["chunks"].append({
+                    "name": name,
+                    "rows": used,
+                    "first_tick": int(buffers["tick"][0]),
+                    "last_tick": int(buffers["tick"][used - 1]),
+                })
+                self.index.write(self.directory / "index.json")
+            except (OSError, SerializationError) as e:
+                # Losing a chunk must not take the game down with it, but it
+                # must not go unnoticed either
+                self.dropped_rows += used
+                telemetry.thread_error(f"Run log {self.directory.name} dropped {name} ({used} rows): {e}")
+
+
+class RunRecorder(SnakeListener):
+    """Feeds every move of a snake into a columnar run log."""
+
+    def __init__(self, writer: RunWriter, snake: "Snake", food: "Food") -> None:
+        """Record a snake's moves, tracking the food through its observers."""
+        self.writer = writer
+        self.dungeon = snake.dungeon
+        self._food = self.dungeon.cell_at(food.position)
+        # Set by the renderer; reported once, with the next move
+        self.frame_time = float("nan")
+        snake.listeners.append(self)
+        food.observers.append(self._move_food)
+
+    def _move_food(self, position: Position) -> None:
+        """Track the food cell."""
+        self._food = self.dungeon.cell_at(position)
+
+    def on_tick(self, snake: "Snake") -> None:
+        """Record the state after the move."""
+        head = self.dungeon.cell_at(snake.body[0].position)
+        self.writer.append(
+            tick=snake.tick_count,
+            head_row=head.row,
+            head_col=head.column,
+            length=len(snake.body),
+            direction=int(snake.direction),
+            food_row=self._food.row,
+            food_col=self._food.column,
+            score=snake.current_score,
+            frame_time=self.frame_time,
+        )
+        self.frame_time = float("nan")
+
+
+def _save_array(path: Path, values: np.ndarray) -> None:
+    """Write an array to a .npy file, replacing it only once complete."""
+    handle, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as stream:
+            np.save(stream, values)
+        os.replace(temp_name, path)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
+
+
+def read_index(run_dir: FilePath) -> Dict[str, Any]:
+    """Load the index of a run.
+
+    Raises:
+        SerializationError: If the index is missing or unreadable
+    """
+    return RunIndex().load(Path(run_dir) / "index.json")
+
+
+def iter_chunks(run_dir: FilePath, columns: Optional[List[str]] = None) -> Iterator[Dict[str, np.ndarray]]:
+    """Yield the chunks of a run as read-only memory-mapped columns.
+
+    Args:
+        run_dir: Directory of the run
+        columns: Columns to map; all of them if omitted
+    """
+    run_dir = Path(run_dir)
+    index = read_index(run_dir)
+    names = columns or list(index["columns"])
+    for chunk in index["chunks"]:
+        yield {
+            column: np.load(run_dir / f"{chunk['name']}.{column}.npy", mmap_mode="r")
+            for column in names
+        }
+
+
+def read_run(run_dir: FilePath, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """Get whole columns of a run.
+
+    Single-chunk runs are returned as memory maps; longer runs are
+    concatenated, which reads the requested columns into memory.
+    """
+    chunks = list(iter_chunks(run_dir, columns))
+    if not chunks:
+        index = read_index(run_dir)
+        return {
+            column: np.empty(0, dtype=index["columns"][column])
+            for column in (columns or index["columns"])
+        }
+    if len(chunks) == 1:
+        return chunks[0]
+    return {column: np.concatenate([chunk[column] for chunk in chunks]) for column in chunks[0]}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Summarize the recorded runs in a directory."""
+    parser = argparse.ArgumentParser(description="Summarize recorded game runs")
+    parser.add_argument("root", nargs="?", default=str(DEFAULT_RUNS_DIR))
+    args = parser.parse_args(argv)
+
+    for index_path in sorted(Path(args.root).glob("*/index.json")):
+        run = read_run(index_path.parent, ["length", "score", "frame_time"])
+        if not len(run["length"]):
+            print(f"{index_path.parent.name}: no rows")
+            continue
+        frame_times = run["frame_time"][~np.isnan(run["frame_time"])]
+        frame = f"{frame_times.mean() * 1000:.2f} ms" if frame_times.size else "n/a"
+        print(
+            f"{index_path.parent.name}: {len(run['length'])} ticks, "
+            f"max length {int(run['length'].max())}, "
+            f"best score {run['score'].max():g}, mean frame {frame}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,21 @@ import math
 import random
 
 import pyglet
-from pyglet import clock, image, gl
-from pyglet.graphics import Batch
+from pyglet import image, gl
+from pyglet.graphics import Batch, Group
 from pyglet.shapes import BorderedRectangle, Circle
 from pyglet.text import Label
 
+from game.animation import Driver, Tween, hud_animator
 from game.app import window
+from game.glyphs import GlyphCache, GlyphText
 from pyscored.adapters.game_frameworks import GameFrameworkAdapter
 
+# Seconds the main label pulses after a score change
+PULSE_DURATION = 3.0
+# Seconds the "+XX" label takes to fade out
+FADE_DURATION = 0.85
+
 
 class ScoreDisplay:
     """
@@ -30,20 +37,18 @@ class ScoreDisplay:
 
         # Keep track of old score to detect changes
         self.last_score = 0
-        self.score_changed = False
-
-        # For timing/animations
-        self.time = 0
 
-        # We'll store particles as data only, and dynamically create Circle shapes in _draw_particles().
+        # Each particle owns a Circle in its own batch, created once and
+        # deleted when the particle dies, so drawing never allocates shapes.
         self.particles = []
+        self.particle_batch = Batch()
 
         # Create a Pyglet batch so multiple labels are drawn in one pass.
         self.batch = Batch()
 
         # Panel dimensions + position
-        screen_width = window.config["SCREEN_WIDTH"]
-        screen_height = window.config["SCREEN_HEIGHT"]
+        screen_width = window.logical_width
+        screen_height = window.logical_height
         self.panel_width = 300
         self.panel_height = 50
         self.panel_x = (screen_width - self.panel_width) // 2
@@ -55,30 +60,45 @@ class ScoreDisplay:
         except (FileNotFoundError, pyglet.resource.ResourceNotFoundException):
             self.bg_image = None
 
+        # Shape-based panel, used when there's no background image
+        self.panel = BorderedRectangle(
+            x=self.panel_x,
+            y=self.panel_y,
+            width=self.panel_width,
+            height=self.panel_height,
+            border=2,
+            color=(38, 38, 46),       # Darkish gray
+            border_color=(100, 100, 110)
+        )
+        self.panel.opacity = 200
+
+        # The score text is drawn from cached glyph sprites, so a counting
+        # score only re-textures the digits that changed instead of laying
+        # out a Label again. The shadow uses the same glyphs, one group back.
+        self.glyphs = GlyphCache("Arial Bold", 20)
+
         # Main label shadow
-        self.shadow_label = Label(
+        self.shadow_label = GlyphText(
+            self.glyphs,
             text="Score: 0",
-            font_name="Arial Bold",
-            font_size=20,
             x=self.panel_x + self.panel_width // 2 + 2,  # +2 offset for a "shadow"
             y=self.panel_y + self.panel_height // 2 - 2,
             anchor_x="center",
-            anchor_y="center",
             color=(0, 0, 0, 100),  # Semi-transparent black
-            batch=self.batch
+            batch=self.batch,
+            group=Group(order=0)
         )
 
         # Main label (white, on top)
-        self.label = Label(
+        self.label = GlyphText(
+            self.glyphs,
             text="Score: 0",
-            font_name="Arial Bold",
-            font_size=20,
             x=self.panel_x + self.panel_width // 2,
             y=self.panel_y + self.panel_height // 2,
             anchor_x="center",
-            anchor_y="center",
             color=(255, 255, 255, 255),
-            batch=self.batch
+            batch=self.batch,
+            group=Group(order=1)
         )
 
         # Score-increase indicator (default invisible)
@@ -91,65 +111,87 @@ class ScoreDisplay:
             anchor_x="left",   # We'll position it to the right of the main label
             anchor_y="center",
             color=(255, 220, 0, 0),
-            batch=self.batch
+            batch=self.batch,
+            group=Group(order=1)
         )
 
-        # Schedule our _animate function at ~60fps
-        clock.schedule_interval(self._animate, 1 / 60.0)
+        self.label.color = self._pulse_color(0.0)
+        self._position_increase_label()
 
-    def _animate(self, dt: float) -> None:
+    def _on_score_change(self, increase: float) -> None:
         """
-        Main animation loop for:
-          - Smoothly interpolating score changes
+        Start the animations for a score change:
+          - Smoothly interpolating the shown score
           - Pulsing the main label color
-          - Handling the "increase" label and sparkles
+          - Showing the "increase" label, fading it out, and sparkles
+        All of them run on the shared HUD animator, which goes idle again
+        once they are finished.
         """
-        self.time += dt
+        hud_animator.add(Driver(self._approach_score), key=(self, "score"))
+        hud_animator.add(
+            Tween(PULSE_DURATION, self._pulse, on_complete=self._end_pulse),
+            key=(self, "pulse")
+        )
 
-        # Smoothly move current_visual_score toward target_score
-        if self.current_visual_score != self.target_score:
-            diff = (self.target_score - self.current_visual_score)
-            self.current_visual_score += diff * min(dt * 5, 1)
-            if abs(self.current_visual_score - self.target_score) < 0.5:
-                self.current_visual_score = self.target_score
+        if increase > 0:
+            self.increase_label.text = f"+{int(increase)}"
+            self.increase_label.color = (255, 220, 0, 255)
+            self._position_increase_label()
+
+            # Generate up to 10 sparkles
+            for _ in range(min(int(increase), 10)):
+                self._add_particle()
+            hud_animator.add(Driver(self._update_particles), key=(self, "particles"))
+
+            # Fade out after 1 second, replacing any fade still pending
+            # from an earlier increase
+            hud_animator.add(
+                Tween(FADE_DURATION, self._fade_increase_label, delay=1.0),
+                key=(self, "fade")
+            )
 
-            # Update main labels
-            score_text = f"Score: {int(self.current_visual_score)}"
+    def _approach_score(self, dt: float) -> bool:
+        """Move the shown score toward the target; False once it arrives."""
+        diff = (self.target_score - self.current_visual_score)
+        self.current_visual_score += diff * min(dt * 5, 1)
+        if abs(self.current_visual_score - self.target_score) < 0.5:
+            self.current_visual_score = self.target_score
+
+        # Update main labels; only changed digits are touched
+        score_text = f"Score: {int(self.current_visual_score)}"
+        if self.label.text != score_text:
+            width = self.label.content_width
             self.label.text = score_text
             self.shadow_label.text = score_text
-
-        # If the score just changed, show the increase label and create particles
-        if self.score_changed:
-            increase = self.target_score - self.last_score
-            if increase > 0:
-                self.increase_label.text = f"+{int(increase)}"
-                self.increase_label.color = (255, 220, 0, 255)
-
-                # Generate up to 10 sparkles
-                for _ in range(min(int(increase), 10)):
-                    self._add_particle()
-
-                # Schedule fade-out after 1 second
-                clock.schedule_once(self._fade_increase_label, 1.0)
-
-            self.score_changed = False
-
-        # Subtle pulsing color effect on the main label
-        pulse = 0.8 + 0.2 * math.sin(self.time * 2)
-        self.label.color = (
+            if self.label.content_width != width:
+                self._position_increase_label()
+        return self.current_visual_score != self.target_score
+
+    @staticmethod
+    def _pulse_color(phase: float) -> tuple:
+        """Main label color at a point of the pulse cycle (in seconds)."""
+        pulse = 0.8 + 0.2 * math.sin(phase * 2)
+        return (
             int(255 - 40 * pulse),
             int(255 - 20 * pulse),
             255,
             255
         )
 
-        # Reposition the increase label so it sits just to the right of the main label
-        self._position_increase_label()
+    def _pulse(self, progress: float) -> None:
+        """Subtle pulsing color effect on the main label."""
+        self.label.color = self._pulse_color(progress * PULSE_DURATION)
+
+    def _end_pulse(self) -> None:
+        """Settle the main label on its resting color."""
+        self.label.color = self._pulse_color(0.0)
 
-        # Update all particles
+    def _update_particles(self, dt: float) -> bool:
+        """Move and fade all particles; False once none are left."""
         for particle in list(self.particles):
             particle["life"] -= dt
             if particle["life"] <= 0:
+                particle["shape"].delete()
                 self.particles.remove(particle)
                 continue
 
@@ -160,6 +202,11 @@ class ScoreDisplay:
             # Alpha fades over time
             particle["alpha"] = 255 * (particle["life"] / particle["max_life"])
 
+            shape = particle["shape"]
+            shape.position = (particle["x"], particle["y"])
+            shape.opacity = int(particle["alpha"])
+        return bool(self.particles)
+
     def _position_increase_label(self) -> None:
         """
         Place the increase_label just to the right of the main label's text,
@@ -167,28 +214,18 @@ class ScoreDisplay:
         """
         # Center x of main label plus half the text width, plus a small gap
         gap = 14
-        label_right = self.label.x + (self.label.content_width / 2)
+        label_x, label_y = self.label.position
+        label_right = label_x + (self.label.content_width / 2)
         self.increase_label.x = label_right + gap
-        self.increase_label.y = self.label.y
+        self.increase_label.y = label_y
 
-    def _fade_increase_label(self, dt: float) -> None:
-        """
-        Called ~1s after a score increment to schedule a gradual fade out
-        for the "increase_label."
-        """
-        def _fade_step(_):
-            alpha = self.increase_label.color[3] - 10
-            if alpha <= 0:
-                self.increase_label.color = (255, 220, 0, 0)
-                clock.unschedule(_fade_step)
-                return
-            self.increase_label.color = (255, 220, 0, alpha)
-
-        clock.schedule_interval(_fade_step, 1 / 30.0)
+    def _fade_increase_label(self, progress: float) -> None:
+        """Fade out the "increase_label" as the fade tween progresses."""
+        self.increase_label.color = (255, 220, 0, int(255 * (1 - progress)))
 
     def _add_particle(self) -> None:
         """Generate a sparkle particle near the 'increase_label' area."""
-        self.particles.append({
+        particle = {
             "x": self.increase_label.x + random.randint(-5, 15),
             "y": self.increase_label.y + random.randint(-5, 5),
             "vx": random.uniform(-20, 20),
@@ -198,33 +235,33 @@ class ScoreDisplay:
             "life": random.uniform(0.5, 1.5),
             "max_life": 1.5,
             "alpha": 255
-        })
+        }
+        particle["shape"] = Circle(
+            x=particle["x"],
+            y=particle["y"],
+            radius=particle["size"],
+            color=particle["color"],
+            batch=self.particle_batch
+        )
+        self.particles.append(particle)
 
     def update(self) -> None:
         """
         Check the latest score from the game adapter. If there's a change,
-        mark it so we can animate in _animate().
+        start the animations for it.
         """
         new_score = self.adapter.get_player_score(self.player_id)
         if new_score != self.target_score:
             self.last_score = self.target_score
             self.target_score = new_score
-            self.score_changed = True
+            self._on_score_change(self.target_score - self.last_score)
 
     def _draw_particles(self) -> None:
         """
-        Draw each particle as a small pyglet.shapes.Circle.
+        Draw every particle's pyglet.shapes.Circle in a single batch pass.
         This avoids immediate-mode calls and is fully compatible with pyglet 2.0.
         """
-        for p in self.particles:
-            circle = Circle(
-                x=p["x"],
-                y=p["y"],
-                radius=p["size"],
-                color=(p["color"][0], p["color"][1], p["color"][2]),
-            )
-            circle.opacity = int(p["alpha"])
-            circle.draw()
+        self.particle_batch.draw()
 
     def draw(self) -> None:
         """
@@ -239,20 +276,73 @@ class ScoreDisplay:
             self.bg_image.blit(self.panel_x, self.panel_y)
         else:
             # Otherwise, draw a simple, partially transparent rectangle
-            panel = BorderedRectangle(
-                x=self.panel_x,
-                y=self.panel_y,
-                width=self.panel_width,
-                height=self.panel_height,
-                border=2,
-                color=(38, 38, 46),       # Darkish gray
-                border_color=(100, 100, 110)
-            )
-            panel.opacity = 200
-            panel.draw()
+            self.panel.draw()
 
         # Draw sparkle particles behind the label text
         self._draw_particles()
 
         # Finally, draw all text labels
         self.batch.draw()
+
+
+class LeaderboardDisplay:
+    """
+    A toggleable overlay listing the best recorded games on the current map.
+    Entries are passed in by the caller, so drawing never touches the database.
+    """
+
+    def __init__(self):
+        self.visible = False
+        self.batch = Batch()
+
+        screen_width = window.logical_width
+        screen_height = window.logical_height
+        self.panel_width = 360
+        self.panel_height = 320
+        self.panel_x = (screen_width - self.panel_width) // 2
+        self.panel_y = (screen_height - self.panel_height) // 2
+
+        self.panel = BorderedRectangle(
+            x=self.panel_x,
+            y=self.panel_y,
+            width=self.panel_width,
+            height=self.panel_height,
+            border=2,
+            color=(38, 38, 46),
+            border_color=(100, 100, 110),
+            batch=self.batch
+        )
+        self.panel.opacity = 220
+
+        self.label = Label(
+            text="",
+            font_name="Arial Bold",
+            font_size=14,
+            x=self.panel_x + 20,
+            y=self.panel_y + self.panel_height - 20,
+            width=self.panel_width - 40,
+            anchor_x="left",
+            anchor_y="top",
+            multiline=True,
+            color=(255, 255, 255, 255),
+            batch=self.batch
+        )
+
+    def show(self, entries) -> None:
+        """Show the overlay with the given HighScore entries."""
+        lines = ["High Scores", ""]
+        if not entries:
+            lines.append("No games recorded yet")
+        for rank, entry in enumerate(entries, start=1):
+            lines.append(f"{rank:>2}. {entry.player_id:<12} {int(entry.score):>6}")
+        self.label.text = "\n".join(lines)
+        self.visible = True
+
+    def hide(self) -> None:
+        """Hide the overlay."""
+        self.visible = False
+
+    def draw(self) -> None:
+        """Draw the overlay if it is visible."""
+        if self.visible:
+            self.batch.draw()
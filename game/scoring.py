@@ -0,0 +1,189 @@
+"""
+Batched scoring in front of the pyscored engine.
+
+Game code scores through the GameFrameworkAdapter interface: an update per
+food eaten or death, usually followed by reading the score back. Called
+directly, each of those runs the engine inline in the tick. ScorePipeline
+offers the same methods, but an update only appends a tick-stamped event to
+a queue and adjusts a running total that answers reads, so ticks never call
+into the engine.
+
+Queued events are applied in batches, between ticks on the clock or
+whenever flush() is called. A batch makes at most one engine call per
+player, however many events it holds, so arenas and servers with many
+snakes stay cheap. After each batch the applied scores are published as an
+immutable ScoreSnapshot: a consistent view of every player as of one tick,
+for the HUD and anything else that only needs to display scores.
+"""
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import pyglet
+
+from pyscored.adapters.game_frameworks import GameFrameworkAdapter
+
+DEFAULT_FLUSH_INTERVAL = 0.1
+
+# Kinds of queued score events
+SCORE_ADD = 0
+SCORE_SET = 1
+
+
+class ScoreEvent(NamedTuple):
+    """One queued change to a player's score."""
+    tick: int
+    player_id: str
+    kind: int
+    points: float
+
+
+class ScoreSnapshot(NamedTuple):
+    """Scores applied to the engine, as of one tick."""
+    tick: int
+    scores: Mapping[str, float]
+
+    def get_player_score(self, player_id: str) -> float:
+        """Get a player's score, matching the GameFrameworkAdapter interface."""
+        return self.scores.get(player_id, 0.0)
+
+
+class SnapshotReader:
+    """Read side of a pipeline, answering only from its latest snapshot.
+
+    Pass it wherever an adapter is only read from, such as the HUD, so the
+    reader never sees a batch half applied.
+    """
+
+    def __init__(self, pipeline: "ScorePipeline") -> None:
+        """Read from a pipeline."""
+        self.pipeline = pipeline
+
+    def get_player_score(self, player_id: str) -> float:
+        """Get a player's applied score, matching the GameFrameworkAdapter interface."""
+        return self.pipeline.snapshot.get_player_score(player_id)
+
+
+class ScorePipeline:
+    """Queues score events and applies them to an adapter in batches.
+
+    Attributes:
+        adapter: Adapter of the engine the events are applied to
+        tick: Tick stamped on new events; advanced by the game loop
+        snapshot: Scores as of the last applied batch
+        reader: Read-only view of the latest snapshot
+        observers: Called with each new snapshot that changed a score
+        events_applied: Events applied so far
+        engine_calls: Calls made into the adapter so far
+    """
+
+    def __init__(
+        self,
+        adapter: GameFrameworkAdapter,
+        interval: float = DEFAULT_FLUSH_INTERVAL,
+        clock: Optional[Any] = None,
+    ) -> None:
+        """Initialize an empty pipeline.
+
+        Args:
+            adapter: Adapter of the engine to apply events to
+            interval: Seconds between batches once started
+            clock: Clock to flush on; defaults to pyglet's default clock
+        """
+        self.adapter = adapter
+        self.interval = interval
+        self._clock = clock
+        self.tick = 0
+        self._pending: List[ScoreEvent] = []
+        # Score of every player with all queued events applied
+        self._totals: Dict[str, float] = {}
+        self.snapshot = ScoreSnapshot(0, MappingProxyType({}))
+        self.reader = SnapshotReader(self)
+        self.observers: List[Callable[[ScoreSnapshot], None]] = []
+        self.events_applied = 0
+        self.engine_calls = 0
+        self.running = False
+
+    @property
+    def clock(self) -> Any:
+        """The clock batches are scheduled on."""
+        return self._clock or pyglet.clock.get_default()
+
+    @property
+    def pending(self) -> int:
+        """Number of events waiting to be applied."""
+        return len(self._pending)
+
+    def setup_player(self, player_id: str, initial_score: float = 0.0) -> None:
+        """Queue setting a player's score, adding the player if new."""
+        self._pending.append(ScoreEvent(self.tick, player_id, SCORE_SET, initial_score))
+        self._totals[player_id] = initial_score
+
+    def update_player_score(self, player_id: str, points: float) -> None:
+        """Queue adding points to a player's score.
+
+        Raises:
+            ValueError: If the player was never set up, as the engine would
+        """
+        if player_id not in self._totals:
+            raise ValueError(f"Player ID '{player_id}' has not been initialized.")
+        self._pending.append(ScoreEvent(self.tick, player_id, SCORE_ADD, points))
+        self._totals[player_id] += points
+
+    def get_player_score(self, player_id: str) -> float:
+        """Get a player's score including events not applied yet."""
+        return self._totals.get(player_id, 0.0)
+
+    def flush(self, dt: float = 0.0) -> ScoreSnapshot:
+        """Apply every queued event to the engine and publish a snapshot.
+
+        Events are folded per player first: a set followed by additions
+        becomes one set, and additions alone become one update.
+
+        Returns:
+            The snapshot after the batch
+        """
+        if not self._pending:
+            return self.snapshot
+        events, self._pending = self._pending, []
+
+        # Per player: score to set (None to keep) and points to add after it
+        folded: Dict[str, Tuple[Optional[float], float]] = {}
+        for event in events:
+            initial, points = folded.get(event.player_id, (None, 0.0))
+            if event.kind == SCORE_SET:
+                folded[event.player_id] = (event.points, 0.0)
+            else:
+                folded[event.player_id] = (initial, points + event.points)
+
+        adapter = self.adapter
+        scores = dict(self.snapshot.scores)
+        for player_id, (initial, points) in folded.items():
+            if initial is not None:
+                adapter.setup_player(player_id=player_id, initial_score=initial + points)
+            elif points:
+                adapter.update_player_score(player_id, points=points)
+            else:
+                continue
+            self.engine_calls += 1
+            scores[player_id] = adapter.get_player_score(player_id)
+
+        self.events_applied += len(events)
+        changed = scores != self.snapshot.scores
+        self.snapshot = ScoreSnapshot(self.tick, MappingProxyType(scores))
+        if changed:
+            for observer in self.observers:
+                observer(self.snapshot)
+        return self.snapshot
+
+    def start(self) -> None:
+        """Apply batches on the clock every interval."""
+        if not self.running:
+            self.running = True
+            self.clock.schedule_interval(self.flush, self.interval)
+
+    def stop(self) -> None:
+        """Stop the scheduled batches and apply what is still queued."""
+        if self.running:
+            self.running = False
+            self.clock.unschedule(self.flush)
+        self.flush()
@@ -0,0 +1,319 @@
+"""
+Headless authoritative game server.
+
+Runs the arena rules at a fixed tick rate on asyncio and talks to clients
+over TCP with newline-delimited compact JSON messages. A client receives
+the full state once when it joins and only per-tick deltas afterwards.
+
+Client messages:
+    {"type": "join", "name": "alice"}
+    {"type": "input", "direction": 0}
+
+Server messages:
+    {"type": "welcome", "player": ..., "tick": ..., "map": ..., "snakes": ...,
+     "food": ..., "scores": ...}
+    {"type": "delta", "tick": ..., "heads": ..., "tails": ..., "spawns": ...,
+     "left": ..., "food_added": ..., "food_removed": ..., "scores": ...}
+    {"type": "error", "message": ...}   (then the connection is closed)
+
+Cells are sent as [row, column] pairs; empty delta fields are omitted.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+from typing import Any, Dict, List, Optional, Set
+
+from pyscored.core.scoring_engine import ScoringEngine
+from pyscored.adapters import GameFrameworkAdapter
+
+from game.arena import Arena, ArenaError, TickDelta
+from game.mapgen import MapCache
+from game.scoring import ScorePipeline
+from game.types import DEFAULT_CONFIG, MAP_STYLES, Direction, MapGrid, MapParams
+from utils.serializable import Serializable
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+
+# Clients whose unsent output grows past this are dropped instead of
+# letting one slow connection hold memory for the whole server.
+MAX_CLIENT_BUFFER = 1 << 20
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Encode a protocol message as one compact JSON line."""
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def decode_message(line: bytes) -> Dict[str, Any]:
+    """Decode one protocol line.
+
+    Raises:
+        ValueError: If the line is not a JSON object
+    """
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("Protocol messages must be JSON objects")
+    return message
+
+
+def encode_delta(tick: int, delta: TickDelta) -> Dict[str, Any]:
+    """Build a delta message, leaving out fields with no changes."""
+    message: Dict[str, Any] = {"type": "delta", "tick": tick}
+    if delta.heads:
+        message["heads"] = {pid: list(cell) for pid, cell in delta.heads.items()}
+    if delta.tails:
+        message["tails"] = delta.tails
+    if delta.spawns:
+        message["spawns"] = {
+            pid: [list(cell) for cell in body] for pid, body in delta.spawns.items()
+        }
+    if delta.left:
+        message["left"] = delta.left
+    if delta.food_added:
+        message["food_added"] = [list(cell) for cell in delta.food_added]
+    if delta.food_removed:
+        message["food_removed"] = [list(cell) for cell in delta.food_removed]
+    if delta.scores:
+        message["scores"] = delta.scores
+    return message
+
+
+class GameServer:
+    """Authoritative server running one arena for many network clients.
+
+    Attributes:
+        arena: The simulated arena
+        tick_rate: Simulation ticks per second
+    """
+
+    def __init__(
+        self,
+        map_data: MapGrid,
+        *,
+        tick_rate: float = 1 / DEFAULT_CONFIG["GAME_SPEED"],
+        food_count: int = 1,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            map_data: Map shared by every player
+            tick_rate: Simulation ticks per second
+            food_count: Number of food items kept on the map
+            seed: Seed for spawn and food placement
+        """
+        self.map_data = map_data
+        self.tick_rate = tick_rate
+        self.scoring_engine = ScoringEngine()
+        self.game_adapter = GameFrameworkAdapter(self.scoring_engine)
+        # Scores reach the engine once per tick, after the delta is sent
+        self.scores = ScorePipeline(self.game_adapter)
+        self.arena = Arena(
+            map_data,
+            self.scores,
+            food_count=food_count,
+            seed=seed,
+            record_deltas=True,
+        )
+        self._clients: Dict[str, asyncio.StreamWriter] = {}
+        self._inputs: Dict[str, Direction] = {}
+        self._ids = itertools.count(1)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tick_task: Optional["asyncio.Task[None]"] = None
+        self._handlers: Set["asyncio.Task[Any]"] = set()
+
+        # Discard the initial food placement; welcomes carry the full state.
+        self.arena.take_delta()
+
+    @property
+    def port(self) -> int:
+        """Get the port the server is listening on."""
+        if self._server is None:
+            raise RuntimeError("Server not started")
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        """Start listening and ticking.
+
+        Pass port 0 to pick a free port, then read it from the port property.
+        """
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        self._tick_task = asyncio.ensure_future(self._tick_loop())
+
+    async def stop(self) -> None:
+        """Stop ticking, close every client and the listening socket."""
+        if self._tick_task is not None:
+            self._tick_task.cancel()
+            try:
+                await self._tick_task
+            except asyncio.CancelledError:
+                pass
+        for writer in list(self._clients.values()):
+            writer.close()
+        if self._handlers:
+            await asyncio.wait(list(self._handlers), timeout=1.0)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def serve_forever(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        """Run the server until cancelled."""
+        await self.start(host, port)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    def full_state(self, player_id: str) -> Dict[str, Any]:
+        """Build the welcome message describing the whole game state."""
+        return {
+            "type": "welcome",
+            "player": player_id,
+            "tick": self.arena.tick_count,
+            "map": self.map_data,
+            "snakes": {
+                pid: [list(cell) for cell in snake.body]
+                for pid, snake in self.arena.snakes.items()
+            },
+            "food": [list(cell) for cell in self.arena.food],
+            "scores": {
+                pid: self.scores.get_player_score(pid)
+                for pid in self.arena.snakes
+            },
+        }
+
+    def step(self) -> Dict[str, Any]:
+        """Apply pending inputs, advance the arena one tick and return the delta."""
+        for player_id, direction in self._inputs.items():
+            if player_id in self.arena.snakes:
+                self.arena.set_direction(player_id, direction)
+        self._inputs.clear()
+
+        self.scores.tick = self.arena.tick_count + 1
+        self.arena.tick()
+        return encode_delta(self.arena.tick_count, self.arena.take_delta())
+
+    async def _tick_loop(self) -> None:
+        """Tick at a fixed rate, skipping ahead rather than bursting when late."""
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.tick_rate
+        next_tick = loop.time()
+        while True:
+            self._broadcast(encode_message(self.step()))
+            self.scores.flush()
+
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    def _broadcast(self, payload: bytes) -> None:
+        """Send one encoded message to every connected client."""
+        for player_id, writer in list(self._clients.items()):
+            if writer.transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+                self._disconnect(player_id)
+                continue
+            writer.write(payload)
+
+    def _disconnect(self, player_id: str) -> None:
+        """Drop a client and remove its snake."""
+        writer = self._clients.pop(player_id, None)
+        self._inputs.pop(player_id, None)
+        if player_id in self.arena.snakes:
+            self.arena.remove_snake(player_id)
+        if writer is not None:
+            writer.close()
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one connection: join, then relay inputs until it closes."""
+        task = asyncio.current_task()
+        if task is not None:
+            self._handlers.add(task)
+            task.add_done_callback(self._handlers.discard)
+
+        player_id: Optional[str] = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = decode_message(line)
+                except ValueError:
+                    continue
+
+                if message.get("type") == "join" and player_id is None:
+                    joining = f"{message.get('name', 'player')}-{next(self._ids)}"
+                    try:
+                        self.arena.add_snake(joining)
+                    except ArenaError as e:
+                        # Full or blocked arena: turn the client away
+                        writer.write(encode_message({"type": "error", "message": str(e)}))
+                        await writer.drain()
+                        break
+                    player_id = joining
+                    writer.write(encode_message(self.full_state(player_id)))
+                    self._clients[player_id] = writer
+                elif message.get("type") == "input" and player_id is not None:
+                    try:
+                        self._inputs[player_id] = Direction(message["direction"])
+                    except (KeyError, ValueError):
+                        continue
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if player_id is not None:
+                self._disconnect(player_id)
+            else:
+                writer.close()
+
+
+def load_map(path: str) -> MapGrid:
+    """Load a map file without creating a game window."""
+    return Serializable().load(path)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run a headless game server from the command line."""
+    parser = argparse.ArgumentParser(description="Super PySnake game server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--map", default=DEFAULT_CONFIG["DEFAULT_MAP_FILE"])
+    parser.add_argument("--tick-rate", type=float, default=1 / DEFAULT_CONFIG["GAME_SPEED"])
+    parser.add_argument("--food", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--generate", choices=MAP_STYLES, help="Generate a map of this style")
+    parser.add_argument("--map-seed", type=int, default=0)
+    parser.add_argument("--map-size", type=int, nargs=2, metavar=("ROWS", "COLS"))
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        square_size = DEFAULT_CONFIG["SQUARE_SIZE"]
+        rows, cols = args.map_size or (
+            DEFAULT_CONFIG["SCREEN_HEIGHT"] // square_size,
+            DEFAULT_CONFIG["SCREEN_WIDTH"] // square_size,
+        )
+        map_data = MapCache().get(MapParams(args.generate, rows, cols, args.map_seed))
+    else:
+        map_data = load_map(args.map)
+
+    server = GameServer(
+        map_data,
+        tick_rate=args.tick_rate,
+        food_count=args.food,
+        seed=args.seed,
+    )
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
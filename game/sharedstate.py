@@ -0,0 +1,305 @@
+"""
+Game state published in shared memory for bots and tools in other processes.
+
+The engine writes the board into a ``multiprocessing.shared_memory`` block
+with a fixed layout after every tick. Readers attach by name and copy out
+consistent snapshots without pickling, sockets or importing the game (so no
+window is opened). Consistency uses a seqlock: the writer makes the sequence
+counter odd while it writes and even when done, and a reader retries any
+copy during which the counter was odd or changed.
+
+Readers send moves back through a small action slot in the same block; the
+engine picks up the latest one at its next tick. StatePublisher connects a
+running game to a SharedBoard.
+
+Layout (little-endian):
+
+    0   magic "SPSM", version, rows, cols, reserved, max body length
+    16  sequence counter
+    24  tick, score, food row, food column, body length, direction
+    56  action sequence, action direction (written by readers)
+    72  tiles: one TILE_* byte per cell, row-major
+        body: (row, column) int16 pairs, head first
+"""
+import struct
+import time
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+from typing import List, NamedTuple, Optional, Sequence
+
+from game.listeners import DungeonListener
+from game.types import Direction, GameError, MapPosition
+
+SHARED_STATE_MAGIC = b"SPSM"
+SHARED_STATE_VERSION = 1
+
+# magic, version, rows, cols, reserved, max body length
+_LAYOUT = struct.Struct("<4sHHHHI")
+_SEQUENCE = struct.Struct("<Q")
+# tick, score, food row, food column, body length, direction
+_STATE = struct.Struct("<QdiiIB3x")
+# action sequence, action direction
+_ACTION = struct.Struct("<QB7x")
+
+_SEQUENCE_OFFSET = _LAYOUT.size
+_STATE_OFFSET = _SEQUENCE_OFFSET + _SEQUENCE.size
+_ACTION_OFFSET = _STATE_OFFSET + _STATE.size
+HEADER_SIZE = _ACTION_OFFSET + _ACTION.size
+
+DEFAULT_READ_ATTEMPTS = 1000
+
+
+class SharedStateError(GameError):
+    """Raised when a shared state block is missing, invalid or unreadable."""
+    pass
+
+
+class BoardState(NamedTuple):
+    """Consistent copy of the published board at one tick."""
+    tick: int
+    score: float
+    direction: Direction
+    body: List[MapPosition]
+    food: MapPosition
+    tiles: bytes
+    rows: int
+    cols: int
+
+    @property
+    def head(self) -> MapPosition:
+        """The cell of the snake's head."""
+        return self.body[0]
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block without taking ownership of it.
+
+    Before Python 3.13 attaching registers the block with the resource
+    tracker, which would unlink it when this process exits.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        block = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(block._name, "shared_memory")
+        return block
+
+
+class SharedBoard:
+    """Writer side: owns the shared block and publishes the board into it.
+
+    Only one process may publish into a block.
+    """
+
+    def __init__(self, rows: int, cols: int, max_body: Optional[int] = None, name: Optional[str] = None) -> None:
+        """Create and initialize a shared block for a board.
+
+        Args:
+            rows: Number of map rows
+            cols: Number of map columns
+            max_body: Most body cells published; defaults to one per cell
+            name: Name of the block; a random one is chosen if omitted
+
+        Raises:
+            SharedStateError: If the block cannot be created
+        """
+        self.rows = rows
+        self.cols = cols
+        self.max_body = max_body if max_body is not None else rows * cols
+        self._body_offset = HEADER_SIZE + rows * cols
+        size = self._body_offset + self.max_body * 4
+        try:
+            self._block = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except (OSError, ValueError) as e:
+            raise SharedStateError(f"Cannot create shared state block: {e}") from e
+        self.name = self._block.name
+        self._buffer = self._block.buf
+        _LAYOUT.pack_into(
+            self._buffer, 0,
+            SHARED_STATE_MAGIC, SHARED_STATE_VERSION, rows, cols, 0, self.max_body,
+        )
+        self._sequence = 0
+        self._last_action = 0
+
+    def publish(
+        self,
+        tick: int,
+        score: float,
+        direction: Direction,
+        body: Sequence[MapPosition],
+        food: MapPosition,
+        tiles: Optional[bytes] = None,
+    ) -> None:
+        """Publish the board at one tick.
+
+        Args:
+            tick: Game tick the state belongs to
+            score: Current score
+            direction: Direction the snake is heading in
+            body: Snake cells, head first; cut off at max_body
+            food: Cell of the food
+            tiles: One TILE_* byte per cell; None keeps the published tiles,
+                so the grid is only copied when it changed
+        """
+        body = body[:self.max_body]
+        cells = array("h")
+        for cell in body:
+            cells.append(cell.row)
+            cells.append(cell.column)
+
+        buffer = self._buffer
+        self._sequence += 1
+        _SEQUENCE.pack_into(buffer, _SEQUENCE_OFFSET, self._sequence)
+        if tiles is not None:
+            buffer[HEADER_SIZE:self._body_offset] = tiles
+        _STATE.pack_into(
+            buffer, _STATE_OFFSET,
+            tick, score, food.row, food.column, len(body), int(direction),
+        )
+        buffer[self._body_offset:self._body_offset + len(cells) * 2] = cells.tobytes()
+        self._sequence += 1
+        _SEQUENCE.pack_into(buffer, _SEQUENCE_OFFSET, self._sequence)
+
+    def take_action(self) -> Optional[Direction]:
+        """Get the move a reader sent since the last call, if any."""
+        sequence, value = _ACTION.unpack_from(self._buffer, _ACTION_OFFSET)
+        if sequence == self._last_action:
+            return None
+        self._last_action = sequence
+        try:
+            return Direction(value)
+        except ValueError:
+            return None
+
+    def close(self) -> None:
+        """Release and remove the block; attached readers keep their mapping."""
+        self._buffer = None
+        self._block.close()
+        try:
+            self._block.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedBoardReader:
+    """Reader side: attaches to a published block by name."""
+
+    def __init__(self, name: str) -> None:
+        """Attach to a block created by SharedBoard.
+
+        Raises:
+            SharedStateError: If the block does not exist or has another layout
+        """
+        try:
+            self._block = _attach(name)
+        except (OSError, ValueError) as e:
+            raise SharedStateError(f"Cannot attach to shared state {name!r}: {e}") from e
+        self._buffer = self._block.buf
+        magic, version, rows, cols, _, max_body = _LAYOUT.unpack_from(self._buffer, 0)
+        if magic != SHARED_STATE_MAGIC or version != SHARED_STATE_VERSION:
+            self.close()
+            raise SharedStateError(f"{name!r} is not a version {SHARED_STATE_VERSION} game state block")
+        self.rows = rows
+        self.cols = cols
+        self.max_body = max_body
+        self._body_offset = HEADER_SIZE + rows * cols
+        self._action_sequence = _ACTION.unpack_from(self._buffer, _ACTION_OFFSET)[0]
+
+    @property
+    def sequence(self) -> int:
+        """The writer's sequence counter; it changes whenever a tick is published."""
+        return _SEQUENCE.unpack_from(self._buffer, _SEQUENCE_OFFSET)[0]
+
+    def read(self, attempts: int = DEFAULT_READ_ATTEMPTS) -> BoardState:
+        """Copy out a consistent snapshot of the board.
+
+        Args:
+            attempts: Copies to try while the writer keeps interfering
+
+        Raises:
+            SharedStateError: If no consistent copy could be made, or
+                nothing has been published yet
+        """
+        buffer = self._buffer
+        for _ in range(attempts):
+            before = _SEQUENCE.unpack_from(buffer, _SEQUENCE_OFFSET)[0]
+            if before & 1:
+                time.sleep(0)
+                continue
+            tick, score, food_row, food_col, length, direction = _STATE.unpack_from(
+                buffer, _STATE_OFFSET
+            )
+            tiles = bytes(buffer[HEADER_SIZE:self._body_offset])
+            cells = array("h")
+            cells.frombytes(buffer[self._body_offset:self._body_offset + min(length, self.max_body) * 4])
+            if _SEQUENCE.unpack_from(buffer, _SEQUENCE_OFFSET)[0] != before:
+                continue
+            if before == 0:
+                raise SharedStateError("No game state has been published yet")
+            return BoardState(
+                tick=tick,
+                score=score,
+                direction=Direction(direction),
+                body=[MapPosition(row=cells[i], column=cells[i + 1]) for i in range(0, len(cells), 2)],
+                food=MapPosition(row=food_row, column=food_col),
+                tiles=tiles,
+                rows=self.rows,
+                cols=self.cols,
+            )
+        raise SharedStateError(f"No consistent game state after {attempts} attempts")
+
+    def send_action(self, direction: Direction) -> None:
+        """Ask the engine to turn the snake at its next tick.
+
+        The direction is written before the sequence that announces it.
+        Only one reader should send actions to a block.
+        """
+        self._action_sequence += 1
+        struct.pack_into("<B", self._buffer, _ACTION_OFFSET + 8, int(direction))
+        struct.pack_into("<Q", self._buffer, _ACTION_OFFSET, self._action_sequence)
+
+    def close(self) -> None:
+        """Detach from the block."""
+        self._buffer = None
+        self._block.close()
+
+
+class StatePublisher(DungeonListener):
+    """Publishes the board to a shared memory block for external bots."""
+
+    def __init__(self, board: SharedBoard, dungeon: "Dungeon") -> None:
+        """Publish into a board, republishing the tiles whenever they change."""
+        self.board = board
+        self._tiles_changed = True
+        dungeon.listeners.append(self)
+
+    def on_tiles_changed(
+        self,
+        dungeon: "Dungeon",
+        blocked: List[MapPosition],
+        freed: List[MapPosition],
+    ) -> None:
+        """Mark the tiles for copying on the next publish."""
+        self._tiles_changed = True
+
+    def on_walls_changed(
+        self,
+        dungeon: "Dungeon",
+        walled: List[MapPosition],
+        unwalled: List[MapPosition],
+    ) -> None:
+        """Mark the tiles for copying on the next publish."""
+        self._tiles_changed = True
+
+    def publish(self, snake: "Snake", food: "Food") -> None:
+        """Publish the current tick."""
+        dungeon = snake.dungeon
+        self.board.publish(
+            tick=snake.tick_count,
+            score=snake.current_score,
+            direction=snake.direction,
+            body=[dungeon.cell_at(segment.position) for segment in snake.body],
+            food=dungeon.cell_at(food.position),
+            tiles=bytes(dungeon.tiles) if self._tiles_changed else None,
+        )
+        self._tiles_changed = False
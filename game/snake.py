@@ -2,22 +2,27 @@
 Core snake entity and movement logic.
 """
 
-from typing import List
+from typing import List, Union
 
 import pyglet
 
 from game.app import window
 from game.dungeon import Dungeon
 from game.food import Food
+from game.listeners import SnakeListener
+from game.scoring import ScorePipeline
 from game.square import TexturedSquare
+from game.telemetry import EventKind, telemetry
 from game.types import (
     Direction,
+    FOOD_POINTS,
     Position,
     Size,
     DEFAULT_SNAKE_POSITION,
 )
 from pyscored.adapters.game_frameworks import GameFrameworkAdapter
 
+
 class Snake:
     """The player-controlled snake entity.
 
@@ -29,40 +34,93 @@ class Snake:
         speed: Movement speed (seconds per move).
         body: List of snake segments, with the head at index 0.
         dungeon: Reference to the game dungeon for collision detection.
+        player_id: Id the snake's score is recorded under.
+        tick_count: Number of moves processed so far.
+        listeners: Objects notified of snake events.
     """
 
-    def __init__(self, dungeon: Dungeon, game_adapter: GameFrameworkAdapter) -> None:
+    def __init__(
+        self,
+        dungeon: Dungeon,
+        game_adapter: Union[GameFrameworkAdapter, ScorePipeline],
+        player_id: str = "player1",
+    ) -> None:
         """Initialize the snake with a single segment.
 
         Args:
             dungeon: The game dungeon for wall collision detection.
+            game_adapter: Adapter, or pipeline in front of one, receiving
+                the snake's score updates.
+            player_id: Id the snake's score is recorded under.
         """
         self.direction = Direction.NORTH
         self.speed = window.config["GAME_SPEED"]
         self.dungeon = dungeon
         self.game_adapter = game_adapter
+        self.player_id = player_id
+        self.current_score = self.game_adapter.get_player_score(player_id)
+        self.tick_count = 0
+        self.listeners: List[SnakeListener] = []
+
+        # Segments dropped by resets, kept for reuse. Sprites are recycled
+        # rather than recreated because pyglet never frees the buffers of
+        # discarded sprites, so a new segment per tick leaks steadily.
+        self.body: List[TexturedSquare] = []
+        self._spare_segments: List[TexturedSquare] = []
 
         # Create the initial body segment (the head).
         self._create_default_body()
 
     def _create_default_body(self) -> None:
         """Reset the snake to its default state with a single segment."""
-        start_pos = Position(
-            x=window.config["SCREEN_WIDTH"] // 2,
-            y=window.config["SCREEN_HEIGHT"] // 2
+        start_pos = self.dungeon.spawn_position()
+
+        self._release_segments(self.body)
+        self.body = [self._create_segment(start_pos)]
+
+    def _create_segment(self, position: Position) -> TexturedSquare:
+        """Get a body segment at a position, reusing a spare one if possible."""
+        if self._spare_segments:
+            segment = self._spare_segments.pop()
+            segment.move_to(position)
+            return segment
+
+        return TexturedSquare(
+            position=position,
+            size=Size(
+                width=window.cell_size,
+                height=window.cell_size
+            ),
+            texture_path=window.config["TEXTURES"]["SNAKE"],
+            window=window
         )
 
-        self.body = [
-            TexturedSquare(
-                position=start_pos,
-                size=Size(
-                    width=window.config["SQUARE_SIZE"],
-                    height=window.config["SQUARE_SIZE"]
-                ),
-                texture_path=window.config["TEXTURES"]["SNAKE"],
-                window=window
-            )
-        ]
+    def _release_segments(self, segments: List[TexturedSquare]) -> None:
+        """Keep segments that left the body for later reuse."""
+        self._spare_segments.extend(segments)
+
+    def restore(self, positions: List[Position], direction: Direction, tick: int) -> None:
+        """Restore the snake's body and heading from saved state.
+
+        Existing segments are moved into place rather than recreated; new
+        ones are only built when the saved snake is longer.
+
+        Args:
+            positions: Segment positions, head first.
+            direction: Movement direction to resume with.
+            tick: Move counter to resume from.
+        """
+        for segment, position in zip(self.body, positions):
+            segment.move_to(position)
+        self._release_segments(self.body[len(positions):])
+        del self.body[len(positions):]
+        for position in positions[len(self.body):]:
+            self.body.append(self._create_segment(position))
+
+        self.direction = direction
+        self.tick_count = tick
+        for listener in self.listeners:
+            listener.on_reset(self)
 
     def _get_next_position(self) -> Position:
         """Calculate the next head position based on the current direction.
@@ -71,7 +129,7 @@ class Snake:
             The next grid position for the snake's head.
         """
         head = self.body[0]
-        square_size = window.config["SQUARE_SIZE"]
+        square_size = window.cell_size
 
         if self.direction == Direction.NORTH:
             return Position(head.position.x, head.position.y + square_size)
@@ -116,8 +174,13 @@ class Snake:
             food: The food object to reset.
         """
         self._create_default_body()
+        for listener in self.listeners:
+            listener.on_reset(self)
         food.reset_position([segment.position for segment in self.body])
-        self.game_adapter.update_player_score("player1", points=-self.current_score)
+        self.game_adapter.update_player_score(self.player_id, points=-self.current_score)
+        self.current_score = self.game_adapter.get_player_score(self.player_id)
+        telemetry.record(EventKind.RESET, self.tick_count)
+        telemetry.record(EventKind.SCORE, self.tick_count, self.current_score)
 
     def move(self, dt: float, food: Food) -> None:
         """Update the snake's position and handle collisions.
@@ -133,38 +196,47 @@ class Snake:
             dt: Time delta from the Pyglet clock.
             food: The food object for collision checking.
         """
+        self.tick_count += 1
+        telemetry.record(EventKind.TICK, self.tick_count, dt or 0.0)
+
         # Determine the next position for the snake's head.
-        next_pos = self._get_next_position()
+        next_pos = self.dungeon.through_portal(self._get_next_position())
 
         # Check collisions with self or walls.
         if self._check_self_collision(next_pos) or self._check_wall_collision(next_pos):
+            telemetry.record(EventKind.DEATH, self.tick_count, len(self.body))
+            for listener in self.listeners:
+                listener.on_death(self)
             self.reset(food)
+            for listener in self.listeners:
+                listener.on_tick(self)
             return
         
         # Check if the food is about to be eaten
         food_eaten = food.is_eaten(next_pos)
 
-        # Create and insert the new head segment.
-        new_head = TexturedSquare(
-            position=next_pos,
-            size=Size(
-                width=window.config["SQUARE_SIZE"],
-                height=window.config["SQUARE_SIZE"]
-            ),
-            texture_path=window.config["TEXTURES"]["SNAKE"],
-            window=window
-        )
-        self.body.insert(0, new_head)
-
         if food_eaten:
-            # Update player score through adapter
-            self.game_adapter.update_player_score("player1", points=10)
-            self.current_score = self.game_adapter.get_player_score("player1")
-            print(f"Current score: {self.current_score}")
+            # Grow by a new head segment and update the player score through the adapter
+            self.body.insert(0, self._create_segment(next_pos))
+            for listener in self.listeners:
+                listener.on_head(self, next_pos)
+            self.game_adapter.update_player_score(self.player_id, points=FOOD_POINTS)
+            self.current_score = self.game_adapter.get_player_score(self.player_id)
+            telemetry.record(EventKind.EAT, self.tick_count, len(self.body))
+            telemetry.record(EventKind.SCORE, self.tick_count, self.current_score)
             food.reset_position([segment.position for segment in self.body])
         else:
-            self.body.pop()
-
+            # Recycle the tail segment as the new head
+            tail = self.body.pop()
+            for listener in self.listeners:
+                listener.on_tail(self, tail.position)
+            tail.move_to(next_pos)
+            self.body.insert(0, tail)
+            for listener in self.listeners:
+                listener.on_head(self, next_pos)
+
+        for listener in self.listeners:
+            listener.on_tick(self)
 
     def draw(self) -> None:
         """Draw all snake segments."""
@@ -0,0 +1,114 @@
+"""
+Compact binary snapshots of the game state.
+
+Snapshots hold everything needed to resume a game at a given tick: the
+snake, the food, the score, the global RNG state and the id of the map. The
+encoding is a fixed struct header followed by packed arrays, so encoding or
+decoding takes microseconds and never goes through JSON.
+"""
+import struct
+from array import array
+from typing import Any, List, NamedTuple, Tuple
+
+from game.types import Direction, GameError, Position
+
+SNAPSHOT_MAGIC = b"SPSS"
+SNAPSHOT_VERSION = 1
+
+# magic, version, direction, map hash, tick, score, food x, food y, body length
+_HEADER = struct.Struct("<4sBB16sQdddI")
+# RNG state version, whether a cached gauss value exists, the cached value
+_RNG_HEADER = struct.Struct("<B?d")
+_RNG_WORDS = 625
+
+
+class SnapshotError(GameError):
+    """Raised when a snapshot cannot be decoded or applied."""
+    pass
+
+
+class GameSnapshot(NamedTuple):
+    """State of a game at one tick."""
+    map_hash: str
+    tick: int
+    direction: Direction
+    body: List[Position]
+    food: Position
+    score: float
+    rng_state: Tuple[Any, ...]
+
+
+def encode_snapshot(snapshot: GameSnapshot) -> bytes:
+    """Encode a snapshot into its binary form.
+
+    Raises:
+        SnapshotError: If the RNG state is not a Mersenne Twister state
+    """
+    rng_version, rng_words, gauss_next = snapshot.rng_state
+    if len(rng_words) != _RNG_WORDS:
+        raise SnapshotError("Unsupported RNG state")
+
+    body = array("d")
+    for position in snapshot.body:
+        body.append(position.x)
+        body.append(position.y)
+
+    return b"".join((
+        _HEADER.pack(
+            SNAPSHOT_MAGIC,
+            SNAPSHOT_VERSION,
+            int(snapshot.direction),
+            bytes.fromhex(snapshot.map_hash),
+            snapshot.tick,
+            snapshot.score,
+            snapshot.food.x,
+            snapshot.food.y,
+            len(snapshot.body),
+        ),
+        body.tobytes(),
+        _RNG_HEADER.pack(
+            rng_version,
+            gauss_next is not None,
+            gauss_next if gauss_next is not None else 0.0,
+        ),
+        array("I", rng_words).tobytes(),
+    ))
+
+
+def decode_snapshot(data: bytes) -> GameSnapshot:
+    """Decode a snapshot produced by encode_snapshot.
+
+    Raises:
+        SnapshotError: If the data is truncated or from another version
+    """
+    try:
+        (
+            magic, version, direction, map_hash, tick, score, food_x, food_y, length
+        ) = _HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise SnapshotError("Not a snapshot of a supported version")
+
+        offset = _HEADER.size
+        body = array("d")
+        body.frombytes(data[offset:offset + length * 16])
+        offset += length * 16
+
+        rng_version, has_gauss, gauss_next = _RNG_HEADER.unpack_from(data, offset)
+        offset += _RNG_HEADER.size
+        rng_words = array("I")
+        rng_words.frombytes(data[offset:offset + _RNG_WORDS * 4])
+        if len(body) != length * 2 or len(rng_words) != _RNG_WORDS:
+            raise SnapshotError("Truncated snapshot")
+    except (struct.error, ValueError) as e:
+        raise SnapshotError(f"Failed to decode snapshot: {e}") from e
+
+    return GameSnapshot(
+        map_hash=map_hash.hex(),
+        tick=tick,
+        direction=Direction(direction),
+        body=[Position(body[i], body[i + 1]) for i in range(0, len(body), 2)],
+        food=Position(food_x, food_y),
+        score=score,
+        rng_state=(rng_version, tuple(rng_words), gauss_next if has_gauss else None),
+    )
+
@@ -0,0 +1,300 @@
+"""
+Long-running soak harness for leak hunting.
+
+Runs the full game headless on simulated clock time, so hours of play go
+by in minutes, while a bot keeps the snake eating. At regular intervals it
+samples traced memory, GC counters, live objects per type and the number of
+callbacks scheduled on the pyglet clock, and fails once any of them grows
+past its threshold.
+
+Run with ``python -m game.soak --ticks 200000``.
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from game import configure_headless
+from game.types import DIRECTION_DELTAS, Direction, GameError, MapPosition, TILE_WALL
+
+FRAME_RATE = 60.0
+
+
+class SoakFailure(GameError):
+    """Raised when a soak run grows past one of its thresholds."""
+    pass
+
+
+class SoakSample(NamedTuple):
+    """Resource usage measured at one point of a soak run."""
+    tick: int
+    traced_bytes: int
+    gc_counts: Tuple[int, int, int]
+    live_objects: int
+    scheduled_callbacks: int
+    top_types: Dict[str, int]
+
+
+class SoakThresholds(NamedTuple):
+    """Largest growth over the baseline sample a run may show."""
+    memory_bytes: int = 8 * 1024 * 1024
+    scheduled_callbacks: int = 4
+    objects_per_type: int = 5000
+
+
+class SimulatedTime:
+    """Clock time source advanced by the harness instead of the wall clock."""
+
+    def __init__(self) -> None:
+        """Start at time zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Get the current simulated time."""
+        return self.now
+
+
+def count_scheduled_callbacks(clock: Any) -> int:
+    """Count the callbacks currently scheduled on a pyglet clock."""
+    return len(getattr(clock, "_schedule_items", ())) + len(
+        getattr(clock, "_schedule_interval_items", ())
+    )
+
+
+class SoakHarness:
+    """Drives a Game on simulated time and samples resource usage.
+
+    Attributes:
+        samples: Samples taken so far; the first one is the baseline
+    """
+
+    def __init__(
+        self,
+        game: Any,
+        *,
+        sample_every: int = 1000,
+        draw_every: int = 10,
+        max_length: int = 100,
+        thresholds: SoakThresholds = SoakThresholds(),
+    ) -> None:
+        """Initialize the harness around an existing game.
+
+        Args:
+            game: The Game to drive; its run() method is never called
+            sample_every: Game ticks between samples
+            draw_every: Frames between renders; 0 disables rendering
+            max_length: Snake length at which the bot restarts the game
+            thresholds: Allowed growth over the baseline sample
+        """
+        import pyglet
+
+        self.pyglet = pyglet
+        self.game = game
+        self.sample_every = sample_every
+        self.draw_every = draw_every
+        self.max_length = max_length
+        self.thresholds = thresholds
+        self.samples: List[SoakSample] = []
+
+        self.time = SimulatedTime()
+        self.clock = pyglet.clock.get_default()
+        self.clock.time = self.time
+        self.clock.last_ts = self.time()
+        self.clock.next_ts = self.time()
+
+        # Like pyglet's own event loop, dispatch window events immediately.
+        pyglet.window.Window._enable_event_queue = False
+
+        self.ticks = 0
+        self._baseline_snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def _tick(self, dt: float) -> None:
+        """Let the bot steer, then move the snake."""
+        snake = self.game.snake
+        if len(snake.body) >= self.max_length:
+            snake.reset(self.game.food)
+        self.game.dungeon.advance()
+        snake.direction = self._choose_direction()
+        self.game.scores.tick = snake.tick_count + 1
+        snake.move(dt, self.game.food)
+        self.game.scores.flush()
+        self.ticks += 1
+
+    def _choose_direction(self) -> Direction:
+        """Follow the map's Hamiltonian cycle, or any safe direction without one."""
+        snake = self.game.snake
+        dungeon = self.game.dungeon
+        head = dungeon.cell_at(snake.body[0].position)
+
+        target = self.game.map_handler.navigation.next_on_cycle(head)
+        for direction, delta in DIRECTION_DELTAS.items():
+            cell = MapPosition(head.row + delta.row, head.column + delta.column)
+            if cell == target:
+                return direction
+
+        occupied = {dungeon.cell_at(segment.position) for segment in snake.body}
+        for direction, delta in DIRECTION_DELTAS.items():
+            cell = MapPosition(head.row + delta.row, head.column + delta.column)
+            if cell not in occupied and dungeon.tile(cell) != TILE_WALL:
+                return direction
+        return snake.direction
+
+    def sample(self) -> SoakSample:
+        """Measure resource usage now and record it."""
+        gc.collect()
+        objects = gc.get_objects()
+        types = Counter(type(obj).__name__ for obj in objects)
+        sample = SoakSample(
+            tick=self.ticks,
+            traced_bytes=tracemalloc.get_traced_memory()[0],
+            gc_counts=gc.get_count(),
+            live_objects=len(objects),
+            scheduled_callbacks=count_scheduled_callbacks(self.clock),
+            top_types=dict(types.most_common(50)),
+        )
+        del objects
+        self.samples.append(sample)
+        return sample
+
+    def check(self) -> None:
+        """Compare the latest sample with the baseline.
+
+        Raises:
+            SoakFailure: If any measurement grew past its threshold
+        """
+        if len(self.samples) < 2:
+            return
+        baseline, latest = self.samples[0], self.samples[-1]
+        problems = []
+
+        memory_growth = latest.traced_bytes - baseline.traced_bytes
+        if memory_growth > self.thresholds.memory_bytes:
+            problems.append(f"traced memory grew by {memory_growth} bytes")
+
+        callback_growth = latest.scheduled_callbacks - baseline.scheduled_callbacks
+        if callback_growth > self.thresholds.scheduled_callbacks:
+            problems.append(f"scheduled clock callbacks grew by {callback_growth}")
+
+        for name, count in latest.top_types.items():
+            growth = count - baseline.top_types.get(name, 0)
+            if growth > self.thresholds.objects_per_type:
+                problems.append(f"live {name} objects grew by {growth}")
+
+        if problems:
+            raise SoakFailure(
+                f"Soak failed at tick {latest.tick}: " + "; ".join(problems)
+                + "\n" + self.memory_report()
+            )
+
+    def memory_report(self, limit: int = 10) -> str:
+        """Describe the source lines whose allocations grew the most."""
+        if self._baseline_snapshot is None or not tracemalloc.is_tracing():
+            return ""
+        stats = tracemalloc.take_snapshot().compare_to(self._baseline_snapshot, "lineno")
+        return "\n".join(str(stat) for stat in stats[:limit])
+
+    def run(self, ticks: int, warmup: int = 1000) -> List[SoakSample]:
+        """Simulate a number of game ticks, sampling and checking as it goes.
+
+        Args:
+            ticks: Game ticks to simulate after the warmup
+            warmup: Ticks to run before the baseline sample, so caches and
+                pools reach their steady size first
+
+        Raises:
+            SoakFailure: If resource usage grows past the thresholds
+        """
+        self.clock.schedule_interval(self._tick, self.game.snake.speed)
+        frame_dt = 1.0 / FRAME_RATE
+        window = self.game_window()
+        frame = 0
+        next_sample = warmup
+        try:
+            while self.ticks < warmup + ticks:
+                self.time.now += frame_dt
+                self.clock.tick()
+                frame += 1
+                if self.draw_every and frame % self.draw_every == 0:
+                    window.draw(frame_dt)
+
+                if self.ticks >= next_sample:
+                    if not self.samples:
+                        tracemalloc.start()
+                        self._baseline_snapshot = tracemalloc.take_snapshot()
+                    self.sample()
+                    self.check()
+                    next_sample += self.sample_every
+        finally:
+            self.clock.unschedule(self._tick)
+        return self.samples
+
+    def game_window(self) -> Any:
+        """Get the window the game renders into."""
+        from game.app import window
+
+        return window
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run a soak test from the command line."""
+    parser = argparse.ArgumentParser(description="Super PySnake soak test")
+    parser.add_argument("--ticks", type=int, default=100_000)
+    parser.add_argument("--warmup", type=int, default=1000)
+    parser.add_argument("--sample-every", type=int, default=5000)
+    parser.add_argument("--draw-every", type=int, default=10)
+    parser.add_argument("--max-memory-mb", type=float, default=8.0)
+    parser.add_argument("--max-callbacks", type=int, default=4)
+    parser.add_argument("--max-objects", type=int, default=5000)
+    parser.add_argument(
+        "--record-runs",
+        metavar="DIR",
+        help="Also log every tick as columnar .npy chunks for offline analysis",
+    )
+    args = parser.parse_args(argv)
+
+    # The game creates its window on import, so headless mode must be
+    # selected before anything from game.main (or pyglet.window) is loaded.
+    os.environ.setdefault("SUPER_PYSNAKE_HEADLESS", "1")
+    configure_headless()
+    from game.main import Game
+    from game.records import ScoreStore
+
+    with tempfile.TemporaryDirectory() as scratch:
+        store = ScoreStore(Path(scratch) / "soak.sqlite3")
+        game = Game(score_store=store)
+        writer = game.record_runs(Path(args.record_runs)) if args.record_runs else None
+        harness = SoakHarness(
+            game,
+            sample_every=args.sample_every,
+            draw_every=args.draw_every,
+            thresholds=SoakThresholds(
+                memory_bytes=int(args.max_memory_mb * 1024 * 1024),
+                scheduled_callbacks=args.max_callbacks,
+                objects_per_type=args.max_objects,
+            ),
+        )
+        try:
+            harness.run(args.ticks, warmup=args.warmup)
+        except SoakFailure as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        finally:
+            if writer is not None:
+                writer.close()
+            store.close()
+
+        for sample in harness.samples:
+            print(
+                f"tick={sample.tick} traced={sample.traced_bytes} "
+                f"objects={sample.live_objects} callbacks={sample.scheduled_callbacks} "
+                f"gc={sample.gc_counts}"
+            )
+
+
+if __name__ == "__main__":
+    main()
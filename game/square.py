@@ -1,11 +1,20 @@
 # game/square.py
 
+from functools import lru_cache
+from typing import Optional
+
 import pyglet
 from pyglet.sprite import Sprite
 from pyglet.graphics import Batch
 from game.types import Position, Size
 
 
+@lru_cache(maxsize=None)
+def load_texture(texture_path: str) -> pyglet.image.AbstractImage:
+    """Load an image once and share it between every square using it."""
+    return pyglet.image.load(texture_path)
+
+
 class TexturedSquare:
     """A textured square object that can be rendered in the game."""
 
@@ -15,19 +24,29 @@ class TexturedSquare:
         size: Size,
         texture_path: str,
         window: pyglet.window.Window,  # Add window parameter
+        batch: Optional[Batch] = None,
     ) -> None:
-        """Initialize a new textured square."""
+        """Initialize a new textured square.
+
+        Squares given a shared batch are drawn together with it; draw()
+        then draws the whole batch.
+        """
         self.position = position
         self.size = size
         self.window = window  # Store the window
-        self.batch = Batch()
+        self.batch = batch if batch is not None else Batch()
 
         # Load texture and create a sprite
-        image = pyglet.image.load(texture_path)
+        image = load_texture(texture_path)
         self.sprite = Sprite(image, x=position.x, y=position.y, batch=self.batch)
         self.sprite.scale_x = size.width / image.width
         self.sprite.scale_y = size.height / image.height
 
+    def move_to(self, position: Position) -> None:
+        """Move the square, reusing its sprite."""
+        self.position = position
+        self.sprite.position = (position.x, position.y, 0)
+
     def draw(self) -> None:
         """Draw the textured square on the screen."""
         self.batch.draw()
@@ -0,0 +1,407 @@
+"""
+Low-overhead event telemetry for the game loop.
+
+Events go into a preallocated ring buffer of packed arrays; recording one
+is a handful of array stores and never allocates, blocks or touches a file.
+A background thread drains the buffer into a compact binary log that is
+rotated by size. Events above the configured level cost a single integer
+comparison, and high-frequency events (ticks, frames) can be sampled.
+
+Dump a log with ``python -m game.telemetry .data/telemetry.bin``, or
+summarize its input latency with ``--latency``.
+"""
+import argparse
+import os
+import struct
+import threading
+import time
+from array import array
+from collections import deque
+from enum import IntEnum
+from pathlib import Path
+from typing import BinaryIO, Deque, Iterator, List, NamedTuple, Optional, Tuple
+
+from game.types import FilePath, TelemetryConfig
+
+TELEMETRY_MAGIC = b"SPTL"
+TELEMETRY_VERSION = 1
+
+_FILE_HEADER = struct.Struct("<4sB")
+# timestamp, event kind, tick, value
+_RECORD = struct.Struct("<dBqd")
+
+DEFAULT_CAPACITY = 1 << 14
+
+
+class TelemetryLevel(IntEnum):
+    """How much the game records; each level includes the ones below it."""
+    OFF = 0
+    EVENTS = 1
+    VERBOSE = 2
+
+
+class EventKind(IntEnum):
+    """Kinds of recorded events; the value field's meaning depends on the kind."""
+    ERROR = 0    # value unused
+    EAT = 1      # value: snake length
+    DEATH = 2    # value: snake length
+    RESET = 3    # value unused
+    SCORE = 4    # value: new score
+    TICK = 5     # value: seconds since the previous tick
+    FRAME = 6    # value: seconds spent drawing the frame
+    INPUT = 7    # value: seconds from key press to the head move applying it
+    CATCH_UP = 8  # value: game ticks simulated since the previous frame
+
+
+# Lowest level at which each kind is recorded
+EVENT_LEVELS = {
+    EventKind.ERROR: TelemetryLevel.EVENTS,
+    EventKind.EAT: TelemetryLevel.EVENTS,
+    EventKind.DEATH: TelemetryLevel.EVENTS,
+    EventKind.RESET: TelemetryLevel.EVENTS,
+    EventKind.SCORE: TelemetryLevel.EVENTS,
+    EventKind.TICK: TelemetryLevel.VERBOSE,
+    EventKind.FRAME: TelemetryLevel.VERBOSE,
+    EventKind.INPUT: TelemetryLevel.EVENTS,
+    EventKind.CATCH_UP: TelemetryLevel.VERBOSE,
+}
+
+# Kinds only recorded once every SAMPLE_EVERY occurrences
+SAMPLED_KINDS = (EventKind.TICK, EventKind.FRAME, EventKind.CATCH_UP)
+
+
+class TelemetryEvent(NamedTuple):
+    """One event read back from a telemetry log."""
+    timestamp: float
+    kind: EventKind
+    tick: int
+    value: float
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations.
+
+    Buckets are preallocated, so adding a sample is a short scan and an
+    increment. Percentiles are resolved to the upper edge of their bucket.
+
+    Attributes:
+        counts: Samples per bucket; the last bucket collects everything
+            above the highest edge
+        total: Sum of all samples, in seconds
+        worst: Largest sample seen, in seconds
+    """
+
+    # Upper bucket edges, in seconds
+    EDGES = (0.001, 0.002, 0.005, 0.010, 0.020, 0.035, 0.050, 0.075, 0.100, 0.150,
+             0.200, 0.300, 0.500, 1.000)
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(self.EDGES) + 1)
+        self.total = 0.0
+        self.worst = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Add one sample."""
+        bucket = 0
+        for edge in self.EDGES:
+            if seconds <= edge:
+                break
+            bucket += 1
+        self.counts[bucket] += 1
+        self.total += seconds
+        self.worst = max(self.worst, seconds)
+
+    @property
+    def count(self) -> int:
+        """Number of samples."""
+        return sum(self.counts)
+
+    def mean(self) -> float:
+        """Average sample, or 0 without samples."""
+        count = self.count
+        return self.total / count if count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Upper edge of the bucket holding the given fraction of samples.
+
+        Args:
+            fraction: Between 0 and 1, e.g. 0.99 for the 99th percentile
+
+        Returns:
+            The bucket edge in seconds; the worst sample for the last bucket
+        """
+        wanted = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= wanted:
+                return self.EDGES[bucket] if bucket < len(self.EDGES) else self.worst
+        return 0.0
+
+    def summary(self) -> str:
+        """Describe the distribution in one line, in milliseconds."""
+        return (
+            f"n={self.count} mean={self.mean() * 1000:.1f}ms "
+            f"p50<={self.percentile(0.5) * 1000:.0f}ms "
+            f"p95<={self.percentile(0.95) * 1000:.0f}ms "
+            f"p99<={self.percentile(0.99) * 1000:.0f}ms "
+            f"max={self.worst * 1000:.1f}ms"
+        )
+
+
+class Telemetry:
+    """Ring-buffered event recorder with a background flusher.
+
+    The game thread is the only writer and the flusher thread the only
+    reader, so the buffer needs no lock: a slot is filled before the head
+    index that publishes it is advanced. When the flusher falls behind,
+    new events are dropped and counted rather than blocking the game.
+    Other threads report errors through thread_error, which bypasses the
+    buffer.
+
+    Attributes:
+        level: Highest event level being recorded
+        sample_every: Keep one in this many sampled events
+        dropped: Events lost because the buffer was full
+        errors: Messages of ERROR events not yet written to the log's sidecar
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """Initialize a disabled recorder.
+
+        Args:
+            capacity: Buffer size in events; rounded up to a power of two
+        """
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self.capacity = size
+        self._mask = size - 1
+        self._times = array("d", bytes(8 * size))
+        self._kinds = array("B", bytes(size))
+        self._ticks = array("q", bytes(8 * size))
+        self._values = array("d", bytes(8 * size))
+        self._head = 0
+        self._tail = 0
+
+        self.level = TelemetryLevel.OFF
+        self.sample_every = 1
+        self.dropped = 0
+        self.errors: Deque[str] = deque()
+        # (time, tick, message) of errors reported by other threads
+        self._thread_errors: Deque[Tuple[float, int, str]] = deque()
+        self._thresholds = [int(EVENT_LEVELS[kind]) for kind in EventKind]
+        self._countdown = [1] * len(EventKind)
+
+        self.path: Optional[Path] = None
+        self.max_bytes = 0
+        self.backups = 0
+        self.flush_interval = 0.5
+        self._file: Optional[BinaryIO] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def configure(self, config: TelemetryConfig) -> None:
+        """Apply a telemetry configuration; takes effect immediately.
+
+        Unknown levels disable telemetry rather than failing the game.
+        """
+        try:
+            self.level = TelemetryLevel[str(config["LEVEL"]).upper()]
+        except KeyError:
+            self.level = TelemetryLevel.OFF
+        self.path = Path(config["FILE"])
+        self.max_bytes = max(int(config["MAX_BYTES"]), _RECORD.size)
+        self.backups = max(int(config["BACKUPS"]), 0)
+        self.sample_every = max(int(config["SAMPLE_EVERY"]), 1)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any events are being recorded."""
+        return self.level > TelemetryLevel.OFF
+
+    def record(self, kind: EventKind, tick: int = 0, value: float = 0.0) -> None:
+        """Record an event; a no-op when its level is not enabled.
+
+        Args:
+            kind: What happened
+            tick: Game tick the event belongs to
+            value: Kind-specific measurement
+        """
+        if self._thresholds[kind] > self.level:
+            return
+        if kind in SAMPLED_KINDS:
+            self._countdown[kind] -= 1
+            if self._countdown[kind] > 0:
+                return
+            self._countdown[kind] = self.sample_every
+
+        head = self._head
+        if head - self._tail >= self.capacity:
+            self.dropped += 1
+            return
+        slot = head & self._mask
+        self._times[slot] = time.time()
+        self._kinds[slot] = kind
+        self._ticks[slot] = tick
+        self._values[slot] = value
+        self._head = head + 1
+
+    def error(self, message: str, tick: int = 0) -> None:
+        """Record an error event and keep its message."""
+        if self.enabled:
+            self.errors.append(message)
+            self.record(EventKind.ERROR, tick)
+
+    def thread_error(self, message: str, tick: int = 0) -> None:
+        """Record an error from a thread other than the game thread.
+
+        The ring buffer has a single writer, so the event is queued on a
+        deque instead (appends are atomic) and written by the flusher along
+        with its next chunk, slightly out of order with the buffered events.
+        """
+        if self.enabled:
+            self._thread_errors.append((time.time(), tick, message))
+
+    def start(self) -> None:
+        """Start the background flusher if telemetry is enabled."""
+        if not self.enabled or self.path is None or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the flusher after writing every buffered event."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        elif self.enabled and self.path is not None:
+            # Never started (e.g. the game failed to start); write what we have
+            try:
+                self._drain()
+            except OSError:
+                pass
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _flush_loop(self) -> None:
+        """Drain the buffer periodically until stopped."""
+        try:
+            while not self._stop.wait(self.flush_interval):
+                self._drain()
+            self._drain()
+        except OSError:
+            # Losing telemetry must never take the game down.
+            self.level = TelemetryLevel.OFF
+
+    def _drain(self) -> None:
+        """Write every published event to the log file."""
+        head = self._head
+        tail = self._tail
+        if head == tail and not self.errors and not self._thread_errors:
+            return
+
+        chunk = bytearray(_RECORD.size * (head - tail))
+        offset = 0
+        for index in range(tail, head):
+            slot = index & self._mask
+            _RECORD.pack_into(
+                chunk, offset,
+                self._times[slot], self._kinds[slot], self._ticks[slot], self._values[slot],
+            )
+            offset += _RECORD.size
+        self._tail = head
+        while self._thread_errors:
+            when, tick, message = self._thread_errors.popleft()
+            chunk += _RECORD.pack(when, EventKind.ERROR, tick, 0.0)
+            self.errors.append(message)
+
+        file = self._open()
+        if file.tell() + len(chunk) > self.max_bytes and file.tell() > _FILE_HEADER.size:
+            file = self._rotate()
+        file.write(chunk)
+        file.flush()
+        self._write_errors()
+
+    def _open(self) -> BinaryIO:
+        """Get the current log file, creating it with a header if needed."""
+        if self._file is None:
+            assert self.path is not None
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "ab")
+            if self._file.tell() == 0:
+                self._file.write(_FILE_HEADER.pack(TELEMETRY_MAGIC, TELEMETRY_VERSION))
+        return self._file
+
+    def _rotate(self) -> BinaryIO:
+        """Shift log.N to log.N+1, dropping the oldest, and start a new log."""
+        assert self.path is not None and self._file is not None
+        self._file.close()
+        self._file = None
+        for number in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{number}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{number + 1}"))
+        if self.backups:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        return self._open()
+
+    def _write_errors(self) -> None:
+        """Append pending error messages to the text sidecar of the log."""
+        if not self.errors:
+            return
+        assert self.path is not None
+        with open(self.path.with_name(f"{self.path.name}.errors"), "a", encoding="utf-8") as file:
+            while self.errors:
+                file.write(f"{time.time():.3f} {self.errors.popleft()}\n")
+
+
+def read_events(path: FilePath) -> Iterator[TelemetryEvent]:
+    """Read the events of a telemetry log file.
+
+    Raises:
+        ValueError: If the file is not a telemetry log of this version
+    """
+    with open(path, "rb") as file:
+        header = file.read(_FILE_HEADER.size)
+        if len(header) < _FILE_HEADER.size or _FILE_HEADER.unpack(header) != (
+            TELEMETRY_MAGIC, TELEMETRY_VERSION
+        ):
+            raise ValueError(f"{path} is not a telemetry log")
+        data = file.read()
+    usable = len(data) - len(data) % _RECORD.size
+    for timestamp, kind, tick, value in _RECORD.iter_unpack(data[:usable]):
+        yield TelemetryEvent(timestamp, EventKind(kind), tick, value)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Print the events of a telemetry log as text."""
+    parser = argparse.ArgumentParser(description="Dump a Super PySnake telemetry log")
+    parser.add_argument("path")
+    parser.add_argument(
+        "--latency", action="store_true", help="Summarize key-to-move latency instead"
+    )
+    args = parser.parse_args(argv)
+    if args.latency:
+        histogram = LatencyHistogram()
+        for event in read_events(args.path):
+            if event.kind == EventKind.INPUT:
+                histogram.add(event.value)
+        print(histogram.summary())
+        return
+    for event in read_events(args.path):
+        print(f"{event.timestamp:.3f} {event.kind.name:<6} tick={event.tick} value={event.value:g}")
+
+
+# Recorder shared by the whole game; configured from the game config
+telemetry = Telemetry()
+
+
+if __name__ == "__main__":
+    main()
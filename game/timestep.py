@@ -0,0 +1,164 @@
+"""
+Fixed-timestep simulation, decoupled from the clock callback rate.
+
+The game used to move the snake from a pyglet interval callback per tick,
+so running faster meant scheduling callbacks ever more often, and the
+clock's own overhead capped the speed long before the simulation did.
+FixedTimestep instead wakes at most once per frame, adds the elapsed time
+(multiplied by the playback speed) to an accumulator and runs as many
+fixed-length ticks as it holds. At normal speed that is one tick per
+wake-up, as before; at 100x a single wake-up runs a batch of ticks, and
+the renderer draws only the state the batch ended on.
+
+Every tick sees the same step, so a run plays out identically at any
+speed. When the simulation cannot keep up, ticks past max_catch_up per
+wake-up are dropped rather than piling up into an ever longer backlog.
+"""
+from typing import Any, Callable, Optional
+
+import pyglet
+
+# Playback speeds offered by the speed keys, as multiples of normal speed
+SPEED_STEPS = (1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0)
+# Most ticks run in one wake-up before the backlog is dropped
+DEFAULT_MAX_CATCH_UP = 1000
+# Fraction of a step a tick may come early by, absorbing rounding in dt
+_TOLERANCE = 1e-6
+
+
+class FixedTimestep:
+    """Runs a tick callback at a fixed simulated rate, times a speed factor.
+
+    Attributes:
+        step: Simulated seconds per tick
+        speed: Playback speed as a multiple of real time
+        frame_time: Shortest real time between wake-ups, normally the
+            frame interval; no more than one frame's worth of wake-ups is
+            scheduled however fast the simulation runs
+        max_catch_up: Most ticks run per wake-up
+        ticks: Ticks simulated so far
+        dropped: Ticks skipped because the simulation fell behind
+        pending_ticks: Ticks simulated since the last rendered frame
+        last_frame_ticks: Ticks simulated for the last rendered frame
+        peak_frame_ticks: Most ticks simulated for any rendered frame
+        running: Whether ticks are scheduled
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[float], Any],
+        step: float,
+        speed: float = 1.0,
+        frame_time: float = 1.0 / 60.0,
+        max_catch_up: int = DEFAULT_MAX_CATCH_UP,
+        clock: Optional[Any] = None,
+    ) -> None:
+        """Initialize a stopped timestep.
+
+        Args:
+            callback: Called once per tick with the step length
+            step: Simulated seconds per tick
+            speed: Playback speed as a multiple of real time
+            frame_time: Shortest real time between wake-ups
+            max_catch_up: Most ticks run per wake-up
+            clock: Clock to schedule on; defaults to pyglet's default clock
+        """
+        self.callback = callback
+        self.step = step
+        self.speed = speed
+        self.frame_time = frame_time
+        self.max_catch_up = max_catch_up
+        self._clock = clock
+        self._accumulator = 0.0
+        self.ticks = 0
+        self.dropped = 0
+        self.pending_ticks = 0
+        self.last_frame_ticks = 0
+        self.peak_frame_ticks = 0
+        self.running = False
+
+    @property
+    def clock(self) -> Any:
+        """The clock wake-ups are scheduled on."""
+        return self._clock or pyglet.clock.get_default()
+
+    @property
+    def interval(self) -> float:
+        """Real seconds between wake-ups.
+
+        One tick's worth when ticks are slower than frames, otherwise one
+        frame's worth.
+        """
+        return max(self.step / self.speed, self.frame_time)
+
+    def start(self) -> None:
+        """Start ticking, with an empty accumulator."""
+        if not self.running:
+            self.running = True
+            self._accumulator = 0.0
+            self.clock.schedule_interval(self.advance, self.interval)
+
+    def stop(self) -> None:
+        """Stop ticking; partly accumulated time is discarded."""
+        if self.running:
+            self.running = False
+            self.clock.unschedule(self.advance)
+
+    def configure(
+        self,
+        step: Optional[float] = None,
+        speed: Optional[float] = None,
+        frame_time: Optional[float] = None,
+    ) -> None:
+        """Change the tick length, speed or frame time, rescheduling if running."""
+        if step is not None:
+            self.step = step
+        if speed is not None:
+            self.speed = speed
+        if frame_time is not None:
+            self.frame_time = frame_time
+        if self.running:
+            self.clock.unschedule(self.advance)
+            self.clock.schedule_interval(self.advance, self.interval)
+
+    def advance(self, dt: float) -> int:
+        """Run the ticks that real time dt, at the current speed, adds up to.
+
+        Returns:
+            Number of ticks run
+        """
+        self._accumulator += dt * self.speed
+        due = int(self._accumulator / self.step + _TOLERANCE)
+        if due > self.max_catch_up:
+            self.dropped += due - self.max_catch_up
+            self._accumulator -= (due - self.max_catch_up) * self.step
+            due = self.max_catch_up
+        for _ in range(due):
+            self._accumulator -= self.step
+            self.callback(self.step)
+        self.ticks += due
+        self.pending_ticks += due
+        return due
+
+    def frame_rendered(self) -> int:
+        """Note that a frame showing the latest state was drawn.
+
+        Returns:
+            Ticks simulated since the previous rendered frame
+        """
+        ticks, self.pending_ticks = self.pending_ticks, 0
+        self.last_frame_ticks = ticks
+        self.peak_frame_ticks = max(self.peak_frame_ticks, ticks)
+        return ticks
+
+    def faster(self) -> float:
+        """Switch to the next speed in SPEED_STEPS and return it."""
+        faster = [speed for speed in SPEED_STEPS if speed > self.speed]
+        self.configure(speed=faster[0] if faster else self.speed)
+        return self.speed
+
+    def slower(self) -> float:
+        """Switch to the previous speed in SPEED_STEPS and return it."""
+        slower = [speed for speed in SPEED_STEPS if speed < self.speed]
+        self.configure(speed=slower[-1] if slower else self.speed)
+        return self.speed
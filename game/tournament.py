@@ -0,0 +1,567 @@
+"""
+Round-robin tournaments between bot policies, run headless in parallel.
+
+Every pair of policies meets on every map of the pool once per seed. A match
+is a fixed number of arena ticks with a seed derived from the match itself,
+so any match can be replayed exactly and the outcome never depends on which
+worker ran it or in what order. Matches run in a process pool with no
+window and no tick timer, and each finished match is appended to a
+checkpoint file; an interrupted tournament picks up where it stopped when
+run again with the same checkpoint.
+
+A match is won by the snake that ate more food over the match; snakes that
+die respawn, as in the arena. Results are turned into Elo ratings and
+per-map statistics.
+
+Policies are named: either one of the built-in POLICIES or a
+``module:function`` path to any callable with the arena Policy signature.
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from pyscored.core.scoring_engine import ScoringEngine
+from pyscored.adapters import GameFrameworkAdapter
+
+from game.arena import Arena, Policy
+from game.mapcompiler import CompiledMap, MapCompileError, map_content_hash
+from game.mapgen import MapCache, MapValidationError
+from game.server import load_map
+from game.types import (
+    DEFAULT_CONFIG,
+    DIRECTION_DELTAS,
+    MAP_STYLES,
+    Direction,
+    FilePath,
+    GameError,
+    MapGrid,
+    MapParams,
+    MapPosition,
+)
+from utils.serializable import PRETTY_JSON, Serializable, SerializationError
+
+DEFAULT_TICKS = 500
+DEFAULT_CHECKPOINT = Path(".data") / "tournament.jsonl"
+INITIAL_RATING = 1500.0
+ELO_K = 16.0
+
+# Most cells a cautious bot looks ahead when comparing escape routes
+_FLOOD_LIMIT = 64
+_DELTAS = tuple(DIRECTION_DELTAS.values())
+
+
+class TournamentError(GameError):
+    """Raised when a tournament cannot be set up."""
+    pass
+
+
+class Match(NamedTuple):
+    """One scheduled match: the players in spawn order on one map."""
+    map_name: str
+    players: Tuple[str, ...]
+    seed: int
+    ticks: int
+    food_count: int
+    map_hash: str
+
+    @property
+    def key(self) -> str:
+        """Identity of the match in checkpoints.
+
+        Covers every setting that changes the outcome, including the map's
+        content, so a checkpoint never hands back results of another setup.
+        """
+        return (
+            f"{self.map_name}|{','.join(self.players)}|{self.seed}|{self.ticks}"
+            f"|{self.food_count}|{self.map_hash}"
+        )
+
+
+def _safe_directions(arena: Arena, player_id: str) -> List[Direction]:
+    """Get the directions a snake can move in without dying this tick."""
+    head = arena.snakes[player_id].head
+    return [
+        direction for direction in Direction
+        if not arena.is_blocked(arena.next_cell(head, direction))
+    ]
+
+
+def _food_distance(arena: Arena, cell: MapPosition) -> int:
+    """Get the Manhattan distance from a cell to the nearest food."""
+    return min(
+        (abs(food.row - cell.row) + abs(food.column - cell.column) for food in arena.food),
+        default=0,
+    )
+
+
+def _has_room(arena: Arena, start: MapPosition, needed: int) -> bool:
+    """Check whether at least `needed` free cells are reachable from a cell."""
+    seen = {start}
+    frontier = [start]
+    while frontier and len(seen) < needed:
+        cell = frontier.pop()
+        for delta in _DELTAS:
+            neighbour = MapPosition(cell.row + delta.row, cell.column + delta.column)
+            if neighbour not in seen and not arena.is_blocked(neighbour):
+                seen.add(neighbour)
+                frontier.append(neighbour)
+    return len(seen) >= needed
+
+
+def random_policy(arena: Arena, player_id: str) -> Direction:
+    """Move in a random direction that does not die immediately."""
+    directions = _safe_directions(arena, player_id)
+    if not directions:
+        return arena.snakes[player_id].direction
+    return arena.rng.choice(directions)
+
+
+def greedy_policy(arena: Arena, player_id: str) -> Direction:
+    """Head for the nearest food, avoiding only immediate death."""
+    snake = arena.snakes[player_id]
+    directions = _safe_directions(arena, player_id)
+    if not directions:
+        return snake.direction
+    # Keeping the current heading wins ties, so the bot does not zigzag
+    return min(
+        directions,
+        key=lambda direction: (
+            _food_distance(arena, arena.next_cell(snake.head, direction)),
+            direction != snake.direction,
+        ),
+    )
+
+
+def cautious_policy(arena: Arena, player_id: str) -> Direction:
+    """Head for food, but never into a pocket too small for the body."""
+    snake = arena.snakes[player_id]
+    directions = _safe_directions(arena, player_id)
+    if len(directions) < 2:
+        return directions[0] if directions else snake.direction
+    needed = min(len(snake.body) + 1, _FLOOD_LIMIT)
+    return min(
+        directions,
+        key=lambda direction: (
+            not _has_room(arena, arena.next_cell(snake.head, direction), needed),
+            _food_distance(arena, arena.next_cell(snake.head, direction)),
+            direction != snake.direction,
+        ),
+    )
+
+
+# Built-in policies by name
+POLICIES: Dict[str, Policy] = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    "cautious": cautious_policy,
+}
+
+
+def resolve_policy(name: str) -> Policy:
+    """Get a policy by built-in name or ``module:function`` path.
+
+    Raises:
+        TournamentError: If the policy cannot be found
+    """
+    if name in POLICIES:
+        return POLICIES[name]
+    module_name, _, attribute = name.partition(":")
+    if not attribute:
+        raise TournamentError(f"Unknown policy {name!r}; use one of {sorted(POLICIES)} or module:function")
+    try:
+        policy = getattr(importlib.import_module(module_name), attribute)
+    except (ImportError, AttributeError) as e:
+        raise TournamentError(f"Cannot load policy {name!r}: {e}") from e
+    if not callable(policy):
+        raise TournamentError(f"Policy {name!r} is not callable")
+    return policy
+
+
+def match_seed(match: Match) -> int:
+    """Get the arena seed of a match; stable across runs and processes."""
+    return zlib.crc32(match.key.encode("utf-8"))
+
+
+def schedule_matches(
+    policies: Sequence[str],
+    maps: Dict[str, MapGrid],
+    seeds: Iterable[int],
+    ticks: int = DEFAULT_TICKS,
+    food_count: int = 1,
+) -> List[Match]:
+    """List every matchup of a round-robin tournament.
+
+    Each pair of policies meets once per map and seed. Spawn order
+    alternates with the seed, so neither side keeps the first pick.
+    """
+    seeds = list(seeds)
+    matches = []
+    for map_name, map_data in maps.items():
+        map_hash = map_content_hash(map_data)
+        for first, second in combinations(policies, 2):
+            for seed in seeds:
+                players = (first, second) if seed % 2 == 0 else (second, first)
+                matches.append(Match(map_name, players, seed, ticks, food_count, map_hash))
+    return matches
+
+
+def play_match(
+    match: Match,
+    map_data: MapGrid,
+    compiled: Optional[CompiledMap] = None,
+) -> Dict[str, Any]:
+    """Play one match to the end.
+
+    Returns:
+        The match result: key, map, players and, per player in the same
+        order, food eaten, deaths and best score
+
+    Raises:
+        ArenaError: If the map is unusable
+        TournamentError: If a policy cannot be found
+    """
+    adapter = GameFrameworkAdapter(ScoringEngine())
+    arena = Arena(map_data, adapter, food_count=match.food_count, seed=match_seed(match), compiled=compiled)
+    for player_id in match.players:
+        arena.add_snake(player_id, resolve_policy(player_id))
+
+    snakes = [arena.snakes[player_id] for player_id in match.players]
+    food = [0] * len(snakes)
+    deaths = [0] * len(snakes)
+    best = [0.0] * len(snakes)
+    for _ in range(match.ticks):
+        lengths = [len(snake.body) for snake in snakes]
+        dead = set(arena.tick())
+        for index, snake in enumerate(snakes):
+            if snake.player_id in dead:
+                deaths[index] += 1
+            elif 0 < lengths[index] < len(snake.body):
+                food[index] += 1
+                best[index] = max(best[index], adapter.get_player_score(snake.player_id))
+
+    return {
+        "key": match.key,
+        "map": match.map_name,
+        "players": list(match.players),
+        "food": food,
+        "deaths": deaths,
+        "best": best,
+    }
+
+
+# Map pool, per worker process
+_worker_maps: Dict[str, MapGrid] = {}
+_worker_compiled: Dict[str, CompiledMap] = {}
+
+
+def _init_worker(maps: Dict[str, MapGrid]) -> None:
+    """Receive the map pool once per worker process."""
+    _worker_maps.clear()
+    _worker_maps.update(maps)
+    _worker_compiled.clear()
+
+
+def _play_batch(matches: List[Match]) -> List[Dict[str, Any]]:
+    """Play a batch of matches in a worker, compiling each map only once."""
+    results = []
+    for match in matches:
+        compiled = _worker_compiled.get(match.map_name)
+        if compiled is None:
+            compiled = _worker_compiled[match.map_name] = CompiledMap.from_map(_worker_maps[match.map_name])
+        results.append(play_match(match, _worker_maps[match.map_name], compiled))
+    return results
+
+
+class Checkpoint:
+    """Append-only JSON lines file of finished match results.
+
+    Each line is written and flushed as soon as its match ends, so at most
+    the line being written is lost when a run is interrupted; such a torn
+    line is skipped when the file is read back.
+    """
+
+    def __init__(self, path: FilePath) -> None:
+        """Open a checkpoint, creating it if needed.
+
+        Raises:
+            OSError: If the file cannot be opened
+        """
+        self.path = Path(path)
+        self.results: Dict[str, Dict[str, Any]] = {}
+        if self.path.is_file():
+            with self.path.open("rb") as stream:
+                content = stream.read()
+            for line in content.splitlines():
+                try:
+                    result = json.loads(line)
+                    self.results[result["key"]] = result
+                except (ValueError, KeyError, TypeError):
+                    continue
+        else:
+            content = b""
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._stream = self.path.open("a", encoding="utf-8")
+        if content and not content.endswith(b"\n"):
+            # Start after the torn line instead of continuing it
+            self._stream.write("\n")
+
+    def add(self, result: Dict[str, Any]) -> None:
+        """Record a finished match."""
+        self.results[result["key"]] = result
+        self._stream.write(json.dumps(result, separators=(",", ":")) + "\n")
+        self._stream.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        self._stream.close()
+
+
+def run_matches(
+    matches: List[Match],
+    maps: Dict[str, MapGrid],
+    checkpoint: Checkpoint,
+    workers: Optional[int] = None,
+    progress: bool = False,
+) -> None:
+    """Play every match not yet in the checkpoint, recording each result.
+
+    Args:
+        matches: Matches to play
+        maps: Map pool by name
+        checkpoint: Where finished matches are recorded and read from
+        workers: Worker processes; defaults to one per CPU, and 1 plays
+            in this process
+        progress: Whether to report progress on stderr
+    """
+    pending = [match for match in matches if match.key not in checkpoint.results]
+    if not pending:
+        return
+    workers = workers or os.cpu_count() or 1
+    total = len(pending)
+    finished = 0
+    step = max(1, total // 20)
+
+    def record(results: List[Dict[str, Any]]) -> None:
+        nonlocal finished
+        for result in results:
+            checkpoint.add(result)
+        reported = finished // step
+        finished += len(results)
+        if progress and (finished // step != reported or finished == total):
+            print(f"{finished}/{total} matches", file=sys.stderr)
+
+    if workers == 1:
+        _init_worker(maps)
+        for match in pending:
+            record(_play_batch([match]))
+        return
+
+    # Small batches keep every worker busy to the end while amortizing the
+    # cost of sending work between processes
+    size = max(1, min(64, total // (workers * 8)))
+    batches = [pending[start:start + size] for start in range(0, total, size)]
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(maps,)) as pool:
+        running = {pool.submit(_play_batch, batch) for batch in batches}
+        try:
+            while running:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record(future.result())
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
+
+
+def _outcomes(result: Dict[str, Any]) -> List[float]:
+    """Get each player's match score: 1 for the most food, 0.5 per shared first place."""
+    food = result["food"]
+    most = max(food)
+    winners = food.count(most)
+    return [1.0 / winners if eaten == most else 0.0 for eaten in food]
+
+
+def elo_ratings(results: Iterable[Dict[str, Any]], k: float = ELO_K) -> Dict[str, float]:
+    """Rate the policies from two-player results, in the order given."""
+    ratings: Dict[str, float] = {}
+    for result in results:
+        first, second = result["players"]
+        rating_a = ratings.setdefault(first, INITIAL_RATING)
+        rating_b = ratings.setdefault(second, INITIAL_RATING)
+        expected = 1.0 / (1.0 + 10 ** ((rating_b - rating_a) / 400))
+        change = k * (_outcomes(result)[0] - expected)
+        ratings[first] = rating_a + change
+        ratings[second] = rating_b - change
+    return ratings
+
+
+def _empty_stats() -> Dict[str, float]:
+    """Get zeroed statistics for one policy."""
+    return {"matches": 0, "wins": 0, "draws": 0, "losses": 0, "food": 0, "deaths": 0, "best": 0.0}
+
+
+def tournament_stats(results: Iterable[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, float]], Dict[str, Dict[str, Dict[str, float]]]]:
+    """Total up the results per policy, overall and per map.
+
+    Returns:
+        Statistics per policy, and per map the statistics per policy
+    """
+    overall: Dict[str, Dict[str, float]] = {}
+    per_map: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for result in results:
+        outcomes = _outcomes(result)
+        for index, player in enumerate(result["players"]):
+            for stats in (
+                overall.setdefault(player, _empty_stats()),
+                per_map.setdefault(result["map"], {}).setdefault(player, _empty_stats()),
+            ):
+                stats["matches"] += 1
+                if outcomes[index] == 1.0:
+                    stats["wins"] += 1
+                elif outcomes[index]:
+                    stats["draws"] += 1
+                else:
+                    stats["losses"] += 1
+                stats["food"] += result["food"][index]
+                stats["deaths"] += result["deaths"][index]
+                stats["best"] = max(stats["best"], result["best"][index])
+    return overall, per_map
+
+
+def _format_header(with_rating: bool) -> str:
+    """Format the header line of a results table."""
+    rating_text = f"{'rating':>7}  " if with_rating else ""
+    return (
+        f"  {'policy':<20} {rating_text}{'wins':>6} {'draws':>6} {'losses':>6}"
+        f" {'food/m':>8} {'death/m':>8} {'best':>6}"
+    )
+
+
+def _format_row(name: str, stats: Dict[str, float], rating: Optional[float] = None) -> str:
+    """Format one line of a results table."""
+    matches = stats["matches"] or 1
+    rating_text = f"{rating:7.1f}  " if rating is not None else ""
+    return (
+        f"  {name:<20} {rating_text}{stats['wins']:>6} {stats['draws']:>6} {stats['losses']:>6}"
+        f" {stats['food'] / matches:>8.2f} {stats['deaths'] / matches:>8.2f} {stats['best']:>6g}"
+    )
+
+
+def build_map_pool(
+    map_files: Sequence[str],
+    styles: Sequence[str],
+    map_seeds: int,
+    map_size: Optional[Tuple[int, int]] = None,
+) -> Dict[str, MapGrid]:
+    """Load map files and generate maps into a pool keyed by map name.
+
+    Files are named by their stem and generated maps by style and seed.
+
+    Raises:
+        TournamentError: If a map cannot be loaded or generated
+    """
+    maps: Dict[str, MapGrid] = {}
+    for path in map_files:
+        try:
+            map_data = load_map(path)
+            CompiledMap.from_map(map_data)
+        except (SerializationError, MapCompileError) as e:
+            raise TournamentError(f"Cannot use map {path}: {e}") from e
+        maps[Path(path).stem] = map_data
+
+    square_size = DEFAULT_CONFIG["SQUARE_SIZE"]
+    rows, cols = map_size or (
+        DEFAULT_CONFIG["SCREEN_HEIGHT"] // square_size,
+        DEFAULT_CONFIG["SCREEN_WIDTH"] // square_size,
+    )
+    cache = MapCache()
+    for style in styles:
+        for seed in range(map_seeds):
+            try:
+                maps[f"{style}-{seed}"] = cache.get(MapParams(style, rows, cols, seed))
+            except MapValidationError as e:
+                raise TournamentError(f"Cannot generate {style} map {seed}: {e}") from e
+    return maps
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run a tournament from the command line."""
+    parser = argparse.ArgumentParser(description="Super PySnake bot tournament")
+    parser.add_argument(
+        "--policies", nargs="+", default=sorted(POLICIES),
+        help="Built-in policy names or module:function paths",
+    )
+    parser.add_argument("--maps", nargs="*", default=None, help="Map files in the pool")
+    parser.add_argument("--generate", nargs="+", choices=MAP_STYLES, default=(), help="Add generated maps of these styles")
+    parser.add_argument("--map-seeds", type=int, default=1, help="Generated maps per style")
+    parser.add_argument("--map-size", type=int, nargs=2, metavar=("ROWS", "COLS"))
+    parser.add_argument("--seeds", type=int, default=10, help="Matches per pairing and map")
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS, help="Ticks per match")
+    parser.add_argument("--food", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes; one per CPU by default")
+    parser.add_argument("--checkpoint", default=str(DEFAULT_CHECKPOINT))
+    parser.add_argument("--json", help="Also write ratings and statistics to this file")
+    args = parser.parse_args(argv)
+
+    if len(set(args.policies)) < 2:
+        parser.error("at least two different policies are needed")
+    policies = list(dict.fromkeys(args.policies))
+    map_files = args.maps if args.maps is not None else (
+        [] if args.generate else [DEFAULT_CONFIG["DEFAULT_MAP_FILE"]]
+    )
+    try:
+        for name in policies:
+            resolve_policy(name)
+        maps = build_map_pool(map_files, args.generate, args.map_seeds, args.map_size)
+    except TournamentError as e:
+        parser.error(str(e))
+    if not maps:
+        parser.error("the map pool is empty")
+
+    matches = schedule_matches(policies, maps, range(args.seeds), args.ticks, args.food)
+    checkpoint = Checkpoint(args.checkpoint)
+    resumed = sum(match.key in checkpoint.results for match in matches)
+    print(f"{len(matches)} matches on {len(maps)} maps, {resumed} already played", file=sys.stderr)
+    started = time.perf_counter()
+    try:
+        run_matches(matches, maps, checkpoint, args.workers, progress=True)
+    except KeyboardInterrupt:
+        print(f"Interrupted; rerun with --checkpoint {args.checkpoint} to resume", file=sys.stderr)
+        return
+    finally:
+        checkpoint.close()
+    print(f"Played {len(matches) - resumed} matches in {time.perf_counter() - started:.1f} s", file=sys.stderr)
+
+    results = [checkpoint.results[match.key] for match in matches]
+    ratings = elo_ratings(results)
+    overall, per_map = tournament_stats(results)
+
+    print("Ratings")
+    print(_format_header(True))
+    for name in sorted(ratings, key=ratings.get, reverse=True):
+        print(_format_row(name, overall[name], ratings[name]))
+    for map_name in sorted(per_map):
+        print(f"\nMap {map_name}")
+        print(_format_header(False))
+        for name in sorted(per_map[map_name], key=lambda name: -per_map[map_name][name]["wins"]):
+            print(_format_row(name, per_map[map_name][name]))
+
+    if args.json:
+        report = Serializable()
+        report.data = {"ratings": ratings, "policies": overall, "maps": per_map}
+        try:
+            report.write(args.json, PRETTY_JSON)
+        except SerializationError as e:
+            print(f"Cannot write {args.json}: {e}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
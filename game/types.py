@@ -35,16 +35,28 @@ class TextureConfig(TypedDict):
     BRICK: str
 
 
+class TelemetryConfig(TypedDict):
+    """Telemetry recording configuration."""
+    LEVEL: str
+    FILE: str
+    MAX_BYTES: int
+    BACKUPS: int
+    SAMPLE_EVERY: int
+
+
 class GameConfig(TypedDict):
     """Complete game configuration structure matching original config.txt."""
     SCREEN_WIDTH: int
     SCREEN_HEIGHT: int
+    RENDER_SCALE: float
     SQUARE_SIZE: int
     GAME_SPEED: float
+    MAX_FPS: float
     FULLSCREEN: bool
     LOCKED_MOUSE: bool
     DEFAULT_MAP_FILE: str
     TEXTURES: TextureConfig
+    TELEMETRY: TelemetryConfig
 
 
 # Map Types
@@ -54,6 +66,18 @@ class MapPosition(NamedTuple):
     column: int
 
 
+class MapParams(NamedTuple):
+    """Parameters of a procedurally generated map."""
+    style: str
+    rows: int
+    cols: int
+    seed: int
+    density: float = 0.2
+    rooms: int = 12
+    braid: float = 0.5
+    spawn_radius: int = 2
+
+
 # Type aliases for clarity
 MapGrid: TypeAlias = List[List[int]]
 PositionGrid: TypeAlias = List[List[Position]]
@@ -94,6 +118,29 @@ class SnakeSegment(NamedTuple):
 # Constants
 TILE_EMPTY = 0
 TILE_WALL = 1
+# Only placed at runtime; map files hold walls and empty tiles
+TILE_PORTAL = 2
+
+# Grid offsets (row, column) for each direction; rows grow downwards
+DIRECTION_DELTAS: Dict[Direction, MapPosition] = {
+    Direction.NORTH: MapPosition(row=-1, column=0),
+    Direction.SOUTH: MapPosition(row=1, column=0),
+    Direction.WEST: MapPosition(row=0, column=-1),
+    Direction.EAST: MapPosition(row=0, column=1),
+}
+
+OPPOSITE_DIRECTIONS: Dict[Direction, Direction] = {
+    Direction.NORTH: Direction.SOUTH,
+    Direction.SOUTH: Direction.NORTH,
+    Direction.WEST: Direction.EAST,
+    Direction.EAST: Direction.WEST,
+}
+
+# Styles understood by the procedural map generator
+MAP_STYLES = ("scatter", "maze", "rooms")
+
+# Points awarded for each food eaten
+FOOD_POINTS = 10
 
 # Default starting position (from original code)
 DEFAULT_SNAKE_POSITION = MapPosition(row=11, column=15)
@@ -102,8 +149,11 @@ DEFAULT_SNAKE_POSITION = MapPosition(row=11, column=15)
 DEFAULT_CONFIG: GameConfig = {
     "SCREEN_WIDTH": 1024,
     "SCREEN_HEIGHT": 768,
+    # Internal resolution relative to the logical one; lower is cheaper
+    "RENDER_SCALE": 1.0,
     "SQUARE_SIZE": 32,
     "GAME_SPEED": 0.1,
+    "MAX_FPS": 60,
     "FULLSCREEN": False,
     "LOCKED_MOUSE": True,
     "DEFAULT_MAP_FILE": "assets/maps/default.json",
@@ -112,6 +162,13 @@ DEFAULT_CONFIG: GameConfig = {
         "SNAKE": "assets/gfx/snake.png",
         "FOOD": "assets/gfx/food.png",
         "BRICK": "assets/gfx/brick.png"
+    },
+    "TELEMETRY": {
+        "LEVEL": "events",
+        "FILE": ".data/telemetry.bin",
+        "MAX_BYTES": 1024 * 1024,
+        "BACKUPS": 3,
+        "SAMPLE_EVERY": 10
     }
 }
 
@@ -122,10 +179,14 @@ class GameError(Exception):
 
 
 class MapSizeError(GameError):
-    """Raised when map size doesn't match screen resolution."""
+    """Raised when a map doesn't match the size of the board in play."""
     pass
 
 
 class AssetNotFoundError(GameError):
     """Raised when a required game asset is missing."""
-    pass
\ No newline at end of file
+    pass
+
+class ConfigValueError(GameError):
+    """Raised when a configuration setting has the wrong type or value."""
+    pass
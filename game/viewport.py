@@ -0,0 +1,180 @@
+"""
+Fixed logical-resolution rendering, scaled to whatever size the window is.
+
+The game draws in logical pixels: the board is rows x columns square cells
+fitted into the configured screen size, and the HUD is laid out over it.
+Each frame is drawn into an offscreen framebuffer of that logical size,
+never larger than the GL allows for a texture, which is then stretched onto
+the window keeping its aspect ratio, with black bars where the shapes
+differ. The window can be resized or made fullscreen at any resolution
+without touching the map, and a render scale below 1 shades fewer pixels
+per frame on machines that cannot hold the frame rate otherwise.
+"""
+from contextlib import contextmanager
+from typing import Any, Iterator, Tuple
+
+import numpy as np
+from pyglet import gl
+from pyglet.image import Texture
+from pyglet.image.buffer import Framebuffer
+from pyglet.math import Mat4
+from pyglet.sprite import Sprite
+
+# Near and far planes of the 2D projections, as pyglet uses for windows
+_DEPTH_RANGE = (-8192, 8192)
+
+
+class ScaledViewport:
+    """Offscreen framebuffer of a fixed logical size, presented scaled.
+
+    Attributes:
+        logical_width: Width everything is laid out in, in logical pixels
+        logical_height: Height everything is laid out in, in logical pixels
+        scale: Framebuffer pixels per logical pixel, as requested; the
+            framebuffer is shrunk further if it would not fit in a texture
+        max_texture_size: Largest texture side the GL supports
+    """
+
+    def __init__(self, window: Any, width: int, height: int, scale: float = 1.0) -> None:
+        """Create the framebuffer.
+
+        Args:
+            window: pyglet window to present on
+            width: Logical width
+            height: Logical height
+            scale: Framebuffer pixels per logical pixel; below 1 renders at
+                a reduced internal resolution
+        """
+        self.window = window
+        self.logical_width = width
+        self.logical_height = height
+        self.scale = scale
+        size = gl.GLint()
+        gl.glGetIntegerv(gl.GL_MAX_TEXTURE_SIZE, size)
+        self.max_texture_size = size.value
+        self._framebuffer = Framebuffer()
+        self._texture: Any = None
+        self._sprite: Any = None
+        self._allocate()
+
+    @property
+    def framebuffer_size(self) -> Tuple[int, int]:
+        """Size of the offscreen framebuffer, in pixels.
+
+        The logical size times the scale, capped to the largest texture the
+        GL can allocate while keeping the aspect ratio.
+        """
+        limit = self.max_texture_size
+        scale = min(self.scale, limit / self.logical_width, limit / self.logical_height)
+        return (
+            min(limit, max(1, round(self.logical_width * scale))),
+            min(limit, max(1, round(self.logical_height * scale))),
+        )
+
+    def _allocate(self) -> None:
+        """(Re)create the color texture at the current size and scale."""
+        width, height = self.framebuffer_size
+        texture = Texture.create(width, height, min_filter=gl.GL_LINEAR, mag_filter=gl.GL_LINEAR)
+        self._framebuffer.attach_texture(texture)
+        if self._sprite is None:
+            # Copied as is: the frame was already blended when it was drawn
+            self._sprite = Sprite(texture, blend_src=gl.GL_ONE, blend_dest=gl.GL_ZERO)
+        else:
+            self._sprite.image = texture
+        if self._texture is not None:
+            self._texture.delete()
+        self._texture = texture
+
+    def resize(self, width: int, height: int) -> None:
+        """Change the logical size, e.g. for a map of another size."""
+        if (width, height) == (self.logical_width, self.logical_height):
+            return
+        self.logical_width = width
+        self.logical_height = height
+        self._allocate()
+
+    def set_scale(self, scale: float) -> None:
+        """Change the internal resolution relative to the logical one."""
+        if scale == self.scale:
+            return
+        self.scale = scale
+        self._allocate()
+
+    def letterbox(self) -> Tuple[float, float, float, float]:
+        """Get the area of the window the frame is shown in.
+
+        Returns:
+            x, y, width and height in window coordinates
+        """
+        window_width, window_height = self.window.get_size()
+        factor = min(window_width / self.logical_width, window_height / self.logical_height)
+        width = self.logical_width * factor
+        height = self.logical_height * factor
+        return (window_width - width) / 2, (window_height - height) / 2, width, height
+
+    def to_logical(self, x: float, y: float) -> Tuple[float, float]:
+        """Convert window coordinates, e.g. of the mouse, to logical ones."""
+        left, bottom, width, height = self.letterbox()
+        return (
+            (x - left) * self.logical_width / width,
+            (y - bottom) * self.logical_height / height,
+        )
+
+    @contextmanager
+    def render(self) -> Iterator[None]:
+        """Draw a frame: everything drawn in the block uses logical pixels.
+
+        On leaving the block the frame is scaled onto the window.
+        """
+        width, height = self.framebuffer_size
+        self._framebuffer.bind()
+        gl.glViewport(0, 0, width, height)
+        self.window.projection = Mat4.orthogonal_projection(
+            0, self.logical_width, 0, self.logical_height, *_DEPTH_RANGE
+        )
+        try:
+            yield
+        finally:
+            self._framebuffer.unbind()
+            self.present()
+
+    def present(self) -> None:
+        """Show the last frame on the window, letterboxed."""
+        window = self.window
+        gl.glViewport(0, 0, *window.get_framebuffer_size())
+        window_width, window_height = window.get_size()
+        window.projection = Mat4.orthogonal_projection(0, window_width, 0, window_height, *_DEPTH_RANGE)
+        window.clear()
+
+        x, y, width, height = self.letterbox()
+        texture_width, texture_height = self.framebuffer_size
+        sprite = self._sprite
+        sprite.position = (x, y, 0)
+        sprite.scale_x = width / texture_width
+        sprite.scale_y = height / texture_height
+        sprite.draw()
+
+    def capture(self) -> np.ndarray:
+        """Copy the last frame out of the framebuffer.
+
+        The frame is read at the framebuffer's own resolution, unaffected by
+        the window size or letterboxing, and stays readable after the window
+        buffers are flipped.
+
+        Returns:
+            RGBA pixels, shape (height, width, 4), top row first
+        """
+        width, height = self.framebuffer_size
+        pixels = (gl.GLubyte * (width * height * 4))()
+        self._framebuffer.bind()
+        try:
+            gl.glReadPixels(0, 0, width, height, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, pixels)
+        finally:
+            self._framebuffer.unbind()
+        return np.frombuffer(pixels, dtype=np.uint8).reshape(height, width, 4)[::-1].copy()
+
+    def delete(self) -> None:
+        """Free the framebuffer and its texture."""
+        self._sprite.delete()
+        self._texture.delete()
+        self._framebuffer.delete()
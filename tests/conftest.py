@@ -0,0 +1,21 @@
+"""Shared fixtures for the test suite."""
+import pytest
+
+
+class FakeClock:
+    """Clock stand-in recording what is scheduled on it."""
+
+    def __init__(self):
+        self.scheduled = {}
+
+    def schedule_interval(self, callback, interval):
+        self.scheduled[callback] = interval
+
+    def unschedule(self, callback):
+        self.scheduled.pop(callback, None)
+
+
+@pytest.fixture
+def fake_clock():
+    """A clock that only records schedule_interval and unschedule calls."""
+    return FakeClock()
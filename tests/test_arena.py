@@ -0,0 +1,54 @@
+"""Tests for the headless multi-snake arena in game.arena."""
+import pytest
+from pyscored.adapters import GameFrameworkAdapter
+from pyscored.core.scoring_engine import ScoringEngine
+
+from game.arena import Arena, ArenaError
+from game.tournament import resolve_policy
+
+# 3x4 interior: small enough for two bots to fill it within a few ticks
+CRAMPED_MAP = [[1] * 6] + [[1, 0, 0, 0, 0, 1] for _ in range(3)] + [[1] * 6]
+
+
+def make_arena(food_count=1, seed=0):
+    return Arena(
+        CRAMPED_MAP,
+        GameFrameworkAdapter(ScoringEngine()),
+        food_count=food_count,
+        seed=seed,
+        record_deltas=True,
+    )
+
+
+def test_food_that_does_not_fit_is_left_out():
+    arena = make_arena(food_count=20)
+    assert len(arena.food) == 12
+    with pytest.raises(ArenaError):
+        arena.add_snake("late")
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_full_board_never_stops_the_simulation(seed):
+    arena = make_arena(food_count=2, seed=seed)
+    for player_id in ("greedy", "cautious"):
+        arena.add_snake(player_id, resolve_policy(player_id))
+    for _ in range(200):
+        arena.tick()
+        arena.take_delta()
+        used = sum(len(snake.body) for snake in arena.snakes.values()) + len(arena.food)
+        assert used <= 12
+        for snake in arena.snakes.values():
+            assert (not snake.body) == (snake.player_id in arena.waiting)
+
+
+def test_waiting_snake_respawns_once_a_cell_frees_up():
+    arena = make_arena(food_count=0)
+    snake = arena.add_snake("a")
+    arena._kill(snake)
+    assert arena.waiting == {"a"}
+    assert arena.take_delta().spawns["a"] == []
+
+    arena.tick()
+    assert arena.waiting == set()
+    assert len(snake.body) == 1
+    assert arena.take_delta().spawns["a"] == list(snake.body)
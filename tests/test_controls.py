@@ -0,0 +1,56 @@
+"""Tests for the buffered direction input in game.controls."""
+from game.controls import InputQueue
+from game.types import Direction
+
+
+def test_two_quick_turns_are_both_kept():
+    queue = InputQueue()
+    assert queue.push(Direction.NORTH, Direction.EAST)
+    # WEST reverses the current EAST, but not the queued NORTH
+    assert queue.push(Direction.WEST, Direction.EAST)
+    assert queue.pop(Direction.EAST) == Direction.NORTH
+    assert queue.pop(Direction.NORTH) == Direction.WEST
+    assert queue.pop(Direction.WEST) == Direction.WEST
+    assert queue.rejected == 0
+
+
+def test_reversal_of_last_queued_direction_is_rejected():
+    queue = InputQueue()
+    assert queue.push(Direction.NORTH, Direction.EAST)
+    assert not queue.push(Direction.SOUTH, Direction.EAST)
+    assert queue.rejected == 1
+    assert len(queue) == 1
+
+
+def test_reversal_and_repeat_of_current_direction_are_rejected():
+    queue = InputQueue()
+    assert not queue.push(Direction.WEST, Direction.EAST)
+    assert not queue.push(Direction.EAST, Direction.EAST)
+    assert queue.rejected == 2
+    assert queue.pop(Direction.EAST) == Direction.EAST
+
+
+def test_overflow_is_rejected():
+    queue = InputQueue(size=2)
+    assert queue.push(Direction.NORTH, Direction.EAST)
+    assert queue.push(Direction.WEST, Direction.EAST)
+    assert not queue.push(Direction.SOUTH, Direction.EAST)
+    assert len(queue) == 2
+    assert queue.rejected == 1
+
+
+def test_pop_skips_a_press_that_became_a_reversal():
+    queue = InputQueue()
+    assert queue.push(Direction.NORTH, Direction.EAST)
+    # The snake turned SOUTH some other way (e.g. a restore) before the tick
+    assert queue.pop(Direction.SOUTH) == Direction.SOUTH
+    assert queue.rejected == 1
+
+
+def test_applied_records_latency_once():
+    queue = InputQueue()
+    queue.push(Direction.NORTH, Direction.EAST)
+    queue.pop(Direction.EAST)
+    queue.applied()
+    queue.applied()
+    assert queue.latency.count == 1
@@ -0,0 +1,75 @@
+"""Tests for the vectorized region labelling in game.mapcompiler."""
+from collections import deque
+
+import numpy as np
+import pytest
+
+from game.mapcompiler import label_regions
+
+
+def bfs_regions(free: np.ndarray) -> np.ndarray:
+    """Label 4-connected regions by flood fill, numbered in row-major order."""
+    rows, cols = free.shape
+    labels = np.full((rows, cols), -1, dtype=np.int32)
+    region = 0
+    for row in range(rows):
+        for col in range(cols):
+            if not free[row, col] or labels[row, col] >= 0:
+                continue
+            labels[row, col] = region
+            queue = deque([(row, col)])
+            while queue:
+                r, c = queue.popleft()
+                for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                    if 0 <= nr < rows and 0 <= nc < cols and free[nr, nc] and labels[nr, nc] < 0:
+                        labels[nr, nc] = region
+                        queue.append((nr, nc))
+            region += 1
+    return labels
+
+
+def test_separate_rooms_get_separate_labels():
+    free = np.array(
+        [
+            [1, 1, 0, 1],
+            [0, 1, 0, 1],
+            [1, 0, 0, 1],
+        ],
+        dtype=bool,
+    )
+    assert label_regions(free).tolist() == [
+        [0, 0, -1, 1],
+        [-1, 0, -1, 1],
+        [2, -1, -1, 1],
+    ]
+
+
+def test_runs_joined_through_a_winding_path():
+    # Each row's run only meets the next through one column, so joining
+    # them takes several hooking rounds.
+    free = np.array(
+        [
+            [1, 1, 1, 1, 1],
+            [0, 0, 0, 0, 1],
+            [1, 1, 1, 1, 1],
+            [1, 0, 0, 0, 0],
+            [1, 1, 1, 1, 1],
+        ],
+        dtype=bool,
+    )
+    labels = label_regions(free)
+    assert set(labels[free].tolist()) == {0}
+    assert (labels[~free] == -1).all()
+
+
+def test_all_walls():
+    assert (label_regions(np.zeros((3, 4), dtype=bool)) == -1).all()
+
+
+@pytest.mark.parametrize("density", [0.3, 0.5, 0.7])
+def test_matches_flood_fill_on_random_grids(density):
+    rng = np.random.default_rng(int(density * 10))
+    for _ in range(50):
+        rows, cols = rng.integers(1, 24, size=2)
+        free = rng.random((rows, cols)) < density
+        np.testing.assert_array_equal(label_regions(free), bfs_regions(free))
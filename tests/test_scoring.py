@@ -0,0 +1,118 @@
+"""Tests for the batched score pipeline in game.scoring."""
+import pytest
+from pyscored.adapters import GameFrameworkAdapter
+from pyscored.core.scoring_engine import ScoringEngine
+
+from game.scoring import ScorePipeline
+
+
+class RecordingAdapter:
+    """Adapter stand-in that keeps scores in a dict and logs every call."""
+
+    def __init__(self):
+        self.scores = {}
+        self.calls = []
+
+    def setup_player(self, player_id, initial_score=0.0):
+        self.calls.append(("setup", player_id, initial_score))
+        self.scores[player_id] = initial_score
+
+    def update_player_score(self, player_id, points):
+        self.calls.append(("update", player_id, points))
+        self.scores[player_id] += points
+
+    def get_player_score(self, player_id):
+        return self.scores[player_id]
+
+
+@pytest.fixture
+def pipeline(fake_clock):
+    return ScorePipeline(RecordingAdapter(), clock=fake_clock)
+
+
+def test_updates_are_folded_into_one_call_per_player(pipeline):
+    pipeline.setup_player("a")
+    pipeline.setup_player("b", 5.0)
+    pipeline.flush()
+    pipeline.adapter.calls.clear()
+
+    for points in (1.0, 2.0, 3.0):
+        pipeline.update_player_score("a", points)
+    pipeline.update_player_score("b", -1.0)
+    snapshot = pipeline.flush()
+
+    assert pipeline.adapter.calls == [("update", "a", 6.0), ("update", "b", -1.0)]
+    assert dict(snapshot.scores) == {"a": 6.0, "b": 4.0}
+    assert pipeline.events_applied == 6
+    assert pipeline.engine_calls == 4
+
+
+def test_set_followed_by_additions_becomes_one_set(pipeline):
+    pipeline.setup_player("a")
+    pipeline.update_player_score("a", 10.0)
+    pipeline.setup_player("a", 2.0)
+    pipeline.update_player_score("a", 3.0)
+    pipeline.flush()
+    assert pipeline.adapter.calls == [("setup", "a", 5.0)]
+
+
+def test_reads_see_queued_events_but_snapshots_only_applied_ones(pipeline):
+    pipeline.setup_player("a")
+    pipeline.flush()
+    pipeline.update_player_score("a", 4.0)
+    assert pipeline.get_player_score("a") == 4.0
+    assert pipeline.reader.get_player_score("a") == 0.0
+    assert pipeline.pending == 1
+
+    pipeline.tick = 9
+    snapshot = pipeline.flush()
+    assert snapshot.tick == 9
+    assert pipeline.reader.get_player_score("a") == 4.0
+    assert snapshot.get_player_score("missing") == 0.0
+
+
+def test_unknown_player_is_rejected(pipeline):
+    with pytest.raises(ValueError):
+        pipeline.update_player_score("nobody", 1.0)
+
+
+def test_observers_only_hear_about_changes(pipeline):
+    seen = []
+    pipeline.observers.append(seen.append)
+    pipeline.setup_player("a")
+    pipeline.update_player_score("a", 1.0)
+    pipeline.flush()
+    pipeline.flush()  # nothing queued
+    pipeline.update_player_score("a", 1.0)
+    pipeline.update_player_score("a", -1.0)  # nets out to no change
+    pipeline.flush()
+
+    assert [dict(snapshot.scores) for snapshot in seen] == [{"a": 1.0}]
+
+
+def test_snapshots_are_immutable(pipeline):
+    pipeline.setup_player("a")
+    snapshot = pipeline.flush()
+    with pytest.raises(TypeError):
+        snapshot.scores["a"] = 100.0
+
+
+def test_start_schedules_and_stop_flushes(pipeline):
+    pipeline.start()
+    assert pipeline.clock.scheduled == {pipeline.flush: pipeline.interval}
+    pipeline.setup_player("a", 3.0)
+    pipeline.stop()
+    assert pipeline.clock.scheduled == {}
+    assert pipeline.pending == 0
+    assert pipeline.reader.get_player_score("a") == 3.0
+
+
+def test_matches_calling_pyscored_directly(fake_clock):
+    direct = GameFrameworkAdapter(ScoringEngine())
+    pipeline = ScorePipeline(GameFrameworkAdapter(ScoringEngine()), clock=fake_clock)
+    for adapter in (direct, pipeline):
+        adapter.setup_player(player_id="snake", initial_score=0.0)
+        for points in (1.0, 1.0, 2.5):
+            adapter.update_player_score("snake", points=points)
+    pipeline.flush()
+    assert pipeline.reader.get_player_score("snake") == direct.get_player_score("snake")
@@ -0,0 +1,125 @@
+"""Tests for the seqlock-protected shared board in game.sharedstate."""
+import threading
+
+import pytest
+
+from game.sharedstate import (
+    _SEQUENCE,
+    _SEQUENCE_OFFSET,
+    SharedBoard,
+    SharedBoardReader,
+    SharedStateError,
+)
+from game.types import Direction, MapPosition, TILE_EMPTY, TILE_WALL
+
+ROWS, COLS = 4, 5
+
+
+@pytest.fixture
+def board():
+    writer = SharedBoard(ROWS, COLS, max_body=6)
+    reader = SharedBoardReader(writer.name)
+    yield writer, reader
+    reader.close()
+    writer.close()
+
+
+def tiles_with_wall(index):
+    tiles = bytearray([TILE_EMPTY] * (ROWS * COLS))
+    tiles[index] = TILE_WALL
+    return bytes(tiles)
+
+
+def test_round_trip(board):
+    writer, reader = board
+    body = [MapPosition(1, 3), MapPosition(1, 2), MapPosition(1, 1)]
+    writer.publish(7, 12.5, Direction.EAST, body, MapPosition(2, 4), tiles_with_wall(0))
+
+    state = reader.read()
+    assert state.tick == 7
+    assert state.score == 12.5
+    assert state.direction == Direction.EAST
+    assert state.body == body
+    assert state.head == MapPosition(1, 3)
+    assert state.food == MapPosition(2, 4)
+    assert state.tiles == tiles_with_wall(0)
+    assert (state.rows, state.cols) == (ROWS, COLS)
+
+
+def test_tiles_are_kept_when_not_republished(board):
+    writer, reader = board
+    writer.publish(1, 0.0, Direction.NORTH, [MapPosition(2, 2)], MapPosition(0, 1), tiles_with_wall(3))
+    writer.publish(2, 0.0, Direction.NORTH, [MapPosition(1, 2)], MapPosition(0, 1))
+    state = reader.read()
+    assert state.tick == 2
+    assert state.tiles == tiles_with_wall(3)
+
+
+def test_body_is_cut_off_at_max_body(board):
+    writer, reader = board
+    body = [MapPosition(0, column) for column in range(COLS)] + [MapPosition(1, c) for c in range(COLS)]
+    writer.publish(1, 0.0, Direction.WEST, body, MapPosition(3, 3), tiles_with_wall(0))
+    assert reader.read().body == body[:6]
+
+
+def test_read_before_publish_fails(board):
+    _, reader = board
+    with pytest.raises(SharedStateError):
+        reader.read()
+
+
+def test_read_gives_up_while_a_write_is_in_progress(board):
+    writer, reader = board
+    writer.publish(1, 0.0, Direction.NORTH, [MapPosition(2, 2)], MapPosition(0, 1), tiles_with_wall(0))
+    # An odd sequence means the writer is half way through a tick
+    _SEQUENCE.pack_into(writer._buffer, _SEQUENCE_OFFSET, 3)
+    with pytest.raises(SharedStateError):
+        reader.read(attempts=5)
+    _SEQUENCE.pack_into(writer._buffer, _SEQUENCE_OFFSET, 4)
+    assert reader.read().tick == 1
+
+
+def test_actions_reach_the_writer_once(board):
+    writer, reader = board
+    assert writer.take_action() is None
+    reader.send_action(Direction.SOUTH)
+    assert writer.take_action() == Direction.SOUTH
+    assert writer.take_action() is None
+
+
+def test_attaching_to_a_missing_block_fails():
+    with pytest.raises(SharedStateError):
+        SharedBoardReader("super-pysnake-test-missing-block")
+
+
+def test_reads_are_never_torn(board):
+    writer, reader = board
+    stop = threading.Event()
+
+    def publish():
+        tick = 1
+        while not stop.is_set():
+            # Every field is derived from the tick, so a mix of two ticks shows
+            body = [MapPosition(tick % ROWS, column) for column in range(1 + tick % 5)]
+            food = MapPosition(tick % ROWS, tick % COLS)
+            tiles = tiles_with_wall(tick % (ROWS * COLS))
+            writer.publish(tick, float(tick), Direction(tick % 4), body, food, tiles)
+            tick += 1
+
+    writer.publish(0, 0.0, Direction.NORTH, [MapPosition(0, 0)], MapPosition(0, 0), tiles_with_wall(0))
+    thread = threading.Thread(target=publish)
+    thread.start()
+    try:
+        for _ in range(2000):
+            state = reader.read()
+            tick = state.tick
+            assert state.score == float(tick)
+            if tick:
+                assert state.direction == Direction(tick % 4)
+                assert len(state.body) == 1 + tick % 5
+                assert all(cell.row == tick % ROWS for cell in state.body)
+                assert state.food == MapPosition(tick % ROWS, tick % COLS)
+                assert state.tiles == tiles_with_wall(tick % (ROWS * COLS))
+    finally:
+        stop.set()
+        thread.join()
@@ -0,0 +1,43 @@
+"""Tests for the ring-buffered recorder in game.telemetry."""
+import threading
+
+import pytest
+
+from game.telemetry import EventKind, Telemetry, read_events
+
+
+@pytest.fixture
+def recorder(tmp_path):
+    telemetry = Telemetry(capacity=64)
+    telemetry.configure({
+        "LEVEL": "events",
+        "FILE": str(tmp_path / "telemetry.bin"),
+        "MAX_BYTES": 1 << 20,
+        "BACKUPS": 0,
+        "SAMPLE_EVERY": 1,
+    })
+    yield telemetry
+    telemetry.close()
+
+
+def test_thread_errors_bypass_the_ring(recorder):
+    thread = threading.Thread(target=recorder.thread_error, args=("disk full", 5))
+    thread.start()
+    thread.join()
+    assert recorder._head == 0
+
+    recorder.record(EventKind.DEATH, 6)
+    recorder.close()
+    events = list(read_events(recorder.path))
+    assert [(event.kind, event.tick) for event in events] == [
+        (EventKind.DEATH, 6),
+        (EventKind.ERROR, 5),
+    ]
+    sidecar = recorder.path.with_name("telemetry.bin.errors").read_text(encoding="utf-8")
+    assert sidecar.rstrip().endswith("disk full")
+
+
+def test_thread_errors_are_ignored_when_disabled():
+    telemetry = Telemetry()
+    telemetry.thread_error("ignored")
+    assert not telemetry._thread_errors
@@ -0,0 +1,88 @@
+"""Tests for the fixed-timestep accumulator in game.timestep."""
+import pytest
+
+from game.timestep import SPEED_STEPS, FixedTimestep
+
+
+@pytest.fixture
+def ticks():
+    return []
+
+
+@pytest.fixture
+def timestep(ticks, fake_clock):
+    return FixedTimestep(ticks.append, step=0.1, frame_time=0.02, clock=fake_clock)
+
+
+def test_one_tick_per_step_at_normal_speed(timestep, ticks):
+    assert timestep.advance(0.05) == 0
+    assert timestep.advance(0.05) == 1
+    assert timestep.advance(0.1) == 1
+    assert ticks == [0.1, 0.1]
+
+
+def test_sub_step_wakeups_add_up_without_drift(timestep):
+    # 0.1 is not exact in binary; 1000 frames of 1/60 s must still give 166
+    for _ in range(1000):
+        timestep.advance(1 / 60)
+    assert timestep.ticks == int(1000 / 60 / 0.1)
+
+
+def test_fast_forward_catches_up_in_one_wakeup(timestep, ticks):
+    timestep.configure(speed=20.0)
+    assert timestep.advance(0.05) == 10
+    assert len(ticks) == 10
+    assert all(step == 0.1 for step in ticks)
+
+
+def test_ticks_past_max_catch_up_are_dropped(ticks, fake_clock):
+    timestep = FixedTimestep(ticks.append, step=0.1, max_catch_up=5, clock=fake_clock)
+    assert timestep.advance(1.25) == 5
+    assert timestep.dropped == 7
+    # The dropped backlog is gone, but the partial step is kept
+    assert timestep.advance(0.05) == 1
+    assert timestep.ticks == 6
+
+
+def test_frame_rendered_reports_ticks_per_frame(timestep):
+    timestep.configure(speed=10.0)
+    timestep.advance(0.05)
+    timestep.advance(0.05)
+    assert timestep.frame_rendered() == 10
+    timestep.advance(0.02)
+    assert timestep.frame_rendered() == 2
+    assert timestep.frame_rendered() == 0
+    assert timestep.last_frame_ticks == 0
+    assert timestep.peak_frame_ticks == 10
+
+
+def test_interval_is_never_shorter_than_a_frame(timestep):
+    assert timestep.interval == pytest.approx(0.1)
+    timestep.configure(speed=100.0)
+    assert timestep.interval == pytest.approx(0.02)
+
+
+def test_start_and_configure_reschedule(timestep):
+    clock = timestep.clock
+    timestep.start()
+    assert clock.scheduled == {timestep.advance: pytest.approx(0.1)}
+    timestep.configure(speed=2.0)
+    assert clock.scheduled == {timestep.advance: pytest.approx(0.05)}
+    timestep.stop()
+    assert clock.scheduled == {}
+
+
+def test_stop_discards_partial_steps(timestep):
+    timestep.start()
+    timestep.advance(0.09)
+    timestep.stop()
+    timestep.start()
+    assert timestep.advance(0.02) == 0
+
+
+def test_speed_steps_clamp_at_both_ends(timestep):
+    speeds = [timestep.faster() for _ in SPEED_STEPS]
+    assert speeds == list(SPEED_STEPS[1:]) + [SPEED_STEPS[-1]]
+    for _ in SPEED_STEPS:
+        timestep.slower()
+    assert timestep.speed == SPEED_STEPS[0]
@@ -1,9 +1,15 @@
 """
 Provides serialization capabilities for game components.
 """
+import gzip
+import io
 import json
+import marshal
+import os
+import tempfile
+from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, TextIO, Union
+from typing import IO, Any, BinaryIO, Optional, Tuple
 
 from game.types import FilePath
 
@@ -23,70 +29,228 @@ class JSONSerializationError(SerializationError):
     pass
 
 
+class CodecError(SerializationError):
+    """Raised when a non-JSON codec cannot encode or decode data."""
+    pass
+
+
+class Codec(ABC):
+    """Base class for the on-disk formats Serializable can use.
+
+    Codecs read from and write to binary streams, so they can be stacked
+    (e.g. compression around JSON) and never need the whole encoded
+    payload in memory at once.
+    """
+
+    @abstractmethod
+    def dump(self, data: Any, stream: BinaryIO) -> None:
+        """Encode data into a binary stream."""
+
+    @abstractmethod
+    def load(self, stream: BinaryIO) -> Any:
+        """Decode data from a binary stream."""
+
+
+class JSONCodec(Codec):
+    """UTF-8 JSON, pretty-printed or compact."""
+
+    def __init__(self, indent: Optional[int] = None) -> None:
+        """Initialize the codec.
+
+        Args:
+            indent: Indentation for pretty output; None writes compact JSON
+        """
+        self.indent = indent
+        self.separators: Tuple[str, str] = (",", ": ") if indent else (",", ":")
+
+    def dump(self, data: Any, stream: BinaryIO) -> None:
+        """Stream JSON chunks into a binary stream."""
+        text = io.TextIOWrapper(stream, encoding="utf-8", write_through=True)
+        try:
+            json.dump(data, text, indent=self.indent, separators=self.separators)
+        except (TypeError, ValueError) as e:
+            raise JSONSerializationError(f"Failed to serialize data to JSON: {str(e)}") from e
+        finally:
+            text.detach()
+
+    def load(self, stream: BinaryIO) -> Any:
+        """Parse JSON from a binary stream."""
+        try:
+            return json.load(stream)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise JSONSerializationError(f"Failed to parse JSON: {str(e)}") from e
+
+
+class MarshalCodec(Codec):
+    """Fast binary format for plain data (numbers, strings, lists, dicts).
+
+    The marshal format may change between Python versions, so a header
+    records the version and stale files are rejected. Use it for caches
+    and other files that can be regenerated, not for shipped assets.
+    """
+
+    MAGIC = b"SPMB" + bytes([marshal.version])
+
+    def dump(self, data: Any, stream: BinaryIO) -> None:
+        """Write the header and marshalled data."""
+        try:
+            stream.write(self.MAGIC)
+            marshal.dump(data, stream)
+        except ValueError as e:
+            raise CodecError(f"Failed to marshal data: {str(e)}") from e
+
+    def load(self, stream: BinaryIO) -> Any:
+        """Check the header and read marshalled data."""
+        if stream.read(len(self.MAGIC)) != self.MAGIC:
+            raise CodecError("Not a marshal file for this Python version")
+        try:
+            return marshal.load(stream)
+        except (EOFError, ValueError, TypeError) as e:
+            raise CodecError(f"Failed to unmarshal data: {str(e)}") from e
+
+
+class GzipCodec(Codec):
+    """Gzip compression around another codec."""
+
+    def __init__(self, inner: Codec, level: int = 6) -> None:
+        """Initialize the codec.
+
+        Args:
+            inner: Codec producing the uncompressed payload
+            level: Compression level from 1 (fastest) to 9 (smallest)
+        """
+        self.inner = inner
+        self.level = level
+
+    def dump(self, data: Any, stream: BinaryIO) -> None:
+        """Compress the inner codec's output into the stream."""
+        with gzip.GzipFile(fileobj=stream, mode="wb", compresslevel=self.level) as packed:
+            self.inner.dump(data, packed)
+
+    def load(self, stream: BinaryIO) -> Any:
+        """Decompress the stream and decode it with the inner codec."""
+        try:
+            with gzip.GzipFile(fileobj=stream, mode="rb") as packed:
+                return self.inner.load(packed)
+        except (OSError, EOFError) as e:
+            raise CodecError(f"Failed to decompress data: {str(e)}") from e
+
+
+PRETTY_JSON = JSONCodec(indent=4)
+COMPACT_JSON = JSONCodec()
+MARSHAL = MarshalCodec()
+
+
 class Serializable:
-    """Base class for objects that can be serialized to and from JSON files.
-    
+    """Base class for objects that can be serialized to and from files.
+
     This class provides a consistent interface for saving and loading object
-    state to/from JSON files, with proper error handling and resource management.
-    
+    state, with proper error handling and resource management. The format
+    is chosen by the ``codec`` class attribute, and writes are atomic: data
+    goes to a temporary file that only replaces the target once complete.
+
     Attributes:
         data: The data to be serialized/deserialized
+        codec: Format used when no codec is passed explicitly
     """
-    
+
+    codec: Codec = PRETTY_JSON
+
     def __init__(self) -> None:
         """Initialize a new Serializable instance."""
         self.data: Any = None
-    
-    def serialize(self, path: FilePath, mode: str) -> TextIO:
+
+    def serialize(self, path: FilePath, mode: str) -> IO[Any]:
         """Open a file for serialization with proper error handling.
-        
+
         Args:
             path: Path to the file to open
-            mode: File open mode ('r', 'w', etc.)
-            
+            mode: File open mode ('r', 'w', 'rb', etc.)
+
         Returns:
             An open file handle
-            
+
         Raises:
             FileOperationError: If the file cannot be opened
         """
         try:
+            if "b" in mode:
+                return open(Path(path), mode)
             return open(Path(path), mode, encoding='utf-8')
         except (OSError, IOError) as e:
             raise FileOperationError(f"Failed to open file {path}: {str(e)}") from e
-    
-    def write(self, path: FilePath) -> None:
-        """Write the object's data to a JSON file.
-        
+
+    def write(self, path: FilePath, codec: Optional[Codec] = None) -> None:
+        """Atomically write the object's data to a file.
+
+        The data is streamed into a temporary file in the same directory,
+        flushed to disk and renamed over the target, so a crash never
+        leaves a partially written file behind.
+
         Args:
             path: Path where the file should be written
-            
+            codec: Format to use instead of the class default
+
         Raises:
             FileOperationError: If the file cannot be written
-            JSONSerializationError: If the data cannot be serialized to JSON
+            SerializationError: If the data cannot be encoded
         """
+        target = Path(path)
         try:
-            with self.serialize(path, 'w') as file:
-                json.dump(self.data, file, indent=4)
-        except json.JSONEncodeError as e:
-            raise JSONSerializationError(f"Failed to serialize data to JSON: {str(e)}") from e
-    
-    def load(self, path: FilePath) -> Any:
-        """Load data from a JSON file.
-        
+            fd, temp_name = tempfile.mkstemp(
+                dir=target.parent, prefix=f".{target.name}.", suffix=".tmp"
+            )
+        except OSError as e:
+            raise FileOperationError(f"Failed to write file {path}: {str(e)}") from e
+
+        try:
+            with os.fdopen(fd, "wb") as file:
+                self.dump(file, codec)
+                file.flush()
+                os.fsync(file.fileno())
+            # mkstemp creates owner-only files; keep the target's permissions.
+            os.chmod(temp_name, target.stat().st_mode if target.exists() else 0o644)
+            os.replace(temp_name, target)
+        except OSError as e:
+            self._discard(temp_name)
+            raise FileOperationError(f"Failed to write file {path}: {str(e)}") from e
+        except BaseException:
+            self._discard(temp_name)
+            raise
+
+    def load(self, path: FilePath, codec: Optional[Codec] = None) -> Any:
+        """Load data from a file.
+
         Args:
-            path: Path to the JSON file to load
-            
+            path: Path to the file to load
+            codec: Format to use instead of the class default
+
         Returns:
             The deserialized data
-            
+
         Raises:
             FileOperationError: If the file cannot be read
-            JSONSerializationError: If the file contains invalid JSON
+            SerializationError: If the file cannot be decoded
         """
+        with self.serialize(path, 'rb') as file:
+            try:
+                return self.load_from(file, codec)
+            except SerializationError as e:
+                raise type(e)(f"Failed to load {path}: {str(e)}") from e
+
+    def dump(self, stream: BinaryIO, codec: Optional[Codec] = None) -> None:
+        """Encode the object's data into an open binary stream."""
+        (codec or self.codec).dump(self.data, stream)
+
+    def load_from(self, stream: BinaryIO, codec: Optional[Codec] = None) -> Any:
+        """Decode data from an open binary stream into the object."""
+        self.data = (codec or self.codec).load(stream)
+        return self.data
+
+    @staticmethod
+    def _discard(temp_name: str) -> None:
+        """Remove a temporary file left by a failed write."""
         try:
-            with self.serialize(path, 'r') as file:
-                self.data = json.load(file)
-                return self.data
-        except json.JSONDecodeError as e:
-            raise JSONSerializationError(f"Failed to parse JSON from {path}: {str(e)}") from e
\ No newline at end of file
+            os.unlink(temp_name)
+        except OSError:
+            pass